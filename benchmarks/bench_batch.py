@@ -0,0 +1,68 @@
+"""Benchmark batch evaluation of many flags against a column of values.
+
+Evaluates 50 numeric flags against 10,000 candidate values, comparing one
+``flaggle.flags[name].is_enabled(value)`` call per pair (the previous way)
+with ``FlagSnapshot.evaluate_batch`` over a list and, if numpy is installed,
+over a numpy array.
+"""
+
+from random import Random
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, FlagOperation, FlagSnapshot
+
+FLAG_COUNT = 50
+CANDIDATES = 10_000
+OPERATIONS = (
+    FlagOperation.GT,
+    FlagOperation.GE,
+    FlagOperation.LT,
+    FlagOperation.LE,
+    FlagOperation.EQ,
+    FlagOperation.IN,
+)
+
+
+def build_flags() -> dict[str, Flag]:
+    flags = {}
+    for i in range(FLAG_COUNT):
+        operation = OPERATIONS[i % len(OPERATIONS)]
+        value = list(range(i, 1000, 7)) if operation is FlagOperation.IN else i * 20
+        flags[f"flag_{i}"] = Flag(f"flag_{i}", value, operation=operation)
+    return flags
+
+
+def main() -> None:
+    flags = build_flags()
+    snapshot = FlagSnapshot.of(flags)
+    names = list(flags)
+    rng = Random(0)
+    values = [rng.randrange(1000) for _ in range(CANDIDATES)]
+
+    def per_call():
+        return [[flags[name].is_enabled(value) for value in values] for name in names]
+
+    cases = [
+        ("is_enabled per pair", per_call),
+        ("evaluate_batch (list)", lambda: snapshot.evaluate_batch(names, values)),
+    ]
+    try:
+        import numpy
+    except ImportError:
+        print("numpy is not installed; skipping the array case")
+    else:
+        column = numpy.array(values)
+        cases.append(("evaluate_batch (numpy)", lambda: snapshot.evaluate_batch(names, column)))
+
+    baseline = None
+    rows = []
+    for label, func in cases:
+        rate = calls_per_second(func, repeat=3)
+        baseline = baseline or rate
+        rows.append([label, f"{1000 / rate:,.2f}", f"{rate / baseline:,.1f}x"])
+    print(f"{FLAG_COUNT} flags x {CANDIDATES:,} values")
+    print_table(["method", "ms per matrix", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
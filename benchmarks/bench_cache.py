@@ -0,0 +1,52 @@
+"""Benchmark the evaluation cache.
+
+Evaluates flags with 3 and 20 targeting rules, and a plain string comparison,
+against a small set of repeating arguments, directly and through an
+EvaluationCache. The cache pays off as rule sets grow; for cheap flags a hit
+costs more than evaluating, so leave those uncached.
+"""
+
+from itertools import cycle
+
+from benchmarks.common import calls_per_second, print_table
+from benchmarks.bench_rules import RULES
+from python_flaggle import Flag, FlagOperation
+from python_flaggle.cache import EvaluationCache
+
+MANY_RULES = [
+    {
+        "all": [
+            {"attribute": "country", "operation": "in", "value": [f"C{i}", f"D{i}"]},
+            {"attribute": "app_version", "operation": "ge", "value": i},
+            {"attribute": "plan", "operation": "ne", "value": "free"},
+        ]
+    }
+    for i in range(20)
+]
+CONTEXTS = [
+    {"country": "FR", "app_version": 6, "plan": "pro"},
+    {"country": "FR", "app_version": 3, "plan": "free"},
+    {"country": "BR", "app_version": 7},
+]
+
+
+def main() -> None:
+    cases = [
+        ("3 rules, dict context", Flag("new_checkout", False, rules=RULES), CONTEXTS),
+        ("20 rules, dict context", Flag("new_checkout", False, rules=MANY_RULES), CONTEXTS),
+        ("eq, string", Flag("env", "production", operation=FlagOperation.EQ), ["production", "staging"]),
+    ]
+    rows = []
+    for label, flag, arguments in cases:
+        cache = EvaluationCache(max_size=1024)
+        direct_args = cycle(arguments)
+        cached_args = cycle(arguments)
+        direct = calls_per_second(lambda: flag.is_enabled(next(direct_args)))
+        cached = calls_per_second(lambda: cache.evaluate(flag, next(cached_args)))
+        hit_ratio = cache.stats.hits / (cache.stats.hits + cache.stats.misses)
+        rows.append([label, f"{1e9 / direct:,.0f}", f"{1e9 / cached:,.0f}", f"{hit_ratio:.4f}"])
+    print_table(["flag", "direct (ns)", "cached (ns)", "hit ratio"], rows)
+
+
+if __name__ == "__main__":
+    main()
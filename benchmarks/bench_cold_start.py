@@ -0,0 +1,78 @@
+"""Benchmark how long ``Flaggle(...)`` takes to return, with and without a warm disk cache.
+
+A local HTTP server serves 1,000 flags after a simulated network round trip.
+Without a cache the constructor waits for the first fetch; with a warm
+``cache_path`` it loads the cached flags and fetches in the background.
+"""
+
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import perf_counter, sleep
+
+from benchmarks.common import print_table
+from python_flaggle import Flaggle
+
+FLAGS = 1_000
+ROUND_TRIP = 0.1
+REPEAT = 5
+
+
+class Server(BaseHTTPRequestHandler):
+    """Serves a fixed flags document after ``ROUND_TRIP`` seconds."""
+
+    protocol_version = "HTTP/1.1"
+    body = json.dumps({
+        "flags": [
+            {"name": f"flag_{i}", "value": [f"tenant-{j}" for j in range(10)], "operation": "in"}
+            for i in range(FLAGS)
+        ]
+    }).encode()
+
+    def do_GET(self) -> None:
+        sleep(ROUND_TRIP)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def construct(url: str, **options) -> float:
+    """Return the fastest construction time of ``REPEAT`` instances, in milliseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        start = perf_counter()
+        flaggle = Flaggle(url, interval=3600, **options)
+        timings.append(perf_counter() - start)
+        assert len(flaggle.flags) == FLAGS
+        sleep(ROUND_TRIP * 2)  # Let a background refresh finish before the next round.
+        flaggle.close()
+    return min(timings) * 1000
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Server)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/flags"
+    with TemporaryDirectory() as directory:
+        cache = str(Path(directory) / "flags.cache")
+        Flaggle(url, interval=3600, cache_path=cache).close()
+        rows = [
+            ["no cache", f"{construct(url):.1f}"],
+            ["warm cache_path", f"{construct(url, cache_path=cache):.1f}"],
+        ]
+    server.shutdown()
+    print(f"{FLAGS:,} flags, simulated round trip {ROUND_TRIP * 1000:.0f} ms")
+    print_table(["startup", "Flaggle() (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
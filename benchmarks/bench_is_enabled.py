@@ -0,0 +1,56 @@
+"""Micro-benchmark for Flag.is_enabled.
+
+Compares the compiled evaluator against the previous implementation, which
+dispatched on FlagType and formatted a debug message on every call.
+"""
+
+from logging import getLogger
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, FlagOperation, FlagType
+
+logger = getLogger("benchmarks.legacy")
+
+
+def legacy_is_enabled(flag: Flag, other_value=None) -> bool:
+    """Evaluate ``flag`` the way Flag.is_enabled did before compilation."""
+    logger.debug(f"Flag {flag._name} is of type {flag._flag_type}")
+    if flag._flag_type == FlagType.BOOLEAN:
+        return flag._value
+    elif flag._flag_type in (
+        FlagType.STRING,
+        FlagType.INTEGER,
+        FlagType.FLOAT,
+        FlagType.ARRAY,
+    ):
+        if other_value is None or flag._operation is None:
+            logger.debug("No value to compare or operator not defined")
+            return bool(flag._value)
+        return flag._operation(other_value, flag._value)
+    elif flag._flag_type in (FlagType.NULL, FlagType.EMPTY):
+        return False
+    else:
+        return False
+
+
+CASES = [
+    ("boolean", Flag("boolean", True), None),
+    ("string eq", Flag("string", "production", operation=FlagOperation.EQ), "production"),
+    ("integer ge", Flag("integer", 3, operation=FlagOperation.GE), 4),
+    ("float lt", Flag("float", 1.5, operation=FlagOperation.LT), 1.0),
+    ("array in", Flag("array", ["BR", "PT", "US"], operation=FlagOperation.IN), "US"),
+    ("null", Flag("null", None), None),
+]
+
+
+def main() -> None:
+    rows = []
+    for label, flag, other_value in CASES:
+        before = calls_per_second(lambda: legacy_is_enabled(flag, other_value))
+        after = calls_per_second(lambda: flag.is_enabled(other_value))
+        rows.append([label, f"{before:,.0f}", f"{after:,.0f}", f"{after / before:.2f}x"])
+    print_table(["case", "before (calls/s)", "after (calls/s)", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Benchmark IN/NI evaluation against array flags of increasing size.
+
+Each row compares a linear scan of the raw list (the previous behaviour) with
+the indexed membership test built when the flag is compiled. The probe value
+is absent from the list, which is the worst case for a linear scan.
+"""
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, FlagOperation
+
+SIZES = (10, 1_000, 100_000)
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        values = [f"tenant-{i}" for i in range(size)]
+        hashable = Flag("tenants", values, operation=FlagOperation.IN)
+        unhashable = Flag("pairs", [[i] for i in range(size)], operation=FlagOperation.IN)
+        missing = "tenant-missing"
+
+        scan = calls_per_second(lambda: FlagOperation.IN(missing, values), repeat=3)
+        indexed = calls_per_second(lambda: hashable.is_enabled(missing), repeat=3)
+        sorted_ = calls_per_second(lambda: unhashable.is_enabled([-1]), repeat=3)
+        rows.append(
+            [f"{size:,}", f"{scan:,.0f}", f"{indexed:,.0f}", f"{sorted_:,.0f}", f"{indexed / scan:,.1f}x"]
+        )
+    print_table(
+        ["entries", "list scan (calls/s)", "frozenset (calls/s)", "sorted (calls/s)", "speedup"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark the memory footprint of Flag objects.
+
+Compares the bytes retained per flag (including its name, value and the
+dictionary entry) for the slotted, interned Flag against a class with the
+previous layout: a per-instance ``__dict__`` holding the same five attributes.
+Flags are built from freshly decoded JSON that is then dropped, as the poller
+does, so repeated string values only survive once when interned. The first
+load also pays for growing the interpreter's intern table by one entry per new
+name, which later loads (and other Flaggle instances) reuse.
+"""
+
+import gc
+import json
+import tracemalloc
+from typing import Any, Optional
+
+from benchmarks.common import print_table
+from python_flaggle import Flag, FlagOperation, FlagType
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+class LegacyFlag:
+    """Flag with the previous ``__dict__`` based layout and no compiled evaluator."""
+
+    def __init__(self, name: str, value: Any, description: Optional[str] = None, operation=None):
+        self._name = name
+        self._value = value
+        self._description = description
+        self._operation = operation
+        self._flag_type = FlagType.from_value(value=value)
+
+
+def payload(size: int) -> bytes:
+    """Build a document mixing boolean, string and numeric flags."""
+    flags = []
+    for i in range(size):
+        if i % 3 == 0:
+            flags.append({"name": f"feature_{i}", "value": i % 2 == 0, "description": f"Feature {i}"})
+        elif i % 3 == 1:
+            flags.append({"name": f"env_{i}", "value": "production", "operation": "eq"})
+        else:
+            flags.append({"name": f"min_version_{i}", "value": 3, "operation": "ge"})
+    return json.dumps({"flags": flags}).encode("utf-8")
+
+
+def bytes_per_flag(cls, body: bytes, size: int) -> float:
+    """Return retained bytes per flag after building ``body`` with ``cls`` and dropping the JSON."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    definitions = json.loads(body)["flags"]
+    flags = {}
+    for definition in definitions:
+        operation = definition.get("operation")
+        flags[definition["name"]] = cls(
+            definition["name"],
+            definition["value"],
+            definition.get("description"),
+            FlagOperation.from_string(operation) if operation else None,
+        )
+    del definition, definitions
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert len(flags) == size
+    return retained / size
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        body = payload(size)
+        legacy = bytes_per_flag(LegacyFlag, body, size)
+        first = bytes_per_flag(Flag, body, size)
+        steady = bytes_per_flag(Flag, body, size)
+        rows.append(
+            [f"{size:,}", f"{legacy:.0f}", f"{first:.0f}", f"{steady:.0f}", f"{1 - steady / legacy:.0%}"]
+        )
+    print_table(
+        ["flags", "before (B/flag)", "after, first load (B/flag)", "after, reload (B/flag)", "saved"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the cost of metrics on ``Flaggle.is_enabled``.
+
+Compares ``Flaggle.is_enabled`` with metrics disabled and enabled against the
+same method without the metrics check, as it was before metrics existed.
+Disabled metrics cost one attribute check per call; enabled metrics add a
+lock-free increment of the calling thread's counter shard.
+"""
+
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flaggle, FlaggleMetrics
+
+
+def unmetered(flaggle: Flaggle, name: str, other_value=None) -> bool:
+    """``Flaggle.is_enabled`` without the metrics check."""
+    if flaggle._eval_cache is None:
+        return flaggle._snapshot.is_enabled(name, other_value)
+    flag = flaggle._snapshot.flags.get(name)
+    if flag is None:
+        return False
+    return flaggle._eval_cache.evaluate(flag, other_value)
+
+
+class Server(BaseHTTPRequestHandler):
+    """Serves a small flags document."""
+
+    protocol_version = "HTTP/1.1"
+    body = json.dumps({"flags": [{"name": "env", "value": "production", "operation": "eq"}]}).encode()
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Server)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/flags"
+
+    with Flaggle(url, interval=3600) as plain, Flaggle(url, interval=3600, metrics=FlaggleMetrics()) as measured:
+        baseline = calls_per_second(lambda: unmetered(plain, "env", "production"))
+        disabled = calls_per_second(lambda: plain.is_enabled("env", "production"))
+        enabled = calls_per_second(lambda: measured.is_enabled("env", "production"))
+    server.shutdown()
+
+    print_table(
+        ["path", "ns/call", "overhead (ns)"],
+        [
+            ["is_enabled without metrics check", f"{1e9 / baseline:,.0f}", "-"],
+            ["Flaggle.is_enabled, metrics disabled", f"{1e9 / disabled:,.0f}", f"{1e9 / disabled - 1e9 / baseline:,.0f}"],
+            ["Flaggle.is_enabled, metrics enabled", f"{1e9 / enabled:,.0f}", f"{1e9 / enabled - 1e9 / baseline:,.0f}"],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark how long a flag change takes to reach a Flaggle client.
+
+A local HTTP server serves the flags document and a Server-Sent Events stream.
+Each round flips a flag on the server and measures the time until the client
+sees it, once with push and once with interval polling.
+"""
+
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Queue
+from statistics import median, quantiles
+from threading import Thread
+from time import monotonic, sleep
+
+from benchmarks.common import print_table
+from python_flaggle import Flaggle
+
+ROUNDS = 50
+POLL_INTERVAL = 0.5
+
+
+class Server(BaseHTTPRequestHandler):
+    """Serves the current document at ``/flags`` and streams each change at ``/events``."""
+
+    protocol_version = "HTTP/1.1"
+    document = b""
+    streams: list[Queue] = []
+
+    def do_GET(self) -> None:
+        if self.path != "/events":
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(self.document)))
+            self.end_headers()
+            self.wfile.write(self.document)
+            return
+        events: Queue = Queue()
+        self.streams.append(events)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        while True:
+            chunk = b"data: %s\n\n" % events.get()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def publish(value: int) -> None:
+    """Change the served document and push it to connected streams."""
+    Server.document = json.dumps({"flags": [{"name": "version", "value": value}]}).encode()
+    for events in Server.streams:
+        events.put(Server.document)
+
+
+def latencies(flaggle: Flaggle) -> list[float]:
+    """Flip the flag ``ROUNDS`` times and return each propagation delay in milliseconds."""
+    found = []
+    for value in range(1, ROUNDS + 1):
+        sleep(POLL_INTERVAL * 0.37)  # Publish at varying points of the polling cycle.
+        start = monotonic()
+        publish(value)
+        while flaggle._flags["version"].value != value:
+            sleep(0.0005)
+        found.append((monotonic() - start) * 1000)
+    return found
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Server)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    rows = []
+    for mode, options in (
+        (f"poll every {POLL_INTERVAL}s", {}),
+        ("push (SSE)", {"push_url": base + "/events"}),
+    ):
+        publish(0)
+        flaggle = Flaggle(base + "/flags", interval=POLL_INTERVAL, **options)
+        while options and not flaggle.push_connected:
+            sleep(0.01)
+        found = latencies(flaggle)
+        flaggle.close()
+        p99 = quantiles(found, n=100, method="inclusive")[98]
+        rows.append([mode, f"{median(found):.1f}", f"{p99:.1f}", f"{max(found):.1f}"])
+    server.shutdown()
+    print_table(["mode", "p50 (ms)", "p99 (ms)", "max (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
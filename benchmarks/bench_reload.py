@@ -0,0 +1,48 @@
+"""Benchmark reloading a large flag document where a single flag changed.
+
+Compares rebuilding every Flag (the previous behaviour) with passing the
+current flags as ``previous`` so unchanged definitions are reused.
+"""
+
+from time import perf_counter
+
+from benchmarks.common import print_table
+from python_flaggle import Flag, FlagChanges
+
+SIZES = (1_000, 10_000)
+
+
+def document(size: int, generation: int) -> dict:
+    """Build a flags document whose first flag depends on ``generation``."""
+    flags = [
+        {"name": f"flag_{i}", "value": [f"tenant-{j}" for j in range(20)], "operation": "in"}
+        for i in range(size)
+    ]
+    flags[0] = {"name": "flag_0", "value": generation, "operation": "ge"}
+    return {"flags": flags}
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the fastest wall time of ``repeat`` calls to ``func``, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        current = Flag.from_json(document(size, 0))
+        incoming = document(size, 1)
+        full = best_of(lambda: Flag.from_json(incoming))
+        incremental = best_of(lambda: Flag.from_json(incoming, previous=current))
+        changes = FlagChanges.between(current, Flag.from_json(incoming, previous=current))
+        rows.append([f"{size:,}", f"{full:.1f}", f"{incremental:.1f}", len(changes.changed)])
+    print_table(["flags", "full rebuild (ms)", "incremental (ms)", "rebuilt"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark percentage rollout evaluation.
+
+Reports the cost of one ``is_enabled(user_id)`` check on a PCT flag, next to
+the giant IN list it replaces (5% of one million user IDs), and the per-key
+cost of bucketing 100,000 keys at once with ``buckets`` over a list and, if
+numpy is installed, over a numpy array.
+"""
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, FlagOperation
+from python_flaggle.rollout import buckets, salt_seed
+
+USERS = 1_000_000
+BATCH = 100_000
+
+
+def main() -> None:
+    rollout = Flag("new_checkout", 5, operation=FlagOperation.PCT)
+    ids = [f"user-{i}" for i in range(USERS)]
+    in_list = Flag("new_checkout_ids", ids[: USERS // 20], operation=FlagOperation.IN)
+    probe = "user-123456"
+    batch = ids[:BATCH]
+    seed = salt_seed("new_checkout")
+
+    cases = [
+        ("IN list of 50,000 ids", calls_per_second(lambda: in_list.is_enabled(probe)), 1),
+        ("PCT is_enabled", calls_per_second(lambda: rollout.is_enabled(probe)), 1),
+        ("buckets (list)", calls_per_second(lambda: buckets(batch, seed), repeat=3), BATCH),
+    ]
+    try:
+        import numpy
+    except ImportError:
+        print("numpy is not installed; skipping the array case")
+    else:
+        column = numpy.array(batch)
+        cases.append(("buckets (numpy)", calls_per_second(lambda: buckets(column, seed), repeat=3), BATCH))
+
+    rows = [[label, f"{1e9 / (rate * keys):,.0f}"] for label, rate, keys in cases]
+    print_table(["method", "ns per key"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark targeting rule evaluation.
+
+Compares a flag with compiled rules against walking the same rule definitions
+per call, the way application code chaining several flags effectively does,
+for a context matching the first rule, the last rule, and no rule.
+"""
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, FlagOperation
+
+RULES = [
+    {
+        "all": [
+            {"attribute": "country", "operation": "in", "value": ["BR", "US", "PT", "MX"]},
+            {"attribute": "app_version", "operation": "ge", "value": 5},
+        ]
+    },
+    {"any": [{"attribute": "beta", "value": True}, {"attribute": "tier", "value": "staff"}]},
+    {"attribute": "plan", "operation": "in", "value": ["pro", "enterprise"]},
+]
+CONTEXTS = {
+    "first rule": {"country": "BR", "app_version": 6},
+    "last rule": {"country": "FR", "app_version": 6, "plan": "pro"},
+    "no match": {"country": "FR", "app_version": 3, "plan": "free"},
+}
+
+
+def interpret(node: dict, context: dict) -> bool:
+    """Evaluate a rule definition by walking it, without compiling."""
+    if "all" in node:
+        return all(interpret(child, context) for child in node["all"])
+    if "any" in node:
+        return any(interpret(child, context) for child in node["any"])
+    value = context.get(node["attribute"])
+    operation = FlagOperation.from_string(node.get("operation", "eq"))
+    return value is not None and operation(value, node["value"])
+
+
+def walk(rules: list[dict], context: dict) -> bool:
+    for rule in rules:
+        if interpret(rule, context):
+            return rule.get("enabled", True)
+    return False
+
+
+def main() -> None:
+    flag = Flag("new_checkout", False, rules=RULES)
+    rows = []
+    for label, context in CONTEXTS.items():
+        assert flag.is_enabled(context) == walk(RULES, context)
+        walked = calls_per_second(lambda: walk(RULES, context))
+        compiled = calls_per_second(lambda: flag.is_enabled(context))
+        rows.append([label, f"{1e9 / walked:,.0f}", f"{1e9 / compiled:,.0f}", f"{compiled / walked:,.1f}x"])
+    print_table(["context", "walk definitions (ns)", "compiled (ns)", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Stress benchmark for concurrent flag reads while the poller publishes updates.
+
+A writer thread publishes a new generation as fast as it can, where every
+flag's value is the generation number. Reader threads evaluate all flags per
+"request", either through one ``snapshot()`` or through repeated ``flags``
+lookups, and count requests that observed more than one generation.
+"""
+
+from threading import Event, Thread
+from time import perf_counter, sleep
+from unittest.mock import patch
+
+from benchmarks.common import print_table
+from python_flaggle import Flag, Flaggle
+
+FLAG_COUNT = 20
+DURATION = 1.0
+READERS = (1, 2, 4, 8)
+
+
+class GenerationFlaggle(Flaggle):
+    """Flaggle whose every fetch returns a new generation of flags."""
+
+    generation = 0
+
+    def _fetch_flags(self):
+        self.generation += 1
+        return {f"flag_{i}": Flag(f"flag_{i}", self.generation) for i in range(FLAG_COUNT)}
+
+
+def run(reader_count: int, use_snapshot: bool) -> tuple[float, int]:
+    """Run readers against a fast writer and return (requests/s, mixed requests)."""
+    with patch.object(GenerationFlaggle, "_schedule_update"):
+        flaggle = GenerationFlaggle(url="http://localhost/flags", interval=3600)
+    names = [f"flag_{i}" for i in range(FLAG_COUNT)]
+    stop = Event()
+    totals = []
+
+    def write():
+        while not stop.is_set():
+            flaggle._update()
+            sleep(0)
+
+    def read():
+        requests = mixed = 0
+        while not stop.is_set():
+            if use_snapshot:
+                flags = flaggle.snapshot().flags
+                seen = {flags[name].value for name in names}
+            else:
+                seen = {flaggle.flags[name].value for name in names}
+            requests += 1
+            mixed += len(seen) != 1
+        totals.append((requests, mixed))
+
+    threads = [Thread(target=write)] + [Thread(target=read) for _ in range(reader_count)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+    return sum(r for r, _ in totals) / elapsed, sum(m for _, m in totals)
+
+
+def main() -> None:
+    rows = []
+    for reader_count in READERS:
+        for use_snapshot in (False, True):
+            rate, mixed = run(reader_count, use_snapshot)
+            mode = "snapshot()" if use_snapshot else "flags[...]"
+            rows.append([reader_count, mode, f"{rate:,.0f}", mixed])
+    print_table(["readers", "read path", "requests/s", "mixed-generation requests"], rows)
+
+
+if __name__ == "__main__":
+    main()
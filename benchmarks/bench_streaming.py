@@ -0,0 +1,81 @@
+"""Benchmark parse time and peak memory when ingesting large flag documents.
+
+Each measurement runs in a fresh interpreter so peak RSS is not polluted by
+earlier cases. Modes:
+
+    legacy     decode response.text, call response.json() twice, then Flag.from_json
+    buffered   decode the body once with json.loads, then Flag.from_json
+    streaming  Flag.from_stream over 64 KiB chunks
+"""
+
+import json
+import subprocess
+import sys
+from resource import RUSAGE_SELF, getrusage
+from time import perf_counter
+
+from benchmarks.common import print_table
+
+SIZES = (1_000, 10_000, 100_000)
+MODES = ("legacy", "buffered", "streaming")
+CHUNK_SIZE = 64 * 1024
+
+
+def document(size: int) -> bytes:
+    """Build a flags document with ``size`` array flags."""
+    flags = [
+        {
+            "name": f"flag_{i}",
+            "description": f"Rollout list for flag {i}",
+            "value": [f"tenant-{i}-{j}" for j in range(10)],
+            "operation": "in",
+        }
+        for i in range(size)
+    ]
+    return json.dumps({"flags": flags}).encode("utf-8")
+
+
+def measure(mode: str, size: int) -> None:
+    """Parse one document and print ``seconds peak_rss_delta_kib payload_bytes`` (child process)."""
+    from python_flaggle import Flag
+
+    body = document(size)
+    baseline = getrusage(RUSAGE_SELF).ru_maxrss
+    start = perf_counter()
+    if mode == "legacy":
+        text = body.decode("utf-8")
+        json.loads(text)
+        flags = Flag.from_json(json.loads(body))
+    elif mode == "buffered":
+        flags = Flag.from_json(json.loads(body))
+    else:
+        view = memoryview(body)
+        chunks = (view[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+        flags = Flag.from_stream(chunks)
+    elapsed = perf_counter() - start
+    assert len(flags) == size
+    print(elapsed, getrusage(RUSAGE_SELF).ru_maxrss - baseline, len(body))
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_streaming", mode, str(size)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            elapsed, rss_kib, payload = float(output[0]), int(output[1]), int(output[2])
+            rows.append(
+                [f"{size:,}", f"{payload / 2**20:.1f}", mode, f"{elapsed * 1000:.0f}", f"{rss_kib / 1024:.1f}"]
+            )
+    print_table(["flags", "payload (MiB)", "mode", "parse (ms)", "peak RSS growth (MiB)"], rows)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,59 @@
+"""Benchmark how refresh cost scales with the number of change subscriptions.
+
+Each refresh applies a 1,000-flag document in which 10 flags changed, as
+``Flaggle._apply`` does after a fetch, with a growing number of subscribers.
+Subscriptions are looked up per changed flag (patterns are matched once per
+name and then cached), so the cost grows with the number of subscriptions
+actually notified rather than with the number registered. Callbacks run on
+the subscriber worker thread, outside the measured refresh.
+"""
+
+import logging
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, Flaggle, MemorySource
+
+FLAG_COUNT = 1_000
+CHANGED = 10
+
+
+def document(generation: int) -> dict:
+    """Build a document whose first CHANGED flags differ between generations."""
+    return {
+        "flags": [
+            {"name": f"flag_{i}", "value": generation if i < CHANGED else i}
+            for i in range(FLAG_COUNT)
+        ]
+    }
+
+
+def refresh_seconds(subscribers: int, pattern: bool) -> float:
+    """Return the time of one refresh with ``subscribers`` subscriptions."""
+    with Flaggle(source=MemorySource(document(0)), interval=3600) as flaggle:
+        for i in range(subscribers):
+            flaggle.subscribe(f"flag_{i % FLAG_COUNT}*" if pattern else f"flag_{i % FLAG_COUNT}", lambda c, s: None)
+        generations = [flaggle.flags]
+        generations.append(Flag.from_json(document(1), previous=generations[0]))
+        state = {"next": 1}
+
+        def refresh() -> None:
+            flaggle._apply(generations[state["next"]])
+            state["next"] ^= 1
+
+        return 1 / calls_per_second(refresh)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    baseline = refresh_seconds(0, pattern=False)
+    rows = [["none", 0, f"{baseline * 1e6:,.1f}", "-"]]
+    for kind, pattern in (("exact", False), ("pattern", True)):
+        for count in (10, 100, 1_000, 10_000):
+            seconds = refresh_seconds(count, pattern)
+            rows.append([kind, f"{count:,}", f"{seconds * 1e6:,.1f}", f"{(seconds - baseline) * 1e6:,.1f}"])
+    print(f"{FLAG_COUNT:,} flags, {CHANGED} changed per refresh")
+    print_table(["subscriptions", "count", "us/refresh", "overhead (us)"], rows)
+
+
+if __name__ == "__main__":
+    main()
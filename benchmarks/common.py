@@ -0,0 +1,37 @@
+"""Shared helpers for the Flaggle benchmark scripts.
+
+Run any benchmark from the repository root, for example:
+
+    python -m benchmarks.bench_is_enabled
+"""
+
+from timeit import Timer
+from typing import Callable
+
+
+def calls_per_second(func: Callable[[], object], repeat: int = 5) -> float:
+    """Measure how many times per second ``func`` can be called.
+
+    Args:
+        func (Callable[[], object]): Zero-argument callable to measure.
+        repeat (int): Number of timing rounds; the best round is reported.
+
+    Returns:
+        float: Calls per second for the fastest round.
+    """
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    """Print rows as a fixed-width text table."""
+    widths = [
+        max(len(str(header)), *(len(str(row[i])) for row in rows))
+        for i, header in enumerate(headers)
+    ]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,251 @@
+"""Benchmark suite with machine-readable baselines.
+
+Runs a fixed set of cases covering flag evaluation, type and operation
+parsing, document loading, and an end-to-end refresh against a local HTTP
+stub, and records the time per call of each. Results are written as JSON so
+runs on different commits (on the same machine) can be compared:
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+
+``--compare`` exits with status 1 when a case is slower than the baseline by
+more than ``--threshold`` (default: 20%). ``-k`` runs only the cases whose
+name contains the given text. Sub-microsecond cases are sensitive to machine
+load; compare runs from the same idle machine, raising ``--repeat`` if needed.
+"""
+
+import json
+import logging
+import platform
+import subprocess
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from benchmarks.common import calls_per_second, print_table
+from python_flaggle import Flag, Flaggle, FlagOperation, FlagType
+
+SCHEMA = 1
+
+
+class Case(NamedTuple):
+    """A named zero-argument callable to time."""
+    name: str
+    func: Callable[[], object]
+
+
+def document(size: int) -> dict:
+    """Build a flags document of ``size`` flags mixing every value type."""
+    templates = [
+        lambda i: {"name": f"bool_{i}", "value": i % 2 == 0},
+        lambda i: {"name": f"env_{i}", "value": "production", "operation": "eq"},
+        lambda i: {"name": f"version_{i}", "value": i, "operation": "ge"},
+        lambda i: {"name": f"ratio_{i}", "value": i / 7, "operation": "lt"},
+        lambda i: {"name": f"tenants_{i}", "value": [f"tenant-{j}" for j in range(10)], "operation": "in"},
+    ]
+    return {"flags": [templates[i % len(templates)](i) for i in range(size)]}
+
+
+def evaluation_cases(wanted: Callable[[str], bool]) -> Iterator[Case]:
+    """Single-flag evaluation for each type and operation."""
+    flags = [
+        ("boolean", Flag("boolean", True), None),
+        ("string eq", Flag("string", "production", operation=FlagOperation.EQ), "production"),
+        ("string ne", Flag("string", "production", operation=FlagOperation.NE), "staging"),
+        ("integer gt", Flag("integer", 3, operation=FlagOperation.GT), 4),
+        ("integer ge", Flag("integer", 3, operation=FlagOperation.GE), 4),
+        ("integer lt", Flag("integer", 3, operation=FlagOperation.LT), 2),
+        ("integer le", Flag("integer", 3, operation=FlagOperation.LE), 2),
+        ("float eq", Flag("float", 1.5, operation=FlagOperation.EQ), 1.5),
+        ("array in", Flag("array", ["BR", "PT", "US"], operation=FlagOperation.IN), "US"),
+        ("array ni", Flag("array", ["BR", "PT", "US"], operation=FlagOperation.NI), "FR"),
+        ("pct", Flag("rollout", 25, operation=FlagOperation.PCT), "user-42"),
+        ("rules", Flag("rules", False, rules=[{"attribute": "country", "operation": "in", "value": ["BR"]}]),
+         {"country": "BR"}),
+        ("null", Flag("null", None), None),
+    ]
+    for label, flag, other_value in flags:
+        if wanted(f"evaluate/{label}"):
+            yield Case(f"evaluate/{label}", lambda flag=flag, other_value=other_value: flag.is_enabled(other_value))
+
+
+def membership_cases(wanted: Callable[[str], bool]) -> Iterator[Case]:
+    """IN checks against large array flags, for present and absent values."""
+    for size in (10_000, 100_000):
+        names = [name for name in (f"in-array/{size}/hit", f"in-array/{size}/miss") if wanted(name)]
+        if not names:
+            continue
+        flag = Flag("tenants", [f"tenant-{i}" for i in range(size)], operation=FlagOperation.IN)
+        for name in names:
+            value = "tenant-7" if name.endswith("/hit") else "tenant-missing"
+            yield Case(name, lambda flag=flag, value=value: flag.is_enabled(value))
+
+
+def parsing_cases(wanted: Callable[[str], bool]) -> Iterator[Case]:
+    """FlagType.from_value, FlagOperation.from_string, and Flag.from_json at several sizes."""
+    for label, value in (("bool", True), ("str", "production"), ("int", 3), ("float", 1.5), ("list", ["a"])):
+        if wanted(f"from_value/{label}"):
+            yield Case(f"from_value/{label}", lambda value=value: FlagType.from_value(value))
+    for label, operation in (("eq", "eq"), ("pct", "PCT")):
+        if wanted(f"from_string/{label}"):
+            yield Case(f"from_string/{label}", lambda operation=operation: FlagOperation.from_string(operation))
+    for size in (100, 10_000, 100_000):
+        if wanted(f"from_json/{size}"):
+            data = document(size)
+            yield Case(f"from_json/{size}", lambda data=data: Flag.from_json(data))
+
+
+class Stub(BaseHTTPRequestHandler):
+    """Serves a 1,000-flag document, answering 304 to a matching If-None-Match."""
+
+    protocol_version = "HTTP/1.1"
+    body = json.dumps(document(1_000)).encode()
+
+    def do_GET(self) -> None:
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def refresh_cases(wanted: Callable[[str], bool]) -> Iterator[Case]:
+    """End-to-end Flaggle refreshes against the local stub, started only if a refresh case is wanted."""
+    paths = [(name, path) for name, path in (("refresh/1000/full", "/full"), ("refresh/1000/not-modified", "/etag"))
+             if wanted(name)]
+    if not paths:
+        return
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for name, path in paths:
+            with Flaggle(base + path, interval=3600) as flaggle:
+                yield Case(name, flaggle._update)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def commit() -> Optional[str]:
+    """Return the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(selected: str = "", repeat: int = 7) -> dict:
+    """
+    Run the cases whose name contains ``selected``; the others are not built.
+
+    Args:
+        selected (str): Substring filter on case names; empty runs every case.
+        repeat (int): Timing rounds per case; the best round is kept.
+    Returns:
+        dict: Results in the baseline format, with ``meta`` and ``results``.
+    """
+    def wanted(name: str) -> bool:
+        return selected in name
+
+    logging.disable(logging.CRITICAL)
+    results = {}
+    try:
+        for group in (evaluation_cases, membership_cases, parsing_cases, refresh_cases):
+            for case in group(wanted):
+                results[case.name] = {"seconds": 1 / calls_per_second(case.func, repeat)}
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        "schema": SCHEMA,
+        "meta": {
+            "commit": commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> list[list[object]]:
+    """
+    Compare two result sets case by case.
+
+    Args:
+        baseline (dict): Earlier results.
+        current (dict): New results.
+        threshold (float): Relative slowdown above which a case is a regression.
+    Returns:
+        list[list[object]]: One row per case present in both: name, baseline and
+        current time per call, ratio, and ``"REGRESSION"``/``"faster"``/``""``.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        verdict = "REGRESSION" if ratio > 1 + threshold else "faster" if ratio < 1 / (1 + threshold) else ""
+        rows.append([name, before["seconds"], result["seconds"], ratio, verdict])
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a time per call with a readable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:,.2f} {unit}"
+    return f"{seconds / 1e-9:,.0f} ns"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="compare against the results in PATH")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    parser.add_argument("-k", dest="selected", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=7, help="timing rounds per case")
+    args = parser.parse_args(argv)
+
+    current = run(args.selected, args.repeat)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(current, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+    if not args.compare:
+        print_table(["case", "time/call"], [[name, format_seconds(r["seconds"])] for name, r in current["results"].items()])
+        return 0
+
+    with open(args.compare) as file:
+        baseline = json.load(file)
+    rows = compare(baseline, current, args.threshold)
+    print(f"baseline {baseline['meta'].get('commit')} vs current {current['meta'].get('commit')}")
+    print_table(
+        ["case", "baseline", "current", "ratio", ""],
+        [[name, format_seconds(before), format_seconds(after), f"{ratio:.2f}x", verdict]
+         for name, before, after, ratio, verdict in rows],
+    )
+    return 1 if any(row[4] == "REGRESSION" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,17 +2,109 @@
 
 This package provides the Flaggle class for managing feature flags, as well as the Flag, FlagType, and FlagOperation classes for defining and evaluating individual flags.
 
+Only the Flag classes are imported with the package. Everything else is
+imported on first access, so code that just builds and evaluates flags never
+loads the HTTP clients, asyncio, or the scheduler.
+
 Exports:
     Flaggle: Main entry point for feature flag management.
+    AsyncFlaggle: Asyncio-native variant of Flaggle (requires the ``async`` extra).
+    FlagSnapshot: Immutable, versioned view of a Flaggle's flags.
+    create_session: Build a pooled HTTP session that Flaggle instances can share.
+    FlagSource: Base class of the sources a Flaggle loads flags from.
+    HttpSource, FileSource, ImageSource, MemorySource, EnvSource: Flag sources for
+        HTTP endpoints, local JSON files, shared images, in-process documents, and
+        environment variables.
+    RetryPolicy: Backoff and circuit breaker settings of the Flaggle poller.
+    RefreshScheduler: Polls many Flaggle instances from a small pool of threads.
+    shared_scheduler: The process-wide RefreshScheduler.
+    FlaggleMetrics: Opt-in evaluation and fetch metrics of a Flaggle.
+    render_prometheus: Render FlaggleMetrics snapshots in the Prometheus text format.
     Flag: Represents a single feature flag.
     FlagType: Enum of supported flag value types.
     FlagOperation: Enum of supported flag operations.
+    FlagChanges: Names of flags added, changed, and removed by a reload.
+    Subscription: Handle of a ``Flaggle.subscribe`` callback.
 """
 
-from python_flaggle.flaggle import Flaggle
-from python_flaggle.flag import Flag, FlagOperation, FlagType
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from python_flaggle.flag import Flag, FlagChanges, FlagOperation, FlagType
+
+if TYPE_CHECKING:
+    from python_flaggle.async_flaggle import AsyncFlaggle
+    from python_flaggle.backoff import RetryPolicy
+    from python_flaggle.flaggle import Flaggle
+    from python_flaggle.metrics import FlaggleMetrics, render_prometheus
+    from python_flaggle.scheduler import RefreshScheduler, shared_scheduler
+    from python_flaggle.snapshot import FlagSnapshot
+    from python_flaggle.sources import (
+        EnvSource,
+        FileSource,
+        FlagSource,
+        HttpSource,
+        ImageSource,
+        MemorySource,
+        create_session,
+    )
+    from python_flaggle.subscriptions import Subscription
+
+_LAZY_EXPORTS = {
+    "AsyncFlaggle": "python_flaggle.async_flaggle",
+    "RetryPolicy": "python_flaggle.backoff",
+    "Flaggle": "python_flaggle.flaggle",
+    "FlaggleMetrics": "python_flaggle.metrics",
+    "render_prometheus": "python_flaggle.metrics",
+    "RefreshScheduler": "python_flaggle.scheduler",
+    "shared_scheduler": "python_flaggle.scheduler",
+    "FlagSnapshot": "python_flaggle.snapshot",
+    "create_session": "python_flaggle.sources",
+    "FlagSource": "python_flaggle.sources",
+    "HttpSource": "python_flaggle.sources",
+    "FileSource": "python_flaggle.sources",
+    "ImageSource": "python_flaggle.sources",
+    "MemorySource": "python_flaggle.sources",
+    "EnvSource": "python_flaggle.sources",
+    "Subscription": "python_flaggle.subscriptions",
+}
 
-__all__ = ["FlagType", "FlagOperation", "Flag", "Flaggle"]
+__all__ = [
+    "FlagType",
+    "FlagOperation",
+    "Flag",
+    "FlagChanges",
+    "FlagSnapshot",
+    "Flaggle",
+    "AsyncFlaggle",
+    "create_session",
+    "RetryPolicy",
+    "RefreshScheduler",
+    "shared_scheduler",
+    "FlaggleMetrics",
+    "render_prometheus",
+    "FlagSource",
+    "HttpSource",
+    "FileSource",
+    "ImageSource",
+    "MemorySource",
+    "EnvSource",
+    "Subscription",
+]
 __version__ = "0.4.0a2"
 __author__ = "Asaph Diniz"
 __email__ = "contato@asaph.dev.br"
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazy export from its module on first access and cache it."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
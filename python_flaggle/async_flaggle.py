@@ -0,0 +1,328 @@
+"""AsyncFlaggle: asyncio-native feature flag management.
+
+This module provides the AsyncFlaggle class, which polls a remote JSON endpoint
+from an asyncio task using a non-blocking HTTP client, instead of the scheduler
+thread and blocking requests used by Flaggle. Flag evaluation stays synchronous
+through the same Flag objects.
+
+Requires the optional ``httpx`` dependency: ``pip install python-flaggle[async]``.
+
+Classes:
+    AsyncFlaggle: Asyncio client for fetching, updating, and evaluating feature flags.
+"""
+
+from asyncio import CancelledError, Task, create_task, sleep
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Any, Iterable, Optional, Sequence
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra
+    httpx = None
+
+from python_flaggle.flag import Flag, FlagChanges
+from python_flaggle.snapshot import FlagSnapshot
+
+logger = getLogger(__name__)
+
+
+class AsyncFlaggle:
+    """
+    Asyncio client for managing and evaluating feature flags.
+
+    Polls flag definitions from a remote JSON endpoint in an asyncio task, with
+    conditional GET and incremental reloads like Flaggle. Call ``start()`` to
+    fetch the first flags and begin polling, and ``aclose()`` to stop.
+
+    Attributes:
+        _url (str): The endpoint URL to fetch flags from.
+        _interval (int): Polling interval in seconds.
+        _timeout (int): HTTP request timeout in seconds.
+        _verify_ssl (bool): Whether to verify SSL certificates.
+        _client (httpx.AsyncClient): Non-blocking HTTP client used for polling.
+        _flags (dict): Dictionary of flag name to Flag object.
+        _snapshot (FlagSnapshot): Immutable view of the current flags.
+        _last_update (datetime): Last time the flags were updated.
+        _task (Optional[Task]): The polling task, while started.
+
+    Example:
+        ```python
+        async with AsyncFlaggle(url="https://api.example.com/flags", interval=60) as flaggle:
+            if flaggle.flags["feature_a"].is_enabled():
+                print("Feature A is enabled!")
+        ```
+    """
+    def __init__(
+        self,
+        url: str,
+        interval: int = 60,
+        default_flags: Optional[dict] = None,
+        timeout: int = 10,
+        verify_ssl: bool = True,
+        client: Optional[Any] = None,
+    ) -> None:
+        """
+        Initialize an AsyncFlaggle instance without fetching anything.
+
+        Args:
+            url (str): The HTTP(S) endpoint to fetch the flags JSON from.
+            interval (int): How often (in seconds) to poll for flag updates.
+            default_flags (dict, optional): Flags served until the first fetch succeeds.
+            timeout (int): HTTP request timeout in seconds (default: 10).
+            verify_ssl (bool): Whether to verify SSL certificates (default: True).
+            client (httpx.AsyncClient, optional): HTTP client to fetch with; it is
+                not closed by ``aclose()``.
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("AsyncFlaggle requires httpx: pip install python-flaggle[async]")
+
+        self._url: str = url
+        self._interval: int = interval
+        self._timeout: int = timeout
+        self._verify_ssl: bool = verify_ssl
+        self._owns_client: bool = client is None
+        self._client = client if client is not None else httpx.AsyncClient(timeout=timeout, verify=verify_ssl)
+
+        self._flags = default_flags or {}
+        self._snapshot: FlagSnapshot = FlagSnapshot.of(dict(self._flags))
+        self._last_update = datetime.now(timezone.utc) - timedelta(seconds=interval)
+        self._last_changes: FlagChanges = FlagChanges()
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._full_fetch_count: int = 0
+        self._not_modified_count: int = 0
+        self._task: Optional[Task] = None
+
+    async def __aenter__(self) -> "AsyncFlaggle":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    @property
+    def flags(self) -> dict[str, Flag]:
+        """
+        Returns the current flags.
+
+        Returns:
+            dict[str, Flag]: Dictionary of flag name to Flag object.
+        """
+        return self._flags
+
+    def snapshot(self) -> FlagSnapshot:
+        """
+        Returns an immutable, versioned view of the current flags.
+
+        Returns:
+            FlagSnapshot: The latest published snapshot.
+        """
+        return self._snapshot
+
+    def evaluate_batch(self, names: Iterable[str], values: Sequence[Any]) -> Any:
+        """
+        Evaluate several flags against a column of context values in one call.
+
+        All rows come from the same snapshot. Homogeneous numeric numpy columns
+        are evaluated with array comparisons; other columns run one C-level
+        pass per flag instead of a Python call per value.
+
+        Args:
+            names (Iterable[str]): The flag names, one result row each.
+            values (Sequence[Any]): Context values, e.g. a list or a 1-D numpy array.
+        Returns:
+            list[list[bool]] | numpy.ndarray: A ``len(names) x len(values)`` matrix,
+            as a boolean numpy array when ``values`` is one. Rows of unknown flags
+            are all False.
+        Example:
+            ```python
+            matrix = flaggle.evaluate_batch(["min_score", "allowed_ids"], candidate_scores)
+            ```
+        """
+        return self._snapshot.evaluate_batch(names, values)
+
+    @property
+    def last_update(self) -> datetime:
+        """
+        Returns the last update time of the flags.
+
+        Returns:
+            datetime: The last time the flags were updated.
+        """
+        return self._last_update
+
+    @property
+    def last_changes(self) -> FlagChanges:
+        """
+        Returns the flags added, changed, and removed by the last update.
+
+        Returns:
+            FlagChanges: Names of the affected flags; empty when nothing changed.
+        """
+        return self._last_changes
+
+    @property
+    def url(self) -> str:
+        """
+        Returns the URL from which flags are fetched.
+
+        Returns:
+            str: The endpoint URL.
+        """
+        return self._url
+
+    @property
+    def interval(self) -> int:
+        """
+        Returns the update interval in seconds.
+
+        Returns:
+            int: Polling interval in seconds.
+        """
+        return self._interval
+
+    @property
+    def timeout(self) -> int:
+        """
+        Returns the timeout for HTTP requests.
+
+        Returns:
+            int: HTTP request timeout in seconds.
+        """
+        return self._timeout
+
+    @property
+    def verify_ssl(self) -> bool:
+        """
+        Returns whether SSL verification is enabled for HTTP requests.
+
+        Returns:
+            bool: True if SSL verification is enabled, False otherwise.
+        """
+        return self._verify_ssl
+
+    @property
+    def full_fetch_count(self) -> int:
+        """
+        Returns how many fetches received a full (200) flags document.
+
+        Returns:
+            int: Number of 200 responses parsed into flags.
+        """
+        return self._full_fetch_count
+
+    @property
+    def not_modified_count(self) -> int:
+        """
+        Returns how many fetches were answered with 304 Not Modified.
+
+        Returns:
+            int: Number of 304 responses that kept the current flags.
+        """
+        return self._not_modified_count
+
+    async def start(self) -> None:
+        """
+        Fetch the flags once and start the background polling task.
+
+        Calling ``start()`` on a started instance does nothing.
+        """
+        if self._task is not None:
+            return
+        await self._update()
+        self._task = create_task(self._poll())
+        logger.info("Flag update task started (interval=%s seconds)", self._interval)
+
+    async def aclose(self) -> None:
+        """
+        Stop the polling task and close the HTTP client if this instance created it.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+        if self._owns_client:
+            await self._client.aclose()
+
+    def _conditional_headers(self) -> dict[str, str]:
+        """
+        Build the validator headers for a conditional flags request.
+
+        Returns:
+            dict[str, str]: If-None-Match/If-Modified-Since headers from the last full response.
+        """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    async def _fetch_flags(self) -> dict[str, Flag]:
+        """
+        Fetch flags from the configured remote endpoint without blocking the event loop.
+
+        Returns:
+            dict[str, Flag]: Dictionary of flag name to Flag object; empty on failure.
+        """
+        try:
+            logger.info("Fetching flags from %s", self._url)
+            response = await self._client.get(self._url, headers=self._conditional_headers())
+            if response.status_code == 304:
+                self._not_modified_count += 1
+                logger.info("Flags not modified at %s", self._url)
+                return self._flags
+            response.raise_for_status()
+            logger.info("Flags fetched successfully from %s", self._url)
+            flags = Flag.from_json(response.json(), previous=self._flags)
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self._full_fetch_count += 1
+            return flags
+        except httpx.HTTPError as e:
+            logger.error("Error fetching flags from %s: %s", self._url, e, exc_info=True)
+            return {}
+        except ValueError as e:
+            logger.error("Invalid response format from %s: %s", self._url, e, exc_info=True)
+            return {}
+        except Exception as e:
+            logger.critical("Unexpected error during flag fetch: %s", e, exc_info=True)
+            return {}
+
+    async def _update(self) -> FlagChanges:
+        """
+        Update the internal flag dictionary by fetching the latest flags.
+
+        Returns:
+            FlagChanges: Flags added, changed, and removed by this update.
+        """
+        changes = FlagChanges()
+        flags_data = await self._fetch_flags()
+        if flags_data:
+            changes = FlagChanges.between(self._flags, flags_data)
+            if any(changes):
+                self._snapshot = FlagSnapshot.of(dict(flags_data), self._snapshot.version + 1)
+            self._flags = flags_data
+            self._last_changes = changes
+            self._last_update = datetime.now(timezone.utc)
+            logger.info("Flags updated successfully at %s", self._last_update)
+        else:
+            logger.warning("No flags data received; keeping previous flags.")
+        return changes
+
+    async def _poll(self) -> None:
+        """
+        Update flags every ``interval`` seconds until cancelled.
+        """
+        while True:
+            await sleep(self._interval)
+            try:
+                await self._update()
+            except Exception as e:
+                logger.error("Error during recurring flag update: %s", e, exc_info=True)
@@ -0,0 +1,127 @@
+"""Retry timing and circuit breaking for the flag poller.
+
+When the flag server fails, polling at a fixed interval keeps every instance
+hitting it in lock-step. This module spreads retries out with exponential
+backoff and full jitter, and stops outbound calls altogether after repeated
+failures until a cool-down has passed.
+
+Classes:
+    RetryPolicy: Backoff, circuit breaker, and start jitter settings.
+    CircuitBreaker: Counts consecutive failures and decides whether to call out.
+
+Functions:
+    full_jitter: Random backoff delay for a number of consecutive failures.
+"""
+
+from time import monotonic
+from typing import Callable, NamedTuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class RetryPolicy(NamedTuple):
+    """Backoff, circuit breaker, and start jitter settings of a Flaggle poller.
+
+    Attributes:
+        max_delay (float): Upper bound, in seconds, of the delay after failures;
+            polling never waits less than the interval.
+        failure_threshold (int): Consecutive failures that open the circuit; 0 never opens it.
+        reset_timeout (float): Seconds the circuit stays open before one trial request.
+        start_jitter (float): Fraction of the interval by which the first poll is
+            randomly brought forward, so instances started together drift apart.
+
+    Example:
+        ```python
+        flaggle = Flaggle(url, interval=30, retry=RetryPolicy(max_delay=600, failure_threshold=3))
+        ```
+    """
+    max_delay: float = 300.0
+    failure_threshold: int = 5
+    reset_timeout: float = 60.0
+    start_jitter: float = 0.1
+
+
+def full_jitter(failures: int, base: float, cap: float, random: Callable[[], float]) -> float:
+    """
+    Return a delay drawn uniformly from ``[0, min(cap, base * 2 ** failures))``.
+
+    Args:
+        failures (int): Consecutive failures so far.
+        base (float): Delay scale, usually the polling interval.
+        cap (float): Upper bound of the delay.
+        random (Callable[[], float]): Source of uniform numbers in ``[0, 1)``.
+    Returns:
+        float: The delay in seconds.
+    """
+    return random() * min(cap, base * 2 ** min(failures, 62))
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and allows one trial call after a cool-down.
+
+    States are ``"closed"`` (calls allowed), ``"open"`` (calls refused until
+    ``reset_timeout`` has passed), and ``"half-open"`` (one trial call allowed;
+    its outcome closes or re-opens the circuit).
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the circuit; 0 never opens it.
+        reset_timeout (float): Seconds the circuit stays open.
+        failures (int): Consecutive failures recorded.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = monotonic) -> None:
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit; 0 never opens it.
+            reset_timeout (float): Seconds the circuit stays open before a trial call.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self._clock = clock
+        self._opened_at: float = 0.0
+        self._state: str = CLOSED
+
+    @property
+    def state(self) -> str:
+        """
+        Returns the breaker state.
+
+        Returns:
+            str: ``"closed"``, ``"open"``, or ``"half-open"``.
+        """
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may go out now.
+
+        Returns:
+            bool: False while the circuit is open and cooling down.
+        """
+        state = self.state
+        if state == HALF_OPEN:
+            self._state = HALF_OPEN
+        return state != OPEN
+
+    def record_success(self) -> None:
+        """
+        Close the circuit and reset the failure count.
+        """
+        self.failures = 0
+        self._state = CLOSED
+
+    def record_failure(self) -> None:
+        """
+        Count a failure, opening the circuit at the threshold or after a failed trial.
+        """
+        self.failures += 1
+        if self._state == HALF_OPEN or (self.failure_threshold and self.failures >= self.failure_threshold):
+            self._state = OPEN
+            self._opened_at = self._clock()
@@ -0,0 +1,178 @@
+"""Memoised flag evaluation.
+
+This module provides EvaluationCache, a bounded LRU cache of ``is_enabled``
+results keyed on the flag and its argument, with optional expiry. Each entry
+remembers the Flag object it was computed from, so a result is only served
+while that exact flag is current; replaced flags are also evicted eagerly with
+``invalidate``.
+
+Classes:
+    CacheStats: Counters of an EvaluationCache.
+    EvaluationCache: Bounded LRU/TTL cache of flag evaluation results.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Iterable, NamedTuple, Optional
+
+from python_flaggle.flag import Flag
+
+
+class CacheStats(NamedTuple):
+    """Counters of an EvaluationCache.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that evaluated the flag.
+        evictions (int): Entries dropped for size or expiry.
+        invalidations (int): Entries dropped because their flag was replaced or removed.
+        size (int): Entries currently cached.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class EvaluationCache:
+    """Bounded LRU cache of flag evaluation results, with optional expiry.
+
+    Arguments are keyed on their type and value, and dict contexts on the type
+    and value of each item, so equal values of different types (``1``, ``1.0``,
+    ``True``) are cached separately. Arguments that cannot be hashed
+    (such as contexts holding lists) are evaluated without caching.
+
+    Attributes:
+        max_size (int): Maximum number of cached results.
+        ttl (Optional[float]): Seconds a result stays valid, or None for no expiry.
+
+    Example:
+        ```python
+        cache = EvaluationCache(max_size=1024, ttl=30)
+        cache.evaluate(flags["env"], "production")
+        ```
+    """
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached results; must be positive.
+            ttl (Optional[float]): Seconds a result stays valid, or None for no expiry.
+        Raises:
+            ValueError: If ``max_size`` is not positive or ``ttl`` is negative.
+        """
+        if max_size <= 0:
+            raise ValueError("Evaluation cache size must be positive")
+        if ttl is not None and ttl < 0:
+            raise ValueError("Evaluation cache TTL must not be negative")
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self._entries: OrderedDict[tuple[str, type, Hashable], tuple[Flag, bool, float]] = OrderedDict()
+        self._keys_by_flag: dict[str, set[tuple[str, type, Hashable]]] = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Returns the cache counters.
+
+        Hits are counted without locking and may undercount slightly under
+        heavy concurrency.
+
+        Returns:
+            CacheStats: Hits, misses, evictions, invalidations, and current size.
+        """
+        return CacheStats(self._hits, self._misses, self._evictions, self._invalidations, len(self._entries))
+
+    def evaluate(self, flag: Flag, other_value: Optional[Any] = None) -> bool:
+        """
+        Return ``flag.is_enabled(other_value)``, from the cache when possible.
+
+        Args:
+            flag (Flag): The current flag.
+            other_value (Optional[Any]): The argument, e.g. a value or a context mapping.
+        Returns:
+            bool: The flag's result.
+        """
+        # Keys carry the value's type: 1, 1.0, and True compare equal but may
+        # evaluate differently (percentage rollouts bucket on str(value)).
+        value = other_value
+        if isinstance(value, dict):
+            try:
+                value = frozenset((name, type(item), item) for name, item in value.items())
+            except TypeError:
+                return flag.is_enabled(other_value)
+        key = (flag._name, type(other_value), value)
+        ttl = self.ttl
+        now = monotonic() if ttl is not None else 0.0
+        # Hits skip the lock: each dict operation is atomic, and an entry evicted
+        # concurrently only makes move_to_end fail.
+        try:
+            entry = self._entries.get(key)
+        except TypeError:
+            return flag.is_enabled(other_value)
+        if entry is not None and entry[0] is flag and (ttl is None or entry[2] > now):
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                pass
+            self._hits += 1
+            return entry[1]
+
+        with self._lock:
+            if entry is not None:
+                if entry[0] is not flag:
+                    self._invalidations += 1
+                else:
+                    self._evictions += 1
+            self._misses += 1
+
+        result = flag.is_enabled(other_value)
+        with self._lock:
+            if key not in self._entries:
+                self._keys_by_flag.setdefault(key[0], set()).add(key)
+            self._entries[key] = (flag, result, now + ttl if ttl is not None else 0.0)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._evict_oldest()
+        return result
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        """
+        Drop the cached results of the named flags.
+
+        Args:
+            names (Iterable[str]): Names of flags that were replaced or removed.
+        """
+        with self._lock:
+            for name in names:
+                for key in self._keys_by_flag.pop(name, ()):
+                    del self._entries[key]
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Drop every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_flag.clear()
+
+    def _evict_oldest(self) -> None:
+        """Drop the least recently used entry; the lock must be held."""
+        key, _ = self._entries.popitem(last=False)
+        keys = self._keys_by_flag[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_flag[key[0]]
+        self._evictions += 1
@@ -6,12 +6,21 @@ Classes:
     FlagType: Enum representing supported flag value types.
     FlagOperation: Enum of supported flag comparison operations.
     Flag: Represents a single feature flag and its evaluation logic.
+    FlagChanges: Names of flags added, changed, and removed between two flag sets.
 """
 
+from bisect import bisect_left
 from enum import Enum
+from itertools import repeat
 from logging import getLogger
+from operator import eq, ge, gt, le, lt, ne, not_
+from sys import intern, modules
 from traceback import format_exc
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence
+
+from python_flaggle.rollout import buckets, in_rollout, salt_seed, threshold
+from python_flaggle.rules import RuleSet
+from python_flaggle.stream import iter_flag_definitions
 
 logger = getLogger(__name__)
 
@@ -77,6 +86,8 @@ class FlagOperation(Enum):
     """Enumeration of supported flag comparison operations.
 
     Each operation is a callable that takes two arguments and returns a boolean.
+    PCT also accepts the bucketing salt as an optional third argument; a Flag
+    passes its own salt, while a two-argument call buckets with an empty salt.
 
     Supported operations:
         EQ: Equal to
@@ -87,6 +98,7 @@ class FlagOperation(Enum):
         LE: Less than or equal to
         IN: Value is in a list/array
         NI: Value is not in a list/array
+        PCT: Key falls within the first ``second`` percent of the rollout buckets
     """
     # fmt: off
     EQ = lambda first, second: first == second      # noqa: E731
@@ -97,6 +109,7 @@ class FlagOperation(Enum):
     LE = lambda first, second: first <= second      # noqa: E731
     IN = lambda first, second: first in second      # noqa: E731
     NI = lambda first, second: first not in second  # noqa: E731
+    PCT = lambda first, second, salt="": in_rollout(first, salt_seed(salt), threshold(second))  # noqa: E731
     # fmt: on
 
     @classmethod
@@ -124,6 +137,158 @@ class FlagOperation(Enum):
             raise
 
 
+_COMPARABLE_TYPES = frozenset(
+    (FlagType.STRING, FlagType.INTEGER, FlagType.FLOAT, FlagType.ARRAY)
+)
+
+# C-level equivalents of the FlagOperation lambdas, used by compiled evaluators.
+_OPERATORS = {
+    FlagOperation.EQ: eq,
+    FlagOperation.NE: ne,
+    FlagOperation.GT: gt,
+    FlagOperation.GE: ge,
+    FlagOperation.LT: lt,
+    FlagOperation.LE: le,
+}
+
+# Lower-case JSON names of the FlagOperation members, used when serialising flags.
+_OPERATION_NAMES = {
+    operation: name.lower()
+    for name, operation in vars(FlagOperation).items()
+    if name.isupper() and callable(operation)
+}
+
+
+class _SortedMembers:
+    """Membership test over a sorted copy of unhashable but orderable values."""
+    __slots__ = ("_items",)
+
+    def __init__(self, values: list) -> None:
+        self._items = sorted(values)
+
+    def __contains__(self, item: Any) -> bool:
+        items = self._items
+        index = bisect_left(items, item)
+        return index < len(items) and items[index] == item
+
+
+def _members(value: Any) -> Any:
+    """Build the container used for IN/NI checks against ``value``.
+
+    Lists are indexed into a frozenset, or a sorted array when their items are
+    unhashable, so membership is not a linear scan. Other values are returned
+    unchanged.
+
+    Args:
+        value (Any): The flag value.
+
+    Returns:
+        Any: A container supporting ``in`` with the same results as ``value``.
+    """
+    if not isinstance(value, list):
+        return value
+    try:
+        return frozenset(value)
+    except TypeError:
+        pass
+    try:
+        return _SortedMembers(value)
+    except TypeError:
+        return value
+
+
+def _always_true(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for flags that are enabled regardless of the argument."""
+    return True
+
+
+def _always_false(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for flags that are disabled regardless of the argument."""
+    return False
+
+
+def _comparison(compare: Callable[[Any, Any], bool]) -> Callable[["Flag", Optional[Any]], bool]:
+    """Build the shared evaluator comparing the argument with a flag's operand.
+
+    Args:
+        compare (Callable[[Any, Any], bool]): Binary comparison, argument first.
+
+    Returns:
+        Callable[[Flag, Optional[Any]], bool]: Evaluator taking the flag and the argument.
+    """
+    def evaluate(flag: "Flag", other_value: Optional[Any]) -> bool:
+        if other_value is None:
+            return bool(flag._value)
+        return compare(other_value, flag._operand)
+
+    return evaluate
+
+
+def _contains(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for IN, using the flag's indexed members."""
+    if other_value is None:
+        return bool(flag._value)
+    try:
+        return other_value in flag._operand
+    except TypeError:
+        return other_value in flag._value
+
+
+def _not_contains(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for NI, using the flag's indexed members."""
+    if other_value is None:
+        return bool(flag._value)
+    try:
+        return other_value not in flag._operand
+    except TypeError:
+        return other_value not in flag._value
+
+
+def _rollout(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for PCT, bucketing the key with the flag's salted seed."""
+    _, seed, limit = flag._operand
+    return in_rollout(other_value, seed, limit)
+
+
+def _ruled(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for flags with targeting rules; the argument is the context mapping."""
+    return flag._operand.evaluate(other_value)
+
+
+def _custom(flag: "Flag", other_value: Optional[Any]) -> bool:
+    """Evaluator for operations that are not FlagOperation members."""
+    if other_value is None:
+        return bool(flag._value)
+    return flag._operation(other_value, flag._value)
+
+
+# One evaluator per operation, shared by every flag so flags hold no closures.
+_EVALUATORS = {operation: _comparison(compare) for operation, compare in _OPERATORS.items()}
+_EVALUATORS[FlagOperation.IN] = _contains
+_EVALUATORS[FlagOperation.NI] = _not_contains
+_EVALUATORS[FlagOperation.PCT] = _rollout
+
+_NUMERIC_TYPES = frozenset((FlagType.INTEGER, FlagType.FLOAT))
+
+
+def _array_module(values: Any) -> Any:
+    """Return the numpy module if ``values`` is a numpy array, else None.
+
+    numpy is never imported here: if the caller passed an array, it is loaded already.
+    """
+    numpy = modules.get("numpy")
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy
+    return None
+
+
+def _numeric_members(value: Any) -> Optional[list]:
+    """Return ``value`` if it is a list of plain ints and floats, else None."""
+    if isinstance(value, list) and all(type(item) is int or type(item) is float for item in value):
+        return value
+    return None
+
+
 class Flag:
     """Represents a single feature flag and its evaluation logic.
 
@@ -133,13 +298,20 @@ class Flag:
         description (Optional[str]): Optional human-readable description.
         operation (Optional[FlagOperation]): Optional operation for evaluation.
         flag_type (FlagType): The inferred type of the flag value.
+
+    Flags use ``__slots__`` instead of a per-instance ``__dict__``, and intern their
+    name and string value, to keep large flag sets compact.
     """
+    __slots__ = ("_name", "_value", "_description", "_operation", "_flag_type", "_evaluate", "_operand")
+
     def __init__(
         self,
         name: str,
         value: Any,
         description: Optional[str] = None,
         operation: Optional[FlagOperation] = None,
+        salt: Optional[str] = None,
+        rules: Optional[list[dict]] = None,
     ):
         """Initialize a Flag instance.
 
@@ -148,12 +320,23 @@ class Flag:
             value (Any): The value of the flag.
             description (Optional[str]): Optional description.
             operation (Optional[FlagOperation]): Optional operation for evaluation.
+            salt (Optional[str]): Bucketing salt of a PCT flag, or of the ``pct``
+                conditions in its rules; defaults to the name. Flags sharing a salt
+                enable the same keys first.
+            rules (Optional[list[dict]]): Ordered targeting rules, evaluated against
+                the context mapping passed to ``is_enabled``; the flag's own value
+                is the result when no rule matches. See ``python_flaggle.rules``.
+
+        Raises:
+            ValueError: If a PCT flag's value is not a percentage between 0 and 100,
+                or the rules are invalid or combined with an operation.
         """
-        self._name: str = name
-        self._value = value
+        self._name: str = intern(name) if type(name) is str else name
+        self._value = intern(value) if type(value) is str else value
         self._description: Optional[str] = description
         self._operation: Optional[FlagOperation] = operation
         self._flag_type: FlagType = FlagType.from_value(value=value)
+        self._compile(salt, rules)
 
     def __str__(self) -> str:
         """Return a string representation of the flag."""
@@ -184,6 +367,22 @@ class Flag:
         """The human-readable description of the flag, if any."""
         return self._description
 
+    @property
+    def salt(self) -> Optional[str]:
+        """The bucketing salt of a PCT flag, or None for other operations."""
+        if self._operation is FlagOperation.PCT:
+            return self._operand[0]
+        if self._evaluate is _ruled:
+            return self._operand.salt
+        return None
+
+    @property
+    def rules(self) -> Optional[list[dict]]:
+        """The targeting rule definitions of the flag, or None if it has none."""
+        if self._evaluate is _ruled:
+            return self._operand.definitions
+        return None
+
     @property
     def status(self) -> bool:
         """Whether the flag is considered enabled (truthy value).
@@ -195,6 +394,33 @@ class Flag:
             return bool(self._value)
         return False
 
+    def to_dict(self) -> dict:
+        """Return the JSON definition of the flag, as accepted by ``from_json``.
+
+        Returns:
+            dict: The flag's name, value, and, when set, description and operation.
+
+        Raises:
+            ValueError: If the operation is not a FlagOperation member.
+
+        Example:
+            >>> Flag(name="min_version", value=3, operation=FlagOperation.GE).to_dict()
+            {'name': 'min_version', 'value': 3, 'operation': 'ge'}
+        """
+        data = {"name": self._name, "value": self._value}
+        if self._description is not None:
+            data["description"] = self._description
+        if self._operation is not None:
+            try:
+                data["operation"] = _OPERATION_NAMES[self._operation]
+            except KeyError as exc:
+                raise ValueError(f"Operation of flag '{self._name}' cannot be serialised") from exc
+        if self.rules is not None:
+            data["rules"] = self.rules
+        if self.salt is not None and self.salt != self._name:
+            data["salt"] = self.salt
+        return data
+
     def is_enabled(self, other_value: Optional[Any] = None) -> bool:
         """Evaluate whether the flag is enabled, optionally comparing to another value.
 
@@ -209,30 +435,153 @@ class Flag:
             >>> flag.is_enabled(4)
             True
         """
-        logger.debug(f"Flag {self._name} is of type {self._flag_type}")
-        if self._flag_type == FlagType.BOOLEAN:
-            return self._value
-        elif self._flag_type in (
-            FlagType.STRING,
-            FlagType.INTEGER,
-            FlagType.FLOAT,
-            FlagType.ARRAY,
+        return self._evaluate(self, other_value)
+
+    def is_enabled_many(self, values: Sequence[Any]) -> Any:
+        """Evaluate the flag against each value of a column, as ``is_enabled`` would.
+
+        Comparisons and IN/NI checks run as one C-level pass over the column
+        instead of a Python call per value. numpy arrays of numbers compared
+        with a numeric flag are evaluated with array operations and return a
+        boolean array.
+
+        Args:
+            values (Sequence[Any]): Context values, e.g. a list or a 1-D numpy array.
+
+        Returns:
+            list[bool] | numpy.ndarray: One result per value, in order.
+
+        Example:
+            >>> flag = Flag(name="min_version", value=3, operation=FlagOperation.GE)
+            >>> flag.is_enabled_many([2, 3, 4])
+            [False, True, True]
+        """
+        evaluate = self._evaluate
+        numpy = _array_module(values)
+        if numpy is not None:
+            result = self._evaluate_array(numpy, values)
+            if result is not None:
+                return result
+            values = values.tolist()
+        return self._evaluate_list(evaluate, values)
+
+    def _evaluate_array(self, numpy: Any, values: Any) -> Any:
+        """Evaluate a numeric numpy column with array operations, or return None."""
+        if values.ndim != 1:
+            return None
+        if self._evaluate is _rollout:
+            if values.dtype.kind == "O":
+                return None
+            _, seed, limit = self._operand
+            return buckets(values, seed) < limit
+        if self._evaluate is _always_true or self._evaluate is _always_false:
+            return numpy.full(len(values), self._evaluate is _always_true)
+        if values.dtype.kind not in "iuf" or self._evaluate is not _EVALUATORS.get(self._operation):
+            return None
+        compare = _OPERATORS.get(self._operation)
+        if compare is not None:
+            if self._flag_type not in _NUMERIC_TYPES:
+                return None
+            return compare(values, self._operand)
+        members = _numeric_members(self._value)
+        if members is None:
+            return None
+        return numpy.isin(values, members, invert=self._operation is FlagOperation.NI)
+
+    def _evaluate_list(self, evaluate: Callable[["Flag", Optional[Any]], bool], values: Sequence[Any]) -> list[bool]:
+        """Evaluate a column of Python values, mapping C-level operators where possible."""
+        count = len(values)
+        if evaluate is _always_true or evaluate is _always_false:
+            return [evaluate is _always_true] * count
+        if evaluate is _rollout and None not in values:
+            _, seed, limit = self._operand
+            return [found < limit for found in buckets(values, seed)]
+        if evaluate is _EVALUATORS.get(self._operation) and None not in values:
+            compare = _OPERATORS.get(self._operation)
+            if compare is not None:
+                return list(map(compare, values, repeat(self._operand, count)))
+            try:
+                found = map(self._operand.__contains__, values)
+                if self._operation is FlagOperation.NI:
+                    return list(map(not_, found))
+                return list(found)
+            except TypeError:
+                pass
+        return [evaluate(self, value) for value in values]
+
+    def _matches(
+        self,
+        value: Any,
+        description: Optional[str],
+        operation: Optional[FlagOperation],
+        salt: Optional[str] = None,
+        rules: Optional[list[dict]] = None,
+    ) -> bool:
+        """Check whether this flag was built from the given definition."""
+        if not (
+            self._operation is operation
+            and self._description == description
+            and type(self._value) is type(value)
+            and self._value == value
         ):
-            if other_value is None or self._operation is None:
-                logger.debug("No value to compare or operator not defined")
-                return bool(self._value)
-            return self._operation(other_value, self._value)
-        elif self._flag_type in (FlagType.NULL, FlagType.EMPTY):
             return False
+        if operation is not FlagOperation.PCT and rules is None:
+            return self._evaluate is not _ruled
+        return self.rules == rules and self.salt == (salt or self._name)
+
+    def _compile(self, salt: Optional[str] = None, rules: Optional[list[dict]] = None) -> None:
+        """Select the evaluator for this flag's type and operation.
+
+        Runs once per flag so that ``is_enabled`` does no type dispatch per call.
+        Sets ``_evaluate`` to a shared evaluator function and ``_operand`` to the
+        value it compares against, indexed for IN/NI. For PCT, ``_operand`` holds
+        the salt, its hashed seed, and the bucket threshold; for flags with rules,
+        the compiled RuleSet.
+
+        Args:
+            salt (Optional[str]): Bucketing salt of a PCT flag or its rules; defaults to the name.
+            rules (Optional[list[dict]]): Targeting rule definitions.
+
+        Raises:
+            ValueError: If a PCT flag's value is not a percentage between 0 and 100,
+                or the rules are invalid or combined with an operation.
+        """
+        if rules is not None:
+            if self._operation is not None:
+                raise ValueError(f"Flag '{self._name}' cannot have both rules and an operation")
+            self._compile()
+            self._operand = RuleSet(rules, salt or self._name, self._evaluate(self, None))
+            self._evaluate = _ruled
+            return
+        self._operand = self._value
+        if self._operation is FlagOperation.PCT:
+            if self._flag_type not in _NUMERIC_TYPES or not 0 <= self._value <= 100:
+                raise ValueError(f"Percentage of flag '{self._name}' must be a number between 0 and 100")
+            salt = salt or self._name
+            self._operand = (salt, salt_seed(salt), threshold(self._value))
+            self._evaluate = _rollout
+        elif self._flag_type is FlagType.BOOLEAN:
+            self._evaluate = _always_true if self._value else _always_false
+        elif self._flag_type not in _COMPARABLE_TYPES:
+            self._evaluate = _always_false
+        elif self._operation is None:
+            self._evaluate = _always_true if self._value else _always_false
         else:
-            return False
+            self._evaluate = _EVALUATORS.get(self._operation, _custom)
+            if self._operation is FlagOperation.IN or self._operation is FlagOperation.NI:
+                self._operand = _members(self._value)
 
     @classmethod
-    def from_json(cls: "Flag", data: dict) -> dict[str, "Flag"]:
+    def from_json(cls: "Flag", data: dict, previous: Optional[dict[str, "Flag"]] = None) -> dict[str, "Flag"]:
         """Create a dictionary of Flag objects from a JSON-like dictionary.
 
+        When ``previous`` is given, flags whose definition is unchanged are reused
+        from it instead of being rebuilt, so only added or modified flags are
+        constructed. Use ``FlagChanges.between`` to find out which ones those are.
+
         Args:
             data (dict): The JSON data containing a 'flags' key with a list of flag definitions.
+            previous (Optional[dict[str, Flag]]): Currently loaded flags to reuse.
 
         Returns:
             dict[str, Flag]: A dictionary mapping flag names to Flag objects.
@@ -252,32 +601,139 @@ class Flag:
                 logger.error("No flags in the provided JSON data: %r", data)
                 raise ValueError("No flags in the provided JSON data")
 
-            result = {}
-            for flag_data in flags_data:
-                name = flag_data.get("name")
-                if not name:
-                    logger.warning("Found flag without name, skipping: %r", flag_data)
-                    continue
+            return cls._from_definitions(flags_data, previous)
+
+        except (KeyError, AttributeError) as exc:
+            logger.error("Invalid JSON data: %s", exc, exc_info=True)
+            raise ValueError(f"Invalid JSON data: {exc}") from exc
+        except Exception as exc:
+            logger.critical("Unexpected error in Flag.from_json: %s", exc, exc_info=True)
+            raise ValueError(f"Invalid JSON data: {exc}") from exc
+
+    @classmethod
+    def to_json(cls: "Flag", flags: dict[str, "Flag"]) -> dict:
+        """Create a JSON-like dictionary from Flag objects; the inverse of ``from_json``.
 
-                value = flag_data.get("value")
-                description = flag_data.get("description")
+        Args:
+            flags (dict[str, Flag]): A dictionary mapping flag names to Flag objects.
 
-                operation_str = flag_data.get("operation")
-                operation = None
-                if operation_str:
-                    try:
-                        operation = FlagOperation.from_string(operation_str)
-                    except Exception as exc:
-                        logger.error("Invalid operation '%s' for flag '%s': %s", operation_str, name, exc, exc_info=True)
-                        raise ValueError("Invalid JSON data: invalid operation") from exc
+        Returns:
+            dict: A dictionary with a 'flags' key holding the flag definitions.
 
-                result[name] = cls(name, value, description, operation)
+        Raises:
+            ValueError: If a flag's operation cannot be serialised.
 
-            return result
+        Example:
+            >>> Flag.to_json({"feature_x": Flag("feature_x", True)})
+            {'flags': [{'name': 'feature_x', 'value': True}]}
+        """
+        return {"flags": [flag.to_dict() for flag in flags.values()]}
 
+    @classmethod
+    def from_stream(cls: "Flag", chunks: Iterable[bytes], previous: Optional[dict[str, "Flag"]] = None) -> dict[str, "Flag"]:
+        """Create a dictionary of Flag objects from a JSON document read in chunks.
+
+        The document is decoded once and each flag is built as soon as its
+        definition has been read, without materialising the whole document.
+
+        Args:
+            chunks (Iterable[bytes]): The UTF-8 JSON document, in chunks of any size.
+            previous (Optional[dict[str, Flag]]): Currently loaded flags to reuse.
+
+        Returns:
+            dict[str, Flag]: A dictionary mapping flag names to Flag objects.
+
+        Raises:
+            ValueError: If the JSON data is invalid or missing required fields.
+
+        Example:
+            >>> chunks = [b'{"flags": [{"name": "feature_x", ', b'"value": true}]}']
+            >>> flags = Flag.from_stream(chunks)
+            >>> flags["feature_x"].is_enabled()
+            True
+        """
+        try:
+            return cls._from_definitions(iter_flag_definitions(chunks), previous)
         except (KeyError, AttributeError) as exc:
             logger.error("Invalid JSON data: %s", exc, exc_info=True)
             raise ValueError(f"Invalid JSON data: {exc}") from exc
+        except ValueError as exc:
+            logger.error("Invalid JSON data: %s", exc)
+            raise
         except Exception as exc:
-            logger.critical("Unexpected error in Flag.from_json: %s", exc, exc_info=True)
+            logger.critical("Unexpected error in Flag.from_stream: %s", exc, exc_info=True)
             raise ValueError(f"Invalid JSON data: {exc}") from exc
+
+    @classmethod
+    def _from_definitions(
+        cls: "Flag", definitions: Iterable[dict], previous: Optional[dict[str, "Flag"]]
+    ) -> dict[str, "Flag"]:
+        """Build flags from an iterable of flag definitions, reusing unchanged ones."""
+        result = {}
+        for flag_data in definitions:
+            name = flag_data.get("name")
+            if not name:
+                logger.warning("Found flag without name, skipping: %r", flag_data)
+                continue
+
+            value = flag_data.get("value")
+            description = flag_data.get("description")
+            salt = flag_data.get("salt")
+            rules = flag_data.get("rules")
+
+            operation_str = flag_data.get("operation")
+            operation = None
+            if operation_str:
+                try:
+                    operation = FlagOperation.from_string(operation_str)
+                except Exception as exc:
+                    logger.error("Invalid operation '%s' for flag '%s': %s", operation_str, name, exc, exc_info=True)
+                    raise ValueError("Invalid JSON data: invalid operation") from exc
+
+            current = previous.get(name) if previous else None
+            if type(current) is cls and current._matches(value, description, operation, salt, rules):
+                result[current._name] = current
+            else:
+                extra = {key: item for key, item in (("salt", salt), ("rules", rules)) if item is not None}
+                flag = cls(name, value, description, operation, **extra)
+                result[flag._name] = flag
+
+        return result
+
+
+class FlagChanges(NamedTuple):
+    """Names of the flags added, changed, and removed by a reload.
+
+    Attributes:
+        added (frozenset[str]): Flags present only in the new set.
+        changed (frozenset[str]): Flags present in both sets but rebuilt.
+        removed (frozenset[str]): Flags present only in the old set.
+    """
+    added: frozenset = frozenset()
+    changed: frozenset = frozenset()
+    removed: frozenset = frozenset()
+
+    @classmethod
+    def between(cls, old: dict[str, "Flag"], new: dict[str, "Flag"]) -> "FlagChanges":
+        """Compare two flag sets, treating reused Flag objects as unchanged.
+
+        Args:
+            old (dict[str, Flag]): The flags before the reload.
+            new (dict[str, Flag]): The flags after the reload.
+
+        Returns:
+            FlagChanges: The added, changed, and removed flag names.
+
+        Example:
+            >>> old = Flag.from_json({"flags": [{"name": "a", "value": True}]})
+            >>> new = Flag.from_json({"flags": [{"name": "a", "value": False}]}, previous=old)
+            >>> FlagChanges.between(old, new).changed
+            frozenset({'a'})
+        """
+        if old is new:
+            return cls()
+        return cls(
+            added=frozenset(new.keys() - old.keys()),
+            changed=frozenset(name for name in new.keys() & old.keys() if new[name] is not old[name]),
+            removed=frozenset(old.keys() - new.keys()),
+        )
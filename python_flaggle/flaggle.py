@@ -1,43 +1,111 @@
 """Flaggle: Feature flag management for Python applications.
 
 This module provides the Flaggle class, which fetches and manages feature flags
-from a remote JSON endpoint, enabling dynamic feature toggling and gradual rollouts.
+from a remote JSON endpoint (or any other FlagSource), enabling dynamic feature
+toggling and gradual rollouts.
 
 Classes:
     Flaggle: Main class for fetching, updating, and evaluating feature flags.
 """
 
 from datetime import datetime, timedelta, timezone
+from json import loads
 from logging import getLogger
-from sched import scheduler
-from threading import Thread
-from time import sleep, time
-from typing import Optional
+from os import stat
+from random import Random
+from sched import scheduler as EventScheduler
+from socket import SHUT_RDWR
+from threading import Event, Lock, Thread
+from time import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Sequence
+
+from python_flaggle.backoff import CircuitBreaker, RetryPolicy, full_jitter
+from python_flaggle.cache import CacheStats, EvaluationCache
+from python_flaggle.flag import Flag, FlagChanges
+from python_flaggle.metrics import FlaggleMetrics
+from python_flaggle.push import iter_events
+from python_flaggle.scheduler import RefreshJob, RefreshScheduler
+from python_flaggle.shared import FlagImageReader, FlagImageWriter
+from python_flaggle.snapshot import FlagSnapshot
+from python_flaggle.sources import FlagSource, HttpSource, ImageSource, create_session
+from python_flaggle.subscriptions import Subscribers, Subscription
+
+if TYPE_CHECKING:
+    from requests import Response, Session
 
-from requests import RequestException, get
+logger = getLogger(__name__)
 
-from python_flaggle.flag import Flag
 
-logger = getLogger(__name__)
+def _interrupt(response: "Response") -> None:
+    """
+    Unblock a thread reading a streamed response by shutting down its socket.
+
+    Closing the response itself would wait for the reading thread to release it.
+    """
+    sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(SHUT_RDWR)
+        except OSError:
+            pass
 
 
 class Flaggle:
     """
     Main class for managing and evaluating feature flags in Python applications.
 
-    Periodically fetches flag definitions from a remote JSON endpoint and provides
-    a simple API for evaluating those flags at runtime.
+    Periodically fetches flag definitions from a remote JSON endpoint, or from
+    another FlagSource such as a local file, and provides a simple API for
+    evaluating those flags at runtime.
+
+    In multi-process servers, one Flaggle can publish what it fetches to a shared
+    image file (``publish_image``) that worker Flaggles read instead of polling the
+    endpoint themselves (``shared_image``).
 
     Attributes:
-        _url (str): The endpoint URL to fetch flags from.
+        _url (Optional[str]): The endpoint URL to fetch flags from.
+        _source (FlagSource): Where flags are loaded from on every poll.
+        _http (Optional[HttpSource]): Source for ``url``, whose session the push stream shares.
         _interval (int): Polling interval in seconds.
         _timeout (int): HTTP request timeout in seconds.
         _verify_ssl (bool): Whether to verify SSL certificates.
+        _session (Optional[Session]): HTTP session reused across polls and by the push
+            stream, keeping connections alive; None without a ``url`` or ``push_url``.
+        _owns_push_session (bool): Whether the session was created here for the push
+            stream alone, and is closed with the instance.
+        _streaming (bool): Whether flag documents are parsed incrementally while downloading.
         _flags (dict): Dictionary of flag name to Flag object.
         _last_update (datetime): Last time the flags were updated.
+        _last_changes (FlagChanges): Flags added, changed, and removed by the last update.
+        _snapshot (FlagSnapshot): Immutable view of the current flags, replaced on change.
+        _full_fetch_count (int): Number of fetches (200 responses, new images or
+            files, ...) parsed into flags.
+        _not_modified_count (int): Number of fetches (304 responses, unchanged
+            images or files, ...) that reused the current flags.
+        _image_writer (Optional[FlagImageWriter]): Writer publishing fetched flags to a shared image.
+        _cache_writer (Optional[FlagImageWriter]): Writer persisting fetched flags to the on-disk cache.
+        _eval_cache (Optional[EvaluationCache]): Memoised results of ``is_enabled``, if enabled.
+        _retry (Optional[RetryPolicy]): Backoff and circuit breaker settings; None polls at a fixed interval.
+        _breaker (CircuitBreaker): Consecutive fetch failures and circuit state.
+        _push_url (Optional[str]): Server-Sent Events endpoint pushing flag documents, if any.
+        _push_connected (Event): Set while the push stream is connected; polling pauses meanwhile.
+        _update_lock (Lock): Serialises applying fetched and pushed flags.
+        _ready (Event): Set once flags have been loaded from the server, an image, or the cache.
+        _refresh_scheduler (Optional[RefreshScheduler]): Shared scheduler polling this instance,
+            instead of its own scheduler thread.
+        _refresh_job (Optional[RefreshJob]): This instance's job on the shared scheduler.
+        _closed (bool): Whether ``close()`` was called.
+        _stopped (Event): Set by ``close()``; wakes the scheduler and push threads from their waits.
+        _push_response (Optional[Response]): The open push stream, closed to interrupt it.
+        _metrics (Optional[FlaggleMetrics]): Evaluation and fetch metrics, if enabled.
+        _subscribers (Optional[Subscribers]): Change subscriptions, created by the first ``subscribe``.
+        _subscriber_workers (int): Worker threads running subscription callbacks.
         _scheduler (scheduler): Scheduler for periodic updates.
         _scheduler_thread (Thread): Background thread for the scheduler.
 
+    Use it as a context manager, or call ``close()``, to stop polling and release
+    its thread and connections.
+
     Example:
         ```python
         flaggle = Flaggle(url="https://api.example.com/flags", interval=60)
@@ -47,34 +115,143 @@ class Flaggle:
     """
     def __init__(
         self,
-        url: str,
+        url: Optional[str] = None,
         interval: int = 60,
         default_flags: Optional[dict] = None,
         timeout: int = 10,
         verify_ssl: bool = True,
+        session: Optional["Session"] = None,
+        pool_size: int = 10,
+        streaming: bool = False,
+        shared_image: Optional[str] = None,
+        publish_image: Optional[str] = None,
+        eval_cache_size: int = 0,
+        eval_cache_ttl: Optional[float] = None,
+        retry: Optional[RetryPolicy] = RetryPolicy(),
+        push_url: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        blocking: bool = True,
+        scheduler: Optional[RefreshScheduler] = None,
+        metrics: Optional[FlaggleMetrics] = None,
+        source: Optional[FlagSource] = None,
+        subscriber_workers: int = 1,
     ) -> None:
         """
         Initialize a Flaggle instance.
 
         Args:
-            url (str): The HTTP(S) endpoint to fetch the flags JSON from.
+            url (str, optional): The HTTP(S) endpoint to fetch the flags JSON from.
+                Required unless ``shared_image`` or ``source`` is given.
             interval (int): How often (in seconds) to poll for flag updates.
             default_flags (dict, optional): Fallback flags if remote fetch fails.
             timeout (int): HTTP request timeout in seconds (default: 10).
             verify_ssl (bool): Whether to verify SSL certificates (default: True).
+            session (Session, optional): HTTP session to fetch with; share one session
+                between instances to share its connection pool.
+            pool_size (int): Connection pool size of the session created when none
+                is given (default: 10).
+            streaming (bool): Parse the flags document while it downloads, building
+                flags as they arrive instead of loading the whole body first (default: False).
+            shared_image (str, optional): Path of a flag image published by another
+                process; flags are read from it instead of ``url``, and only decoded
+                when its version changes.
+            publish_image (str, optional): Path to publish every fetched flag set to,
+                as a versioned image for ``shared_image`` readers in other processes.
+            eval_cache_size (int): Number of ``is_enabled`` results to memoise per
+                (flag, argument), evicting the least recently used; 0 disables the
+                cache (default: 0).
+            eval_cache_ttl (float, optional): Seconds a memoised result stays valid
+                (default: no expiry).
+            retry (RetryPolicy, optional): After failed fetches, poll again after a
+                randomised, exponentially growing delay, stop calling out after
+                ``failure_threshold`` consecutive failures for ``reset_timeout``
+                seconds, and jitter the first poll. None polls every ``interval``
+                seconds regardless of failures (default: RetryPolicy()).
+            push_url (str, optional): Server-Sent Events endpoint whose events carry
+                full flags documents. While connected, pushed documents are applied
+                immediately and polling pauses; on disconnect, polling resumes and
+                the stream is reconnected with backoff.
+            cache_path (str, optional): File to persist every changed flag set to. When
+                it holds flags at startup, they are loaded instead of fetching before
+                returning, and the first fetch runs in the background.
+            blocking (bool): Fetch the first flags before returning. When False, the
+                first fetch runs immediately on the poller thread and reads see
+                ``default_flags`` until it lands; use ``wait_ready()`` to wait for it
+                (default: True).
+            scheduler (RefreshScheduler, optional): Shared scheduler to poll from, e.g.
+                ``shared_scheduler()``, instead of a dedicated thread per instance.
+                Call ``close()`` to unregister.
+            metrics (FlaggleMetrics, optional): Record per-flag evaluation counts of
+                ``is_enabled`` and ``evaluate_batch``, fetch and parse durations,
+                payload sizes, staleness, and failures. Disabled by default.
+            source (FlagSource, optional): Source to poll for flags instead of ``url``
+                or ``shared_image``, e.g. a ``FileSource`` or ``MemorySource``. It is
+                not closed with the instance.
+            subscriber_workers (int): Worker threads running ``subscribe`` callbacks,
+                started on the first change delivered (default: 1).
+        Raises:
+            ValueError: If none of ``url``, ``shared_image``, and ``source`` is given,
+                or the cache settings are invalid.
         """
-        self._url: str = url
+        if url is None and shared_image is None and source is None:
+            raise ValueError("Flaggle needs a url, a shared_image, or a source to load flags from")
+
+        self._url: Optional[str] = url
         self._interval: int = interval
         self._timeout: int = timeout
         self._verify_ssl: bool = verify_ssl
+        self._streaming: bool = streaming
+        self._http: Optional[HttpSource] = (
+            HttpSource(url, session, timeout, verify_ssl, streaming, pool_size) if url is not None else None
+        )
+        self._session: Optional["Session"] = self._http.session if self._http is not None else None
+        self._owns_push_session: bool = False
+        if self._session is None and push_url is not None:
+            # Flags come from an image or another source, but the push stream still needs HTTP.
+            self._session = session if session is not None else create_session(pool_size)
+            self._owns_push_session = session is None
+        if source is None:
+            source = ImageSource(shared_image) if shared_image else self._http
+        self._source: FlagSource = source
+        self._image_writer: Optional[FlagImageWriter] = FlagImageWriter(publish_image) if publish_image else None
+        self._cache_writer: Optional[FlagImageWriter] = FlagImageWriter(cache_path) if cache_path else None
+        self._eval_cache: Optional[EvaluationCache] = (
+            EvaluationCache(eval_cache_size, eval_cache_ttl) if eval_cache_size else None
+        )
 
         self._flags = default_flags or {}
+        self._snapshot: FlagSnapshot = FlagSnapshot.of(dict(self._flags))
         self._last_update = datetime.now(timezone.utc) - timedelta(seconds=interval)
-        self._scheduler = scheduler(time, sleep)
+        self._last_changes: FlagChanges = FlagChanges()
+        self._full_fetch_count: int = 0
+        self._not_modified_count: int = 0
+        self._retry: Optional[RetryPolicy] = retry
+        self._breaker: CircuitBreaker = (
+            CircuitBreaker(retry.failure_threshold, retry.reset_timeout) if retry is not None else CircuitBreaker(0, 0)
+        )
+        self._random = Random()
+        self._push_url: Optional[str] = push_url
+        self._push_connected = Event()
+        self._update_lock = Lock()
+        self._ready = Event()
+        self._refresh_scheduler: Optional[RefreshScheduler] = scheduler
+        self._refresh_job: Optional[RefreshJob] = None
+        self._closed: bool = False
+        self._stopped = Event()
+        self._push_response: Optional["Response"] = None
+        self._metrics: Optional[FlaggleMetrics] = metrics
+        self._subscribers: Optional[Subscribers] = None
+        self._subscriber_workers: int = subscriber_workers
+        self._scheduler = EventScheduler(time, self._stopped.wait)
         self._scheduler.thread = None  # type: ignore
 
-        self._update()
-        self._schedule_update()
+        if self._load_cache() or not blocking:
+            self._schedule_update(first_delay=0)
+        else:
+            self._update()
+            self._schedule_update()
+        if push_url is not None:
+            self._start_push()
 
     @property
     def flags(self) -> dict[str, list[dict[str, str]]]:
@@ -86,6 +263,127 @@ class Flaggle:
         """
         return self._flags
 
+    def snapshot(self) -> FlagSnapshot:
+        """
+        Returns an immutable, versioned view of the current flags.
+
+        Take one snapshot per request and read every flag from it: all reads see
+        the same generation, with no locking, even while the poller updates.
+
+        Returns:
+            FlagSnapshot: The latest published snapshot.
+        Example:
+            ```python
+            snapshot = flaggle.snapshot()
+            if snapshot.is_enabled("feature_a"):
+                ...
+            ```
+        """
+        return self._snapshot
+
+    def is_enabled(self, name: str, other_value: Optional[Any] = None) -> bool:
+        """
+        Evaluate the named flag, through the evaluation cache when it is enabled.
+
+        Args:
+            name (str): The flag name.
+            other_value (Optional[Any]): Value or context mapping to evaluate the flag against.
+        Returns:
+            bool: The flag's result, or False if the flag does not exist.
+        Example:
+            ```python
+            if flaggle.is_enabled("environment", "production"):
+                ...
+            ```
+        """
+        if self._metrics is not None:
+            self._metrics.count(name)
+        if self._eval_cache is None:
+            return self._snapshot.is_enabled(name, other_value)
+        flag = self._snapshot.flags.get(name)
+        if flag is None:
+            return False
+        return self._eval_cache.evaluate(flag, other_value)
+
+    def subscribe(self, pattern: str, callback: Callable[[FlagChanges, FlagSnapshot], None]) -> Subscription:
+        """
+        Call ``callback`` whenever a refresh adds, changes, or removes a matching flag.
+
+        The refresh only queues the notification; callbacks run on a small pool
+        of worker threads (``subscriber_workers``), so slow callbacks never delay
+        polling. A subscription's callbacks run one at a time, in order; changes
+        that arrive while one is queued or running are merged into its next call.
+
+        Args:
+            pattern (str): A flag name, or a shell-style pattern such as ``"routing.*"``.
+            callback (Callable[[FlagChanges, FlagSnapshot], None]): Called with the
+                matching flags' changes and the snapshot holding their new values.
+        Returns:
+            Subscription: Handle to pass to ``unsubscribe``.
+        Raises:
+            RuntimeError: If the instance is closed.
+        Example:
+            ```python
+            def rebuild_routes(changes, snapshot):
+                router.rebuild({name: snapshot.flags[name] for name in changes.added | changes.changed})
+
+            flaggle.subscribe("routing.*", rebuild_routes)
+            ```
+        """
+        with self._update_lock:
+            if self._closed:
+                raise RuntimeError("Flaggle is closed")
+            if self._subscribers is None:
+                self._subscribers = Subscribers(self._subscriber_workers)
+            return self._subscribers.add(pattern, callback)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Stop calling a subscription's callback. A call already running completes.
+
+        Args:
+            subscription (Subscription): The handle returned by ``subscribe``.
+        """
+        if self._subscribers is not None:
+            self._subscribers.remove(subscription)
+
+    @property
+    def eval_cache_stats(self) -> Optional[CacheStats]:
+        """
+        Returns the evaluation cache counters.
+
+        Returns:
+            Optional[CacheStats]: Hits, misses, evictions, invalidations, and size;
+            None when the cache is disabled.
+        """
+        return self._eval_cache.stats if self._eval_cache is not None else None
+
+    def evaluate_batch(self, names: Iterable[str], values: Sequence[Any]) -> Any:
+        """
+        Evaluate several flags against a column of context values in one call.
+
+        All rows come from the same snapshot. Homogeneous numeric numpy columns
+        are evaluated with array comparisons; other columns run one C-level
+        pass per flag instead of a Python call per value.
+
+        Args:
+            names (Iterable[str]): The flag names, one result row each.
+            values (Sequence[Any]): Context values, e.g. a list or a 1-D numpy array.
+        Returns:
+            list[list[bool]] | numpy.ndarray: A ``len(names) x len(values)`` matrix,
+            as a boolean numpy array when ``values`` is one. Rows of unknown flags
+            are all False.
+        Example:
+            ```python
+            matrix = flaggle.evaluate_batch(["min_score", "allowed_ids"], candidate_scores)
+            ```
+        """
+        if self._metrics is not None:
+            names = list(names)
+            for name in names:
+                self._metrics.count(name, len(values))
+        return self._snapshot.evaluate_batch(names, values)
+
     @property
     def last_update(self) -> datetime:
         """
@@ -97,15 +395,36 @@ class Flaggle:
         return self._last_update
 
     @property
-    def url(self) -> str:
+    def last_changes(self) -> FlagChanges:
+        """
+        Returns the flags added, changed, and removed by the last update.
+
+        Returns:
+            FlagChanges: Names of the affected flags; empty when nothing changed.
+        """
+        return self._last_changes
+
+    @property
+    def url(self) -> Optional[str]:
         """
         Returns the URL from which flags are fetched.
 
         Returns:
-            str: The endpoint URL.
+            Optional[str]: The endpoint URL, or None without one.
         """
         return self._url
 
+    @property
+    def source(self) -> FlagSource:
+        """
+        Returns the source flags are loaded from.
+
+        Returns:
+            FlagSource: The ``source`` passed in, or the HttpSource or ImageSource
+            built for ``url`` or ``shared_image``.
+        """
+        return self._source
+
     @property
     def interval(self) -> int:
         """
@@ -136,57 +455,393 @@ class Flaggle:
         """
         return self._verify_ssl
 
+    @property
+    def streaming(self) -> bool:
+        """
+        Returns whether flag documents are parsed incrementally.
+
+        Returns:
+            bool: True if streaming ingestion is enabled.
+        """
+        return self._streaming
+
+    @property
+    def session(self) -> Optional["Session"]:
+        """
+        Returns the HTTP session used to fetch flags.
+
+        Returns:
+            Optional[Session]: The session whose connection pool is reused across
+            polls and by the push stream, or None without a ``url`` or ``push_url``.
+        """
+        return self._session
+
+    @property
+    def retry(self) -> Optional[RetryPolicy]:
+        """
+        Returns the backoff and circuit breaker settings.
+
+        Returns:
+            Optional[RetryPolicy]: The policy, or None when polling at a fixed interval.
+        """
+        return self._retry
+
+    @property
+    def consecutive_failures(self) -> int:
+        """
+        Returns how many fetches in a row have failed.
+
+        Returns:
+            int: Consecutive failed fetches; 0 after a success.
+        """
+        return self._breaker.failures
+
+    @property
+    def circuit_state(self) -> str:
+        """
+        Returns the state of the fetch circuit breaker.
+
+        Returns:
+            str: ``"closed"`` while fetching normally, ``"open"`` while fetches are
+            suspended, or ``"half-open"`` when the next poll is a trial fetch.
+        """
+        return self._breaker.state
+
+    @property
+    def push_url(self) -> Optional[str]:
+        """
+        Returns the Server-Sent Events endpoint flags are pushed from.
+
+        Returns:
+            Optional[str]: The push endpoint, or None when only polling.
+        """
+        return self._push_url
+
+    @property
+    def push_connected(self) -> bool:
+        """
+        Returns whether the push stream is connected.
+
+        Returns:
+            bool: True while updates arrive by push and polling is paused.
+        """
+        return self._push_connected.is_set()
+
+    @property
+    def ready(self) -> bool:
+        """
+        Returns whether flags have been loaded yet.
+
+        Returns:
+            bool: True once a fetch succeeded or flags were loaded from the cache;
+            until then reads see ``default_flags``.
+        """
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until flags have been loaded, e.g. after ``Flaggle(..., blocking=False)``.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most; None waits indefinitely.
+        Returns:
+            bool: True if flags are loaded, False if the timeout expired first.
+        Example:
+            ```python
+            flaggle = Flaggle(url, blocking=False)
+            ...  # Other startup work runs while the first fetch is in flight.
+            if not flaggle.wait_ready(timeout=5):
+                logger.warning("Serving default flags")
+            ```
+        """
+        return self._ready.wait(timeout)
+
+    @property
+    def metrics(self) -> Optional[FlaggleMetrics]:
+        """
+        Returns the metrics collected by this instance.
+
+        Returns:
+            Optional[FlaggleMetrics]: The metrics, or None when disabled.
+        """
+        return self._metrics
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """
+        Returns the on-disk flag cache file.
+
+        Returns:
+            Optional[str]: The cache file, or None without a cache.
+        """
+        return self._cache_writer.path if self._cache_writer is not None else None
+
+    @property
+    def full_fetch_count(self) -> int:
+        """
+        Returns how many fetches received a full (200) flags document.
+
+        Returns:
+            int: Number of 200 responses (or changed documents of other sources)
+            parsed into flags.
+        """
+        return self._full_fetch_count
+
+    @property
+    def not_modified_count(self) -> int:
+        """
+        Returns how many fetches were answered with 304 Not Modified.
+
+        Returns:
+            int: Number of 304 responses (or unchanged documents of other sources)
+            that kept the current flags.
+        """
+        return self._not_modified_count
+
     def _fetch_flags(self) -> dict[str, list[dict[str, str]]]:
         """
-        Fetch flags from the configured remote endpoint.
+        Fetch flags from the source.
+
+        Sources skip parsing when nothing changed since the last fetch (a 304
+        answer, an unchanged file or image), in which case the current flags
+        are returned.
 
         Returns:
-            dict[str, list[dict[str, str]]]: Dictionary of flag name to Flag object.
-        Raises:
-            RequestException: If the HTTP request fails.
-            ValueError: If the response format is invalid.
+            dict[str, list[dict[str, str]]]: Dictionary of flag name to Flag object,
+            or an empty dict on failure.
         """
+        source = self._source
         try:
-            logger.info("Fetching flags from %s", self._url)
-            response = get(self._url, timeout=self._timeout, verify=self._verify_ssl)
-            response.raise_for_status()
-            logger.info("Flags fetched successfully from %s", self._url)
-            logger.debug("Response content: %s", response.text)
-            logger.debug("Response[%i]: %r", response.status_code, response.json())
-            return Flag.from_json(response.json())
-        except RequestException as e:
-            logger.error("Error fetching flags from %s: %s", self._url, e, exc_info=True)
+            flags = source.fetch(self._flags, self._metrics)
+            if flags is None:
+                self._not_modified_count += 1
+                logger.info("Flags not modified at %s", source.name)
+                return self._flags
+            self._full_fetch_count += 1
+            return flags
+        except OSError as e:
+            logger.error("Error fetching flags from %s: %s", source.name, e, exc_info=True)
             return {}
         except ValueError as e:
-            logger.error("Invalid response format from %s: %s", self._url, e, exc_info=True)
+            logger.error("Invalid response format from %s: %s", source.name, e, exc_info=True)
             return {}
         except Exception as e:
             logger.critical("Unexpected error during flag fetch: %s", e, exc_info=True)
             return {}
 
-    def _update(self) -> None:
+    def _publish_image(self) -> None:
+        """
+        Write the current flags to the shared image for reader processes.
+        """
+        try:
+            self._image_writer.write(self._flags)
+        except Exception as e:
+            logger.error("Error publishing flag image %s: %s", self._image_writer.path, e, exc_info=True)
+
+    def _load_cache(self) -> bool:
+        """
+        Load the flags persisted in the on-disk cache, if any.
+
+        ``last_update`` is set to the time the cache was written.
+
+        Returns:
+            bool: True if flags were loaded from the cache.
+        """
+        if self._cache_writer is None:
+            return False
+        path = self._cache_writer.path
+        try:
+            flags = FlagImageReader(path).read()
+            written = stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable flag cache %s: %s", path, e)
+            return False
+        if not flags:
+            return False
+        self._flags = flags
+        self._snapshot = FlagSnapshot.of(dict(flags), self._snapshot.version + 1)
+        self._last_update = datetime.fromtimestamp(written, timezone.utc)
+        self._ready.set()
+        if self._metrics is not None:
+            self._metrics.record_update(written)
+        logger.info("Flags loaded from cache %s (written %s)", path, self._last_update)
+        return True
+
+    def _save_cache(self) -> None:
+        """
+        Persist the current flags to the on-disk cache.
+        """
+        try:
+            self._cache_writer.write(self._flags)
+        except Exception as e:
+            logger.error("Error writing flag cache %s: %s", self._cache_writer.path, e, exc_info=True)
+
+    def _update(self) -> FlagChanges:
         """
         Update the internal flag dictionary by fetching the latest flags.
+
+        Unchanged flags are carried over from the current dictionary, so only
+        added or modified definitions are rebuilt.
+
+        Returns:
+            FlagChanges: Flags added, changed, and removed by this update.
         """
+        changes = FlagChanges()
         try:
+            if not self._breaker.allow():
+                logger.warning(
+                    "Skipping flag fetch: circuit open after %s consecutive failures", self._breaker.failures
+                )
+                return changes
             flags_data = self._fetch_flags()
+            if self._closed:
+                return changes
             if flags_data:
-                self._flags = flags_data
-                self._last_update = datetime.now(timezone.utc)
-                logger.info("Flags updated successfully at %s", self._last_update)
-                logger.debug("Current flags: %s", self._flags)
+                self._breaker.record_success()
+                changes = self._apply(flags_data)
             else:
+                self._breaker.record_failure()
+                if self._metrics is not None:
+                    self._metrics.record_failure()
                 logger.warning("No flags data received; keeping previous flags.")
         except Exception as e:
             logger.critical("Unexpected error during flag update: %s", e, exc_info=True)
+        return changes
+
+    def _apply(self, flags_data: dict[str, Flag]) -> FlagChanges:
+        """
+        Replace the current flags with ``flags_data`` and publish the changes.
 
-    def _schedule_update(self) -> None:
+        Args:
+            flags_data (dict[str, Flag]): The new flags, reusing unchanged Flag objects.
+        Returns:
+            FlagChanges: Flags added, changed, and removed.
+        """
+        with self._update_lock:
+            changes = FlagChanges.between(self._flags, flags_data)
+            if any(changes):
+                self._snapshot = FlagSnapshot.of(dict(flags_data), self._snapshot.version + 1)
+                if self._eval_cache is not None:
+                    self._eval_cache.invalidate(changes.changed | changes.removed)
+                if self._subscribers is not None:
+                    self._subscribers.dispatch(changes, self._snapshot)
+            self._flags = flags_data
+            self._last_changes = changes
+            self._last_update = datetime.now(timezone.utc)
+            self._ready.set()
+            if self._metrics is not None:
+                self._metrics.record_update(self._last_update.timestamp())
+            logger.info("Flags updated successfully at %s", self._last_update)
+            logger.debug("Current flags: %s", self._flags)
+            if self._image_writer is not None and any(changes):
+                self._publish_image()
+            if self._cache_writer is not None and any(changes):
+                self._save_cache()
+        return changes
+
+    def _start_push(self) -> None:
+        """
+        Start the background thread holding the push stream open.
+        """
+        self._push_thread = Thread(target=self._listen, daemon=True)
+        self._push_thread.start()
+        logger.info("Flag push stream started from %s", self._push_url)
+
+    def _listen(self) -> None:
+        """
+        Keep the push stream connected, reconnecting with backoff when it drops.
+        """
+        failures = 0
+        retry_ms: Optional[int] = None
+        last_event_id: Optional[str] = None
+        while not self._closed:
+            try:
+                for event in self._stream_events(last_event_id):
+                    failures = 0
+                    retry_ms = event.retry if event.retry is not None else retry_ms
+                    last_event_id = event.id
+                    if event.event in ("message", "flags"):
+                        self._apply_pushed(event.data)
+                if not self._closed:
+                    logger.warning("Flag push stream from %s ended; polling until reconnected", self._push_url)
+            except Exception as e:
+                if not self._closed:
+                    logger.error("Flag push stream from %s failed: %s", self._push_url, e)
+            finally:
+                self._push_connected.clear()
+                self._push_response = None
+            failures += 1
+            base = retry_ms / 1000 if retry_ms is not None else 1.0
+            cap = self._retry.max_delay if self._retry is not None else self._interval
+            self._stopped.wait(full_jitter(failures, base, max(cap, base), self._random.random))
+
+    def _stream_events(self, last_event_id: Optional[str]):
+        """
+        Open the push stream and yield its events; polling pauses while it is open.
+
+        Args:
+            last_event_id (Optional[str]): ID of the last event received, sent as Last-Event-ID.
+        Yields:
+            ServerSentEvent: Each event pushed by the server.
+        Raises:
+            RequestException: If the stream cannot be opened or breaks.
+        """
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        if last_event_id:
+            headers["Last-Event-ID"] = last_event_id
+        response = self._session.get(
+            self._push_url,
+            timeout=(self._timeout, max(self._interval, self._timeout)),
+            verify=self._verify_ssl,
+            headers=headers,
+            stream=True,
+        )
+        with response:
+            self._push_response = response
+            if self._closed:
+                return
+            response.raise_for_status()
+            self._push_connected.set()
+            logger.info("Connected to flag push stream at %s", self._push_url)
+            yield from iter_events(response.iter_content(chunk_size=None))
+
+    def _apply_pushed(self, data: str) -> None:
+        """
+        Apply a flags document pushed by the server.
+
+        Args:
+            data (str): The event data, a JSON flags document.
+        """
+        try:
+            flags = Flag.from_json(loads(data), previous=self._flags)
+        except ValueError as e:
+            logger.error("Invalid flags pushed from %s: %s", self._push_url, e)
+            return
+        if flags:
+            self._breaker.record_success()
+            self._apply(flags)
+        else:
+            logger.warning("Empty flags document pushed; keeping previous flags.")
+
+    def _schedule_update(self, first_delay: Optional[float] = None) -> None:
         """
         Start the background scheduler for periodic flag updates.
+
+        Args:
+            first_delay (Optional[float]): Seconds until the first poll; by default
+                the interval, brought forward by the start jitter.
         """
+        delay = self._first_delay() if first_delay is None else first_delay
+        if self._refresh_scheduler is not None:
+            self._refresh_job = self._refresh_scheduler.register(self._refresh, delay)
+            logger.info("Flag updates registered with shared scheduler (interval=%s seconds)", self._interval)
+            return
+
         def run_scheduler():
             try:
-                self._scheduler.enter(self._interval, 1, self.recurring_update)
+                self._scheduler.enter(delay, 1, self.recurring_update)
                 self._scheduler.run()
             except Exception as e:
                 logger.critical("Scheduler thread encountered an error: %s", e, exc_info=True)
@@ -195,16 +850,106 @@ class Flaggle:
         self._scheduler_thread.start()
         logger.info("Flag update scheduler started (interval=%s seconds)", self._interval)
 
+    def close(self) -> None:
+        """
+        Stop polling and release the instance's thread and connections.
+
+        Cancels the pending poll and wakes the scheduler thread so it exits (or
+        unregisters from the shared scheduler), closes the push stream, and
+        closes the HTTP session unless it was passed in. A ``source`` passed in
+        is left open. Subscriptions are dropped; callbacks already running complete. A fetch already in
+        flight is abandoned: its result is discarded. Flags stay readable.
+        Calling ``close()`` again has no effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stopped.set()
+        if self._refresh_job is not None:
+            self._refresh_scheduler.unregister(self._refresh_job)
+        for event in self._scheduler.queue:
+            try:
+                self._scheduler.cancel(event)
+            except ValueError:
+                pass
+        response = self._push_response
+        if response is not None:
+            _interrupt(response)
+        if self._http is not None:
+            self._http.close()
+        if self._owns_push_session:
+            self._session.close()
+        if self._subscribers is not None:
+            self._subscribers.close(timeout=0)
+        logger.info("Flaggle for %s closed", self._source.name)
+
+    def __enter__(self) -> "Flaggle":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _first_delay(self) -> float:
+        """
+        Return the delay before the first poll, brought forward by the start jitter.
+
+        Returns:
+            float: Seconds until the first poll.
+        """
+        if self._retry is None:
+            return self._interval
+        return self._interval * (1 - self._retry.start_jitter * self._random.random())
+
+    def _next_delay(self) -> float:
+        """
+        Return the delay before the next poll.
+
+        Returns:
+            float: ``interval`` after a success; after failures, ``interval`` plus a
+            full-jitter exponential backoff, capped at the policy's ``max_delay``
+            unless the interval is longer, so failures never make polling more frequent.
+        """
+        failures = self._breaker.failures
+        if self._retry is None or not failures:
+            return self._interval
+        spare = max(self._retry.max_delay - self._interval, 0)
+        return self._interval + full_jitter(failures - 1, self._interval, spare, self._random.random)
+
     def recurring_update(self) -> None:
         """
         Periodically update flags at the configured interval.
         """
         try:
-            self._update()
+            self._poll()
+        finally:
+            if not self._closed:
+                try:
+                    self._scheduler.enter(self._next_delay(), 1, self.recurring_update)
+                except Exception as e:
+                    logger.critical("Failed to reschedule recurring update: %s", e, exc_info=True)
+
+    def _refresh(self) -> Optional[float]:
+        """
+        Poll once from the shared scheduler.
+
+        Returns:
+            Optional[float]: Seconds until the next poll, or None once closed.
+        """
+        self._poll()
+        return None if self._closed else self._next_delay()
+
+    def _poll(self) -> None:
+        """
+        Update the flags unless closed or the push stream is delivering them.
+        """
+        try:
+            if self._closed:
+                return
+            if self._push_connected.is_set():
+                logger.debug("Push stream connected; skipping poll")
+            else:
+                self._update()
+            if self._metrics is not None:
+                self._metrics.flush()
         except Exception as e:
             logger.error("Error during recurring flag update: %s", e, exc_info=True)
-        finally:
-            try:
-                self._scheduler.enter(self._interval, 1, self.recurring_update)
-            except Exception as e:
-                logger.critical("Failed to reschedule recurring update: %s", e, exc_info=True)
@@ -0,0 +1,341 @@
+"""Opt-in metrics for Flaggle.
+
+This module collects which flags are evaluated and how often, how long fetches
+and parsing take, how large flag documents are, how stale the loaded flags
+are, and how many fetches failed. Nothing is recorded unless a FlaggleMetrics
+is passed to ``Flaggle(metrics=...)``.
+
+Evaluation counts are kept in one plain dict per thread, so counting an
+evaluation takes no lock; the per-thread shards are only summed when a
+snapshot is taken, and a thread's shard is folded into a shared total when the
+thread exits. Fetch-side metrics are recorded once per poll and use a lock.
+
+Classes:
+    Histogram: Bucketed distribution of observed values.
+    HistogramSnapshot: Point-in-time copy of a Histogram.
+    MetricsSnapshot: Point-in-time copy of all metrics of a FlaggleMetrics.
+    FlaggleMetrics: Collects evaluation counts, fetch timings, payload sizes, staleness, and failures.
+
+Functions:
+    render_prometheus: Render a MetricsSnapshot in the Prometheus text format.
+"""
+
+from bisect import bisect_left
+from logging import getLogger
+from threading import Lock, local
+from time import time
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+from weakref import finalize
+
+logger = getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+
+
+class _ThreadToken:
+    """Lives in a thread's local storage; its finalizer runs when the thread exits."""
+    __slots__ = ("__weakref__",)
+
+
+class HistogramSnapshot(NamedTuple):
+    """Point-in-time copy of a Histogram.
+
+    Attributes:
+        bounds (tuple[float, ...]): Upper bounds of the buckets, ascending.
+        counts (tuple[int, ...]): Observations per bucket; the last one counts
+            values above every bound.
+        sum (float): Sum of all observed values.
+        count (int): Number of observations.
+    """
+    bounds: tuple[float, ...]
+    counts: tuple[int, ...]
+    sum: float
+    count: int
+
+
+class Histogram:
+    """Bucketed distribution of observed values, such as durations in seconds.
+
+    Attributes:
+        bounds (tuple[float, ...]): Upper bounds of the buckets, ascending; a value
+            falls in the first bucket whose bound is not below it.
+    """
+    __slots__ = ("bounds", "_counts", "_sum", "_count", "_lock")
+
+    def __init__(self, bounds: Iterable[float]) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bounds (Iterable[float]): Bucket upper bounds.
+        Raises:
+            ValueError: If ``bounds`` is empty.
+        """
+        self.bounds: tuple[float, ...] = tuple(sorted(bounds))
+        if not self.bounds:
+            raise ValueError("Histogram needs at least one bucket")
+        self._counts: list[int] = [0] * (len(self.bounds) + 1)
+        self._sum: float = 0.0
+        self._count: int = 0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record one value.
+
+        Args:
+            value (float): The observed value.
+        """
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        """
+        Returns a consistent copy of the histogram.
+
+        Returns:
+            HistogramSnapshot: Bounds, per-bucket counts, sum, and count.
+        """
+        with self._lock:
+            return HistogramSnapshot(self.bounds, tuple(self._counts), self._sum, self._count)
+
+
+class MetricsSnapshot(NamedTuple):
+    """Point-in-time copy of all metrics of a FlaggleMetrics.
+
+    Attributes:
+        evaluations (dict[str, int]): Evaluations per flag name.
+        fetch_seconds (HistogramSnapshot): Duration of flag requests, including 304 answers.
+        parse_seconds (HistogramSnapshot): Duration of decoding and building flags;
+            with streaming, this includes the download.
+        payload_bytes (HistogramSnapshot): Size of full flag documents received.
+        failures (int): Fetches that produced no flags.
+        staleness_seconds (Optional[float]): Seconds since flags were last updated,
+            or None before the first update.
+    """
+    evaluations: dict[str, int]
+    fetch_seconds: HistogramSnapshot
+    parse_seconds: HistogramSnapshot
+    payload_bytes: HistogramSnapshot
+    failures: int
+    staleness_seconds: Optional[float]
+
+
+class FlaggleMetrics:
+    """Collects evaluation counts, fetch timings, payload sizes, staleness, and failures.
+
+    Pass an instance to ``Flaggle(metrics=...)``. Read it at any time with
+    ``snapshot()``, or give it a ``sink`` that receives a snapshot after every
+    poll, for example to push it to a metrics backend.
+
+    Attributes:
+        sink (Optional[Callable[[MetricsSnapshot], None]]): Called with a snapshot after each poll.
+        fetch_seconds (Histogram): Duration of flag requests.
+        parse_seconds (Histogram): Duration of decoding and building flags.
+        payload_bytes (Histogram): Size of full flag documents received.
+
+    Example:
+        ```python
+        metrics = FlaggleMetrics()
+        flaggle = Flaggle(url, metrics=metrics)
+        ...
+        body = render_prometheus(metrics.snapshot())  # Serve from /metrics
+        ```
+    """
+    def __init__(
+        self,
+        sink: Optional[Callable[[MetricsSnapshot], None]] = None,
+        latency_buckets: Iterable[float] = LATENCY_BUCKETS,
+        size_buckets: Iterable[float] = SIZE_BUCKETS,
+    ) -> None:
+        """
+        Initialize empty metrics.
+
+        Args:
+            sink (Optional[Callable[[MetricsSnapshot], None]]): Called with a
+                snapshot after each poll; exceptions it raises are logged.
+            latency_buckets (Iterable[float]): Bucket bounds of the fetch and parse
+                histograms, in seconds.
+            size_buckets (Iterable[float]): Bucket bounds of the payload histogram, in bytes.
+        """
+        self.sink: Optional[Callable[[MetricsSnapshot], None]] = sink
+        self.fetch_seconds = Histogram(latency_buckets)
+        self.parse_seconds = Histogram(latency_buckets)
+        self.payload_bytes = Histogram(size_buckets)
+        self._local = local()
+        self._shards: dict[int, dict[str, int]] = {}
+        self._retired: dict[str, int] = {}
+        self._lock = Lock()
+        self._failures: int = 0
+        self._updated_at: Optional[float] = None
+
+    def count(self, name: str, evaluations: int = 1) -> None:
+        """
+        Count evaluations of a flag in the calling thread's shard, without locking.
+
+        Args:
+            name (str): The flag name.
+            evaluations (int): Number of evaluations (default: 1).
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._add_shard()
+        shard[name] = shard.get(name, 0) + evaluations
+
+    def _add_shard(self) -> dict[str, int]:
+        """Create the calling thread's shard, folded into the retired total when the thread exits."""
+        shard: dict[str, int] = {}
+        token = _ThreadToken()
+        with self._lock:
+            self._shards[id(shard)] = shard
+        finalize(token, self._retire, shard)
+        self._local.token = token
+        self._local.shard = shard
+        return shard
+
+    def _retire(self, shard: dict[str, int]) -> None:
+        """Fold the shard of an exited thread into the retired total."""
+        with self._lock:
+            del self._shards[id(shard)]
+            retired = self._retired
+            for name, evaluations in shard.items():
+                retired[name] = retired.get(name, 0) + evaluations
+
+    def record_failure(self) -> None:
+        """
+        Count a fetch that produced no flags.
+        """
+        with self._lock:
+            self._failures += 1
+
+    def record_update(self, timestamp: float) -> None:
+        """
+        Record when the flags were last updated, for staleness.
+
+        Args:
+            timestamp (float): POSIX time of the update.
+        """
+        self._updated_at = timestamp
+
+    def measure_size(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass ``chunks`` through, recording the size of the chunks read once
+        exhausted or closed, as parsers stop reading at the end of the document.
+
+        Args:
+            chunks (Iterable[bytes]): A streamed document.
+        Yields:
+            bytes: The chunks, unchanged.
+        """
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.payload_bytes.observe(size)
+
+    def evaluations(self) -> dict[str, int]:
+        """
+        Returns the evaluations per flag, summed over all threads.
+
+        Returns:
+            dict[str, int]: Flag name to number of evaluations.
+        """
+        with self._lock:
+            shards = list(self._shards.values())
+            totals = dict(self._retired)
+        for shard in shards:
+            for name, evaluations in shard.copy().items():
+                totals[name] = totals.get(name, 0) + evaluations
+        return totals
+
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        Returns a copy of all metrics.
+
+        Returns:
+            MetricsSnapshot: Evaluation counts, histograms, failures, and staleness.
+        """
+        updated_at = self._updated_at
+        return MetricsSnapshot(
+            self.evaluations(),
+            self.fetch_seconds.snapshot(),
+            self.parse_seconds.snapshot(),
+            self.payload_bytes.snapshot(),
+            self._failures,
+            max(time() - updated_at, 0.0) if updated_at is not None else None,
+        )
+
+    def flush(self) -> None:
+        """
+        Send a snapshot to the sink, if one is set.
+        """
+        if self.sink is None:
+            return
+        try:
+            self.sink(self.snapshot())
+        except Exception as e:
+            logger.error("Metrics sink failed: %s", e, exc_info=True)
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, help_text: str, histogram: HistogramSnapshot) -> list[str]:
+    """Render one histogram with cumulative ``le`` buckets."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{le="{bound:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum {histogram.sum:g}")
+    lines.append(f"{name}_count {histogram.count}")
+    return lines
+
+
+def render_prometheus(snapshot: MetricsSnapshot, prefix: str = "flaggle") -> str:
+    """
+    Render a snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot (MetricsSnapshot): The metrics to render.
+        prefix (str): Prefix of every metric name (default: ``"flaggle"``).
+    Returns:
+        str: The exposition text, ending with a newline.
+    Example:
+        ```python
+        metrics = FlaggleMetrics(sink=lambda snapshot: print(render_prometheus(snapshot)))
+        ```
+    """
+    lines = [
+        f"# HELP {prefix}_evaluations_total Flag evaluations through Flaggle.",
+        f"# TYPE {prefix}_evaluations_total counter",
+    ]
+    for name, evaluations in sorted(snapshot.evaluations.items()):
+        lines.append(f'{prefix}_evaluations_total{{flag="{_label(name)}"}} {evaluations}')
+    lines += _histogram_lines(f"{prefix}_fetch_duration_seconds", "Duration of flag requests.", snapshot.fetch_seconds)
+    lines += _histogram_lines(
+        f"{prefix}_parse_duration_seconds", "Duration of decoding and building flags.", snapshot.parse_seconds
+    )
+    lines += _histogram_lines(f"{prefix}_payload_bytes", "Size of flag documents received.", snapshot.payload_bytes)
+    lines += [
+        f"# HELP {prefix}_fetch_failures_total Fetches that produced no flags.",
+        f"# TYPE {prefix}_fetch_failures_total counter",
+        f"{prefix}_fetch_failures_total {snapshot.failures}",
+    ]
+    if snapshot.staleness_seconds is not None:
+        lines += [
+            f"# HELP {prefix}_staleness_seconds Seconds since the flags were last updated.",
+            f"# TYPE {prefix}_staleness_seconds gauge",
+            f"{prefix}_staleness_seconds {snapshot.staleness_seconds:g}",
+        ]
+    return "\n".join(lines) + "\n"
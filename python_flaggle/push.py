@@ -0,0 +1,103 @@
+"""Server-Sent Events parsing for push updates.
+
+This module parses a ``text/event-stream`` body into events, so Flaggle can
+hold one streaming connection open and apply flag documents as the server
+pushes them, instead of waiting for the next poll.
+
+Classes:
+    ServerSentEvent: One dispatched event.
+
+Functions:
+    iter_events: Yield the events of an event stream read in chunks.
+"""
+
+from codecs import getincrementaldecoder
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+
+class ServerSentEvent(NamedTuple):
+    """One event of a ``text/event-stream``.
+
+    Attributes:
+        event (str): Event type; ``"message"`` when the server set none.
+        data (str): Event data, with multiple ``data:`` lines joined by newlines.
+        id (Optional[str]): Last event ID seen on the stream, if any.
+        retry (Optional[int]): Reconnection delay requested by the server, in milliseconds.
+    """
+    event: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+def _lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode chunks and yield lines ended by CRLF, LF, or CR, without the terminator."""
+    decoder = getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    scanned = 0
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        start = 0
+        position = scanned
+        while True:
+            cr = buffer.find("\r", position)
+            lf = buffer.find("\n", position)
+            if lf != -1 and (cr == -1 or lf < cr):
+                yield buffer[start:lf]
+                start = position = lf + 1
+            elif cr != -1 and cr + 1 < len(buffer):
+                yield buffer[start:cr]
+                start = position = cr + 2 if buffer[cr + 1] == "\n" else cr + 1
+            else:
+                # No terminator left, or a CR that may be the first half of a CRLF.
+                break
+        buffer = buffer[start:]
+        scanned = max(len(buffer) - 1, 0) if buffer.endswith("\r") else len(buffer)
+    if buffer.endswith("\r"):
+        yield buffer[:-1]
+
+
+def iter_events(chunks: Iterable[bytes]) -> Iterator[ServerSentEvent]:
+    """
+    Yield the events of a ``text/event-stream`` body as they complete.
+
+    Comment lines (keep-alives) and events without data are skipped, as the
+    Server-Sent Events specification requires.
+
+    Args:
+        chunks (Iterable[bytes]): The response body, in chunks of any size.
+    Yields:
+        ServerSentEvent: Each dispatched event.
+    Example:
+        ```python
+        response = session.get(url, stream=True, headers={"Accept": "text/event-stream"})
+        for event in iter_events(response.iter_content(chunk_size=None)):
+            print(event.event, event.data)
+        ```
+    """
+    event_type = ""
+    data: list[str] = []
+    last_id: Optional[str] = None
+    retry: Optional[int] = None
+    for line in _lines(chunks):
+        if not line:
+            if data:
+                yield ServerSentEvent(event_type or "message", "\n".join(data), last_id, retry)
+            event_type = ""
+            data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            data.append(value)
+        elif field == "event":
+            event_type = value
+        elif field == "id":
+            if "\0" not in value:
+                last_id = value
+        elif field == "retry":
+            if value.isdigit():
+                retry = int(value)
@@ -0,0 +1,158 @@
+"""Targeting rules for flags evaluated against a context.
+
+A flag may carry an ordered list of rules, each a condition over named context
+attributes and the result to return when it matches. Rules are compiled once,
+when the flag is built: every condition becomes a predicate bound to a Flag's
+shared evaluator, and AND/OR groups become short-circuiting loops over their
+compiled children, so evaluation does no parsing or walking of the definitions.
+
+Rule syntax (JSON):
+    - A condition: ``{"attribute": "country", "operation": "in", "value": ["BR"]}``.
+      ``operation`` defaults to ``eq``; a missing or null attribute never matches.
+      ``in`` and ``ni`` need a list or string ``value``.
+    - A group: ``{"all": [...]}`` (AND) or ``{"any": [...]}`` (OR) of conditions
+      and groups.
+    - A rule: a condition or group with an optional ``"enabled"`` result
+      (default: true). The first matching rule decides.
+
+Classes:
+    RuleSet: Compiled, ordered rules of one flag.
+"""
+
+from typing import Any, Callable, Mapping, Optional
+
+Predicate = Callable[[Mapping[str, Any]], bool]
+
+
+def _condition(attribute: str, flag: Any) -> Predicate:
+    """Compile a condition into a predicate reading one context attribute."""
+    evaluate = flag._evaluate
+
+    def matches(context: Mapping[str, Any]) -> bool:
+        value = context.get(attribute)
+        return value is not None and evaluate(flag, value)
+
+    return matches
+
+
+def _literal(attribute: str, operation: Callable[[Any, Any], bool], expected: Any) -> Predicate:
+    """Compile a condition on a boolean, null, or empty value, which a Flag would not compare."""
+    def matches(context: Mapping[str, Any]) -> bool:
+        value = context.get(attribute)
+        return value is not None and operation(value, expected)
+
+    return matches
+
+
+def _all(children: tuple[Predicate, ...]) -> Predicate:
+    """Compile an AND group."""
+    def matches(context: Mapping[str, Any]) -> bool:
+        for child in children:
+            if not child(context):
+                return False
+        return True
+
+    return matches
+
+
+def _any(children: tuple[Predicate, ...]) -> Predicate:
+    """Compile an OR group."""
+    def matches(context: Mapping[str, Any]) -> bool:
+        for child in children:
+            if child(context):
+                return True
+        return False
+
+    return matches
+
+
+class RuleSet:
+    """Compiled, ordered rules of one flag.
+
+    Attributes:
+        definitions (list[dict]): The rule definitions, as given.
+        salt (str): Bucketing salt of ``pct`` conditions without their own ``salt``.
+        default (bool): Result when no rule matches or no context is given.
+
+    Example:
+        ```python
+        rules = RuleSet(
+            [{"all": [{"attribute": "country", "operation": "in", "value": ["BR"]},
+                      {"attribute": "app_version", "operation": "ge", "value": 5}]}],
+            salt="new_checkout",
+            default=False,
+        )
+        rules.evaluate({"country": "BR", "app_version": 6})  # True
+        ```
+    """
+    __slots__ = ("definitions", "salt", "default", "_rules")
+
+    def __init__(self, definitions: list[dict], salt: str, default: bool) -> None:
+        """
+        Compile ``definitions``.
+
+        Args:
+            definitions (list[dict]): Ordered rule definitions.
+            salt (str): Bucketing salt of ``pct`` conditions, usually the flag name.
+            default (bool): Result when no rule matches.
+        Raises:
+            ValueError: If a rule or condition is malformed.
+        """
+        if not isinstance(definitions, list):
+            raise ValueError("Rules must be a list")
+        self.definitions: list[dict] = definitions
+        self.salt: str = salt
+        self.default: bool = default
+        self._rules: tuple[tuple[Predicate, bool], ...] = tuple(
+            (self._compile(rule), bool(rule.get("enabled", True)) if isinstance(rule, dict) else True)
+            for rule in definitions
+        )
+
+    def evaluate(self, context: Optional[Mapping[str, Any]]) -> bool:
+        """
+        Return the result of the first rule matching ``context``.
+
+        Args:
+            context (Optional[Mapping[str, Any]]): Attribute name to value.
+        Returns:
+            bool: The matching rule's result, or ``default``.
+        Raises:
+            TypeError: If ``context`` is not a mapping.
+        """
+        if context is None:
+            return self.default
+        if not isinstance(context, Mapping):
+            raise TypeError(f"Rules expect a mapping context, got {type(context).__name__}")
+        for matches, enabled in self._rules:
+            if matches(context):
+                return enabled
+        return self.default
+
+    def _compile(self, node: Any) -> Predicate:
+        """Compile a condition or group definition into a predicate."""
+        if not isinstance(node, dict):
+            raise ValueError(f"Invalid rule {node!r}: expected an object")
+        for key, combine in (("all", _all), ("any", _any)):
+            if key in node:
+                children = node[key]
+                if not isinstance(children, list) or not children:
+                    raise ValueError(f"Invalid rule {node!r}: '{key}' must be a non-empty list")
+                compiled = tuple(self._compile(child) for child in children)
+                return compiled[0] if len(compiled) == 1 else combine(compiled)
+
+        attribute = node.get("attribute")
+        if not attribute or not isinstance(attribute, str):
+            raise ValueError(f"Invalid rule {node!r}: missing attribute")
+        from python_flaggle.flag import Flag, FlagOperation
+
+        operation = FlagOperation.from_string(node.get("operation") or "eq")
+        value = node.get("value")
+        if (operation is FlagOperation.IN or operation is FlagOperation.NI) and not isinstance(value, (list, str)):
+            raise ValueError(f"Invalid rule {node!r}: '{node['operation']}' needs a list or string value")
+        if operation is not FlagOperation.PCT and (value is None or isinstance(value, bool) or value == ""):
+            return _literal(attribute, operation, value)
+        extra = {"salt": node.get("salt") or self.salt} if operation is FlagOperation.PCT else {}
+        try:
+            return _condition(attribute, Flag(attribute, value, operation=operation, **extra))
+        except TypeError as exc:
+            raise ValueError(f"Invalid rule {node!r}: {exc}") from exc
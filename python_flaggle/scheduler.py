@@ -0,0 +1,234 @@
+"""Shared refresh scheduling for many Flaggle instances.
+
+By default every Flaggle polls from its own ``sched`` thread. A service holding
+hundreds of instances (one per tenant endpoint, say) can instead register them
+all with one RefreshScheduler: a min-heap of next-due refreshes served by a
+small, fixed pool of worker threads, so the thread count no longer grows with
+the number of instances.
+
+Classes:
+    RefreshJob: Handle of a callback registered with a RefreshScheduler.
+    RefreshScheduler: Runs registered callbacks when due, on a small worker pool.
+
+Functions:
+    shared_scheduler: The process-wide RefreshScheduler.
+"""
+
+from heapq import heapify, heappop, heappush
+from itertools import count
+from logging import getLogger
+from threading import Condition, Lock, Thread, current_thread
+from time import monotonic
+from typing import Callable, Optional
+
+logger = getLogger(__name__)
+
+
+class RefreshJob:
+    """Handle of a callback registered with a RefreshScheduler.
+
+    Attributes:
+        callback (Callable[[], Optional[float]]): Runs the refresh and returns the
+            seconds until its next run, or None to stop.
+        cancelled (bool): Whether the job has been unregistered or has stopped.
+    """
+    __slots__ = ("callback", "cancelled", "_queued")
+
+    def __init__(self, callback: Callable[[], Optional[float]]) -> None:
+        self.callback: Callable[[], Optional[float]] = callback
+        self.cancelled: bool = False
+        self._queued: bool = False
+
+
+class RefreshScheduler:
+    """Runs registered refresh callbacks when due, on a small pool of worker threads.
+
+    Jobs wait in a min-heap ordered by due time. Each worker sleeps until the
+    earliest job is due, runs it, and pushes it back with the delay the
+    callback returned. A job never runs on two workers at once. Worker threads
+    start lazily, up to ``workers``, as jobs are registered.
+
+    Attributes:
+        workers (int): Maximum number of worker threads.
+
+    Example:
+        ```python
+        scheduler = RefreshScheduler(workers=4)
+        clients = [Flaggle(url, interval=30, scheduler=scheduler) for url in tenant_urls]
+        ...
+        for client in clients:
+            client.close()
+        scheduler.close()
+        ```
+    """
+    def __init__(self, workers: int = 4, name: str = "flaggle-refresh") -> None:
+        """
+        Initialize a scheduler without threads.
+
+        Args:
+            workers (int): Maximum number of worker threads (default: 4).
+            name (str): Name prefix of the worker threads.
+        Raises:
+            ValueError: If ``workers`` is not positive.
+        """
+        if workers < 1:
+            raise ValueError("RefreshScheduler needs at least one worker")
+        self.workers: int = workers
+        self._name: str = name
+        self._heap: list[tuple[float, int, RefreshJob]] = []
+        self._sequence = count()
+        self._condition = Condition(Lock())
+        self._threads: list[Thread] = []
+        self._active: int = 0
+        self._cancelled: int = 0
+        self._closed: bool = False
+
+    def __len__(self) -> int:
+        """Return the number of registered jobs."""
+        return self._active
+
+    @property
+    def threads(self) -> int:
+        """
+        Returns the number of worker threads started.
+
+        Returns:
+            int: Started worker threads, at most ``workers``.
+        """
+        return len(self._threads)
+
+    def register(self, callback: Callable[[], Optional[float]], delay: float) -> RefreshJob:
+        """
+        Run ``callback`` after ``delay`` seconds, then again after each delay it returns.
+
+        Args:
+            callback (Callable[[], Optional[float]]): The refresh; returns the
+                seconds until its next run, or None to stop.
+            delay (float): Seconds until the first run.
+        Returns:
+            RefreshJob: Handle to pass to ``unregister``.
+        Raises:
+            RuntimeError: If the scheduler is closed.
+        """
+        job = RefreshJob(callback)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("RefreshScheduler is closed")
+            self._active += 1
+            self._push(job, delay)
+            if len(self._threads) < min(self.workers, self._active):
+                thread = Thread(target=self._work, name=f"{self._name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return job
+
+    def unregister(self, job: RefreshJob) -> None:
+        """
+        Stop running ``job``. A run already in progress completes but is not rescheduled.
+
+        Args:
+            job (RefreshJob): The handle returned by ``register``.
+        """
+        with self._condition:
+            self._cancel(job)
+            if self._cancelled > len(self._heap) // 2:
+                # Drop cancelled entries eagerly so register/unregister churn cannot grow the heap.
+                # In place: workers waiting in _next_job hold a reference to this list.
+                self._heap[:] = [entry for entry in self._heap if not entry[2].cancelled]
+                heapify(self._heap)
+                self._cancelled = 0
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Unregister every job and stop the worker threads.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for each worker to finish
+                its current run; None waits indefinitely.
+        """
+        with self._condition:
+            self._closed = True
+            for _, _, job in self._heap:
+                self._cancel(job)
+            self._heap.clear()
+            self._cancelled = 0
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread is not current_thread():
+                thread.join(timeout)
+
+    def _push(self, job: RefreshJob, delay: float) -> None:
+        """Queue ``job`` to run in ``delay`` seconds; the condition must be held."""
+        job._queued = True
+        heappush(self._heap, (monotonic() + delay, next(self._sequence), job))
+        self._condition.notify()
+
+    def _cancel(self, job: RefreshJob) -> None:
+        """Mark ``job`` cancelled; the condition must be held."""
+        if job.cancelled:
+            return
+        job.cancelled = True
+        self._active -= 1
+        if job._queued:
+            self._cancelled += 1
+
+    def _next_job(self) -> Optional[RefreshJob]:
+        """Wait for the earliest job to fall due and pop it, or return None once closed."""
+        heap = self._heap
+        with self._condition:
+            while not self._closed:
+                if not heap:
+                    self._condition.wait()
+                    continue
+                due, _, job = heap[0]
+                if job.cancelled:
+                    heappop(heap)
+                    self._cancelled -= 1
+                    continue
+                wait = due - monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                heappop(heap)
+                job._queued = False
+                return job
+        return None
+
+    def _work(self) -> None:
+        """Worker loop: run due jobs and reschedule them until closed."""
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                delay = job.callback()
+            except Exception as e:
+                logger.critical("Refresh job %r failed and was unregistered: %s", job.callback, e, exc_info=True)
+                delay = None
+            with self._condition:
+                if delay is not None and not job.cancelled and not self._closed:
+                    self._push(job, delay)
+                else:
+                    self._cancel(job)
+
+
+_shared: Optional[RefreshScheduler] = None
+_shared_lock = Lock()
+
+
+def shared_scheduler() -> RefreshScheduler:
+    """
+    Return the process-wide RefreshScheduler, creating it on first use.
+
+    Returns:
+        RefreshScheduler: The shared scheduler, with the default number of workers.
+    Example:
+        ```python
+        flaggle = Flaggle(url, interval=30, scheduler=shared_scheduler())
+        ```
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None or _shared._closed:
+            _shared = RefreshScheduler()
+        return _shared
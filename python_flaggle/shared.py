@@ -0,0 +1,203 @@
+"""Shared flag images for multi-process servers.
+
+This module lets one process fetch flags and publish them as a compact,
+versioned image file (for example on a tmpfs such as ``/dev/shm``) that every
+worker process maps instead of polling the flag server itself. Workers check a
+cheap ``stat`` of the file and only decode the image when its version changes.
+
+Image layout: a 24-byte header (magic ``FLAGGLE1``, version and payload length
+as little-endian unsigned 64-bit integers) followed by the compact UTF-8 JSON
+flags document. Images are replaced atomically, so readers never see a partial
+write.
+
+Classes:
+    FlagImageWriter: Publishes flags as a versioned image file.
+    FlagImageReader: Maps an image file and decodes it when its version changes.
+"""
+
+import json
+import os
+from logging import getLogger
+from mmap import ACCESS_READ, mmap
+from struct import Struct
+from tempfile import NamedTemporaryFile
+from typing import Iterator, Optional
+
+from python_flaggle.flag import Flag
+
+logger = getLogger(__name__)
+
+MAGIC = b"FLAGGLE1"
+HEADER = Struct("<8sQQ")
+CHUNK_SIZE = 64 * 1024
+
+
+def read_version(path: str) -> int:
+    """
+    Read the version from the header of an image file.
+
+    Args:
+        path (str): The image file.
+    Returns:
+        int: The image version, or 0 if the file does not exist.
+    Raises:
+        ValueError: If the file is not a flag image.
+    """
+    try:
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+    except FileNotFoundError:
+        return 0
+    return _unpack_header(header, path)[0]
+
+
+def _unpack_header(header: bytes, path: str) -> tuple[int, int]:
+    """Validate an image header and return its (version, payload length)."""
+    if len(header) < HEADER.size:
+        raise ValueError(f"Flag image {path} is truncated")
+    magic, version, length = HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a flag image")
+    return version, length
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush a rename in ``directory`` to disk, where the platform can open directories."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class FlagImageWriter:
+    """
+    Publishes flags as a versioned image file for FlagImageReader instances.
+
+    Versions continue from the image already at ``path``, so readers notice a
+    new image even when the writing process restarts.
+
+    Attributes:
+        path (str): The image file.
+        version (int): Version of the last image written.
+
+    Example:
+        ```python
+        writer = FlagImageWriter("/dev/shm/flaggle.img")
+        writer.write(Flag.from_json(document))
+        ```
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Initialize a writer for ``path``.
+
+        Args:
+            path (str): The image file; its directory must exist.
+        """
+        self.path: str = path
+        try:
+            self.version: int = read_version(path)
+        except ValueError:
+            logger.warning("Replacing invalid flag image at %s", path)
+            self.version = 0
+
+    def write(self, flags: dict[str, Flag]) -> int:
+        """
+        Atomically replace the image with ``flags`` under a new version.
+
+        Args:
+            flags (dict[str, Flag]): The flags to publish.
+        Returns:
+            int: The version of the new image.
+        Raises:
+            OSError: If the image cannot be written.
+            ValueError: If a flag cannot be serialised.
+        """
+        payload = json.dumps(Flag.to_json(flags), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        version = self.version + 1
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with NamedTemporaryFile(dir=directory, prefix=".flaggle-", delete=False) as file:
+            try:
+                file.write(HEADER.pack(MAGIC, version, len(payload)))
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+                os.chmod(file.name, 0o644)
+                os.replace(file.name, self.path)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+        _fsync_directory(directory)
+        self.version = version
+        logger.info("Published flag image version %s to %s", version, self.path)
+        return version
+
+
+class FlagImageReader:
+    """
+    Maps a flag image file and decodes it only when its version changes.
+
+    Attributes:
+        path (str): The image file.
+        version (int): Version of the last image decoded, 0 before the first read.
+
+    Example:
+        ```python
+        reader = FlagImageReader("/dev/shm/flaggle.img")
+        flags = reader.read()  # None while the image is unchanged
+        ```
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Initialize a reader for ``path``.
+
+        Args:
+            path (str): The image file.
+        """
+        self.path: str = path
+        self.version: int = 0
+        self._stat_key: Optional[tuple[int, int, int, int]] = None
+
+    def read(self, previous: Optional[dict[str, Flag]] = None) -> Optional[dict[str, Flag]]:
+        """
+        Decode the image if it changed since the last read.
+
+        Args:
+            previous (Optional[dict[str, Flag]]): Currently loaded flags to reuse.
+        Returns:
+            Optional[dict[str, Flag]]: The image's flags, or None if its version did not change.
+        Raises:
+            OSError: If the image cannot be opened.
+            ValueError: If the file is not a valid flag image.
+        """
+        stat = os.stat(self.path)
+        stat_key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if stat_key == self._stat_key:
+            return None
+
+        with open(self.path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as image:
+            version, length = _unpack_header(image[:HEADER.size], self.path)
+            if version == self.version:
+                self._stat_key = stat_key
+                return None
+            if HEADER.size + length > len(image):
+                raise ValueError(f"Flag image {self.path} is truncated")
+            with memoryview(image) as view:
+                chunks = _chunks(view, HEADER.size, HEADER.size + length)
+                try:
+                    flags = Flag.from_stream(chunks, previous=previous)
+                finally:
+                    chunks.close()
+
+        self.version = version
+        self._stat_key = stat_key
+        return flags
+
+
+def _chunks(view: memoryview, start: int, end: int) -> Iterator[memoryview]:
+    """Yield zero-copy slices of ``view[start:end]``."""
+    for offset in range(start, end, CHUNK_SIZE):
+        with view[offset:min(offset + CHUNK_SIZE, end)] as chunk:
+            yield chunk
@@ -0,0 +1,100 @@
+"""Immutable snapshots of a Flaggle's flags.
+
+This module provides the FlagSnapshot class, a read-only, versioned view of a
+flag set that request handlers can take once and read without locks while the
+poller publishes newer generations.
+
+Classes:
+    FlagSnapshot: Immutable, versioned view of a flag set.
+"""
+
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, NamedTuple, Optional, Sequence
+
+from python_flaggle.flag import Flag, _array_module
+
+_EMPTY: Mapping[str, Flag] = MappingProxyType({})
+
+
+class FlagSnapshot(NamedTuple):
+    """Immutable, versioned view of a flag set.
+
+    A new snapshot is published each time an update changes the flags, with a
+    higher version. Holding on to a snapshot guarantees every read sees the same
+    generation of flags.
+
+    Attributes:
+        version (int): Generation number, incremented whenever the flags change.
+        flags (Mapping[str, Flag]): Read-only mapping of flag name to Flag object.
+
+    Example:
+        ```python
+        snapshot = flaggle.snapshot()
+        if snapshot.is_enabled("new_checkout") and snapshot.is_enabled("region", "BR"):
+            ...
+        ```
+    """
+    version: int = 0
+    flags: Mapping[str, Flag] = _EMPTY
+
+    @classmethod
+    def of(cls, flags: dict[str, Flag], version: int = 0) -> "FlagSnapshot":
+        """Wrap a flag dictionary in a read-only snapshot.
+
+        The dictionary is not copied; callers must not mutate it afterwards.
+
+        Args:
+            flags (dict[str, Flag]): Flag name to Flag object.
+            version (int): Generation number of the snapshot.
+        Returns:
+            FlagSnapshot: The snapshot.
+        """
+        return cls(version, MappingProxyType(flags))
+
+    def get(self, name: str) -> Optional[Flag]:
+        """Return the named flag, or None if it is not in this snapshot."""
+        return self.flags.get(name)
+
+    def is_enabled(self, name: str, other_value: Optional[Any] = None) -> bool:
+        """
+        Evaluate the named flag in this snapshot.
+
+        Args:
+            name (str): The flag name.
+            other_value (Optional[Any]): Value to compare against the flag's value.
+        Returns:
+            bool: The flag's result, or False if the flag does not exist.
+        """
+        flag = self.flags.get(name)
+        if flag is None:
+            return False
+        return flag.is_enabled(other_value)
+
+    def evaluate_batch(self, names: Iterable[str], values: Sequence[Any]) -> Any:
+        """
+        Evaluate several flags against a column of context values.
+
+        Each flag runs once over the whole column (see ``Flag.is_enabled_many``),
+        so numeric numpy columns are compared with array operations.
+
+        Args:
+            names (Iterable[str]): The flag names, one result row each.
+            values (Sequence[Any]): Context values, e.g. a list or a 1-D numpy array.
+        Returns:
+            list[list[bool]] | numpy.ndarray: A ``len(names) x len(values)`` matrix,
+            as a boolean numpy array when ``values`` is one. Rows of missing flags
+            are all False.
+        Example:
+            ```python
+            matrix = snapshot.evaluate_batch(["min_score", "allowed_ids"], scores)
+            ```
+        """
+        flags = self.flags
+        rows = []
+        for name in names:
+            flag = flags.get(name)
+            rows.append([False] * len(values) if flag is None else flag.is_enabled_many(values))
+        numpy = _array_module(values)
+        if numpy is not None:
+            return numpy.array(rows, dtype=bool).reshape(len(rows), len(values))
+        return rows
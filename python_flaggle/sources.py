@@ -0,0 +1,495 @@
+"""Flag sources: where a Flaggle loads its flags from.
+
+A Flaggle polls one FlagSource. Every poll calls ``fetch``, which returns a new
+set of flags, or None when nothing changed since the last call, so sources
+that can detect changes cheaply (HTTP validators, file metadata, a version
+counter) skip parsing altogether. Polling, backoff, scheduling, caching, and
+change tracking work the same for every source.
+
+Classes:
+    FlagSource: Base class of flag sources.
+    HttpSource: Fetches a flags document over HTTP with conditional requests.
+    FileSource: Reads a flags JSON file, only when it changed, through mmap.
+    ImageSource: Reads a flag image published by another process.
+    MemorySource: Serves flags documents set in-process, e.g. in tests.
+    EnvSource: Reads a flags document from an environment variable.
+
+Functions:
+    create_session: Build a pooled HTTP session that Flaggle instances can share.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from json import loads
+from logging import DEBUG, getLogger
+from mmap import ACCESS_READ, mmap
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from python_flaggle.flag import Flag
+from python_flaggle.metrics import FlaggleMetrics
+from python_flaggle.shared import FlagImageReader, _chunks
+
+if TYPE_CHECKING:
+    from requests import Session
+
+logger = getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def create_session(pool_size: int = 10, pool_hosts: int = 10) -> "Session":
+    """
+    Create an HTTP session with a keep-alive connection pool for flag fetches.
+
+    Pass the same session to several Flaggle instances to share one pool per host
+    between them.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host (default: 10).
+        pool_hosts (int): Number of hosts to keep connection pools for (default: 10).
+    Returns:
+        Session: A requests session with HTTP and HTTPS adapters mounted.
+    Example:
+        ```python
+        session = create_session(pool_size=4)
+        flags_a = Flaggle(url="https://api.example.com/flags/a", session=session)
+        flags_b = Flaggle(url="https://api.example.com/flags/b", session=session)
+        ```
+    """
+    # requests is imported on first use, so Flaggles reading a shared image and
+    # code only building Flag objects never load the HTTP stack.
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class FlagSource(ABC):
+    """
+    Abstract base class of the sources a Flaggle loads flags from.
+
+    Subclasses must implement ``fetch``. Pass an instance to ``Flaggle(source=...)``;
+    Flaggle does not close sources passed in.
+
+    Attributes:
+        name (str): Where the flags come from (URL, path, ...), used in log messages.
+
+    Example:
+        ```python
+        class DatabaseSource(FlagSource):
+            def __init__(self, db):
+                self.name = "flags table"
+                self._db = db
+                self._revision = None
+
+            def fetch(self, previous, metrics=None):
+                revision, document = self._db.load_flags()
+                if revision == self._revision:
+                    return None
+                self._revision = revision
+                return Flag.from_json(document, previous=previous)
+        ```
+    """
+    name: str = "flag source"
+
+    @abstractmethod
+    def fetch(
+        self, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics] = None
+    ) -> Optional[dict[str, Flag]]:
+        """
+        Load the flags if they changed since the last call.
+
+        Args:
+            previous (dict[str, Flag]): Currently loaded flags, to reuse unchanged ones.
+            metrics (Optional[FlaggleMetrics]): Metrics to record fetch durations
+                and payload sizes into, if enabled.
+        Returns:
+            Optional[dict[str, Flag]]: The new flags, or None if they did not change.
+        Raises:
+            OSError: If the flags cannot be reached.
+            ValueError: If the flags document is invalid.
+        """
+
+    def close(self) -> None:
+        """
+        Release the resources held by the source.
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class HttpSource(FlagSource):
+    """
+    Fetches a flags document over HTTP, with keep-alive and conditional requests.
+
+    Requests carry the ETag and Last-Modified validators of the last full
+    response, so an unchanged document is answered with 304 and not parsed.
+
+    Attributes:
+        url (str): The endpoint URL.
+        session (Session): Session whose connection pool is reused across fetches.
+        timeout (float): Request timeout in seconds.
+        verify_ssl (bool): Whether to verify SSL certificates.
+        streaming (bool): Whether the document is parsed while it downloads.
+        etag (Optional[str]): ETag of the last full response, sent as If-None-Match.
+        last_modified (Optional[str]): Last-Modified of the last full response,
+            sent as If-Modified-Since.
+    """
+    def __init__(
+        self,
+        url: str,
+        session: Optional["Session"] = None,
+        timeout: float = 10,
+        verify_ssl: bool = True,
+        streaming: bool = False,
+        pool_size: int = 10,
+    ) -> None:
+        """
+        Initialize an HTTP source.
+
+        Args:
+            url (str): The endpoint to fetch the flags JSON from.
+            session (Session, optional): HTTP session to fetch with; it is not
+                closed with the source.
+            timeout (float): Request timeout in seconds (default: 10).
+            verify_ssl (bool): Whether to verify SSL certificates (default: True).
+            streaming (bool): Parse the document while it downloads (default: False).
+            pool_size (int): Connection pool size of the session created when none
+                is given (default: 10).
+        """
+        self.name: str = url
+        self.url: str = url
+        self._owns_session: bool = session is None
+        self.session: "Session" = session if session is not None else create_session(pool_size)
+        self.timeout: float = timeout
+        self.verify_ssl: bool = verify_ssl
+        self.streaming: bool = streaming
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+
+    def _conditional_headers(self) -> dict[str, str]:
+        """
+        Build the validator headers for a conditional flags request.
+
+        Returns:
+            dict[str, str]: If-None-Match/If-Modified-Since headers from the last full response.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def fetch(
+        self, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics] = None
+    ) -> Optional[dict[str, Flag]]:
+        """
+        Fetch the flags document unless the server answers 304 Not Modified.
+
+        Args:
+            previous (dict[str, Flag]): Currently loaded flags, to reuse unchanged ones.
+            metrics (Optional[FlaggleMetrics]): Records request and parse durations
+                and the document size, if given.
+        Returns:
+            Optional[dict[str, Flag]]: The new flags, or None on a 304 answer.
+        Raises:
+            RequestException: If the HTTP request fails.
+            ValueError: If the response format is invalid.
+        """
+        logger.info("Fetching flags from %s", self.url)
+        started = perf_counter()
+        response = self.session.get(
+            self.url,
+            timeout=self.timeout,
+            verify=self.verify_ssl,
+            headers=self._conditional_headers(),
+            stream=self.streaming,
+        )
+        if metrics is not None:
+            metrics.fetch_seconds.observe(perf_counter() - started)
+        if not self.streaming:
+            return self._read(response, previous, metrics)
+        # A streamed response holds its pooled connection until it is closed, even on 304 or an error,
+        # and closing it before its body was read drops the connection instead of returning it.
+        with response:
+            if response.status_code == 304 or response.status_code >= 400:
+                response.content
+            return self._read(response, previous, metrics)
+
+    def _read(
+        self, response: Any, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics]
+    ) -> Optional[dict[str, Flag]]:
+        """Check the status of ``response`` and parse its flags document, or return None on 304."""
+        received = perf_counter()
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        logger.info("Flags fetched successfully from %s", self.url)
+        if self.streaming:
+            if metrics is None:
+                flags = Flag.from_stream(response.iter_content(STREAM_CHUNK_SIZE), previous=previous)
+            else:
+                chunks = metrics.measure_size(response.iter_content(STREAM_CHUNK_SIZE))
+                try:
+                    flags = Flag.from_stream(chunks, previous=previous)
+                finally:
+                    chunks.close()
+        else:
+            data = response.json()
+            if logger.isEnabledFor(DEBUG):
+                logger.debug("Response[%i]: %r", response.status_code, data)
+            flags = Flag.from_json(data, previous=previous)
+            if metrics is not None:
+                metrics.payload_bytes.observe(len(response.content))
+        if metrics is not None:
+            metrics.parse_seconds.observe(perf_counter() - received)
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        return flags
+
+    def close(self) -> None:
+        """
+        Close the session, unless it was passed in.
+        """
+        if self._owns_session:
+            self.session.close()
+
+
+class FileSource(FlagSource):
+    """
+    Reads a flags JSON file, only when it changed since the last read.
+
+    Each poll costs one ``stat``; the file is parsed only when its inode, size,
+    or modification time differ, so it can be polled often. The file is mapped
+    and parsed straight from the mapping, without reading it into a buffer
+    first. Replace the file atomically (write elsewhere, then rename) so a poll
+    never sees a partial document.
+
+    Attributes:
+        path (str): The flags JSON file.
+
+    Example:
+        ```python
+        flaggle = Flaggle(source=FileSource("flags.json"), interval=1)
+        ```
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Initialize a file source.
+
+        Args:
+            path (str): The flags JSON file, in the format served by a flags endpoint.
+        """
+        self.name: str = path
+        self.path: str = path
+        self._stat_key: Optional[tuple[int, int, int, int]] = None
+
+    def fetch(
+        self, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics] = None
+    ) -> Optional[dict[str, Flag]]:
+        """
+        Parse the file if it changed since the last read.
+
+        Args:
+            previous (dict[str, Flag]): Currently loaded flags, to reuse unchanged ones.
+            metrics (Optional[FlaggleMetrics]): Records the parse duration and file
+                size, if given.
+        Returns:
+            Optional[dict[str, Flag]]: The file's flags, or None if it did not change.
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is empty or not a valid flags document.
+        """
+        stat = os.stat(self.path)
+        stat_key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if stat_key == self._stat_key:
+            return None
+        if not stat.st_size:
+            raise ValueError(f"Flags file {self.path} is empty")
+
+        started = perf_counter()
+        with open(self.path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+            with memoryview(data) as view:
+                chunks = _chunks(view, 0, len(data))
+                try:
+                    flags = Flag.from_stream(chunks, previous=previous)
+                finally:
+                    chunks.close()
+        if metrics is not None:
+            metrics.parse_seconds.observe(perf_counter() - started)
+            metrics.payload_bytes.observe(stat.st_size)
+        self._stat_key = stat_key
+        logger.info("Flags loaded from file %s", self.path)
+        return flags
+
+
+class ImageSource(FlagSource):
+    """
+    Reads a flag image published by another process, decoding it only when its version changes.
+
+    This is the source of ``Flaggle(shared_image=...)``.
+
+    Attributes:
+        reader (FlagImageReader): Reader of the image file.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Initialize an image source.
+
+        Args:
+            path (str): The image file, written by a FlagImageWriter.
+        """
+        self.name: str = path
+        self.reader: FlagImageReader = FlagImageReader(path)
+
+    def fetch(
+        self, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics] = None
+    ) -> Optional[dict[str, Flag]]:
+        """
+        Decode the image if its version changed since the last read.
+
+        Args:
+            previous (dict[str, Flag]): Currently loaded flags, to reuse unchanged ones.
+            metrics (Optional[FlaggleMetrics]): Unused.
+        Returns:
+            Optional[dict[str, Flag]]: The image's flags, or None if its version did not change.
+        Raises:
+            OSError: If the image cannot be opened.
+            ValueError: If the file is not a valid flag image.
+        """
+        flags = self.reader.read(previous=previous)
+        if flags is not None:
+            logger.info("Flags loaded from image %s (version %s)", self.name, self.reader.version)
+        return flags
+
+
+class MemorySource(FlagSource):
+    """
+    Serves flags documents set in-process, replacing a fake HTTP endpoint in tests
+    and local development.
+
+    Attributes:
+        version (int): Number of documents set so far.
+
+    Example:
+        ```python
+        source = MemorySource({"flags": [{"name": "beta", "value": False}]})
+        flaggle = Flaggle(source=source, interval=1)
+        source.set({"flags": [{"name": "beta", "value": True}]})  # Applied by the next poll
+        ```
+    """
+    def __init__(self, document: Optional[Mapping[str, Any]] = None, name: str = "memory") -> None:
+        """
+        Initialize a memory source.
+
+        Args:
+            document (Mapping[str, Any], optional): Initial flags document, with a
+                ``flags`` list as served by a flags endpoint.
+            name (str): Name used in log messages (default: ``"memory"``).
+        """
+        self.name: str = name
+        self.version: int = 0
+        self._document: Optional[Mapping[str, Any]] = None
+        self._served: int = 0
+        self._lock = Lock()
+        if document is not None:
+            self.set(document)
+
+    def set(self, document: Mapping[str, Any]) -> None:
+        """
+        Replace the flags document; the next fetch returns its flags.
+
+        Args:
+            document (Mapping[str, Any]): Flags document with a ``flags`` list.
+        """
+        with self._lock:
+            self._document = document
+            self.version += 1
+
+    def fetch(
+        self, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics] = None
+    ) -> Optional[dict[str, Flag]]:
+        """
+        Build the flags of the latest document if it was not served yet.
+
+        Args:
+            previous (dict[str, Flag]): Currently loaded flags, to reuse unchanged ones.
+            metrics (Optional[FlaggleMetrics]): Unused.
+        Returns:
+            Optional[dict[str, Flag]]: The document's flags, or None if it was
+            already served.
+        Raises:
+            ValueError: If no document was set, or the document is invalid.
+        """
+        with self._lock:
+            document, version = self._document, self.version
+        if document is None:
+            raise ValueError("No flags document set")
+        if version == self._served:
+            return None
+        flags = Flag.from_json(document, previous=previous)
+        self._served = version
+        return flags
+
+
+class EnvSource(FlagSource):
+    """
+    Reads a flags JSON document from an environment variable.
+
+    Useful for containers configured through the environment. The document is
+    parsed again only when the variable's value changes.
+
+    Attributes:
+        variable (str): Name of the environment variable.
+
+    Example:
+        ```python
+        # FLAGGLE_FLAGS='{"flags": [{"name": "beta", "value": true}]}'
+        flaggle = Flaggle(source=EnvSource("FLAGGLE_FLAGS"))
+        ```
+    """
+    def __init__(self, variable: str, environ: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Initialize an environment source.
+
+        Args:
+            variable (str): Name of the variable holding the flags JSON.
+            environ (Mapping[str, str], optional): Environment to read; defaults to ``os.environ``.
+        """
+        self.name: str = f"${variable}"
+        self.variable: str = variable
+        self._environ: Mapping[str, str] = environ if environ is not None else os.environ
+        self._value: Optional[str] = None
+
+    def fetch(
+        self, previous: dict[str, Flag], metrics: Optional[FlaggleMetrics] = None
+    ) -> Optional[dict[str, Flag]]:
+        """
+        Parse the variable if its value changed since the last read.
+
+        Args:
+            previous (dict[str, Flag]): Currently loaded flags, to reuse unchanged ones.
+            metrics (Optional[FlaggleMetrics]): Records the document size, if given.
+        Returns:
+            Optional[dict[str, Flag]]: The document's flags, or None if unchanged.
+        Raises:
+            ValueError: If the variable is unset or not a valid flags document.
+        """
+        value = self._environ.get(self.variable)
+        if value is None:
+            raise ValueError(f"Environment variable {self.variable} is not set")
+        if value == self._value:
+            return None
+        flags = Flag.from_json(loads(value), previous=previous)
+        if metrics is not None:
+            metrics.payload_bytes.observe(len(value.encode("utf-8")))
+        self._value = value
+        return flags
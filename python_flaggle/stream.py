@@ -0,0 +1,132 @@
+"""Incremental parsing of flag documents.
+
+This module provides a streaming reader for the flags JSON document. It decodes
+the body once, chunk by chunk, and yields each entry of the top-level ``flags``
+array as soon as it is complete, so large documents never need to be held as
+text and as a fully materialised list at the same time.
+
+Functions:
+    iter_flag_definitions: Yield flag definitions from chunks of a JSON document.
+"""
+
+from codecs import getincrementaldecoder
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_COMPACT_THRESHOLD = 1 << 16
+_decoder = JSONDecoder()
+
+
+class _Reader:
+    """Text buffer fed from an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; return False once input is exhausted."""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_THRESHOLD:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of input."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` after optional whitespace."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON data: expected '{char}' at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            pending = len(self.text) - self.pos
+            try:
+                result, end = _decoder.raw_decode(self.text, self.pos)
+            except JSONDecodeError as exc:
+                if not self._grow(pending):
+                    raise ValueError(f"Invalid JSON data: {exc}") from exc
+                continue
+            # A number or literal ending exactly at the buffer edge may be truncated.
+            if end == len(self.text) and self._grow(pending):
+                continue
+            self.pos = end
+            return result
+
+    def _grow(self, pending: int) -> bool:
+        """Read until the unparsed text at least doubles, so retries stay linear."""
+        grew = False
+        while len(self.text) - self.pos < 2 * pending + 1 and self.fill():
+            grew = True
+        return grew
+
+
+def iter_flag_definitions(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Yield the entries of the top-level ``flags`` array of a UTF-8 JSON document.
+
+    Other top-level keys are skipped, and reading stops once the array closes.
+
+    Args:
+        chunks (Iterable[bytes]): The document body, in chunks of any size.
+    Yields:
+        dict: Each flag definition, as soon as it has been fully read.
+    Raises:
+        ValueError: If the document is not valid JSON or has no ``flags`` array.
+    Example:
+        ```python
+        response = session.get(url, stream=True)
+        for definition in iter_flag_definitions(response.iter_content(65536)):
+            print(definition["name"])
+        ```
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise ValueError("No flags in the provided JSON data")
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"Invalid JSON data: object key {key!r} is not a string")
+        reader.expect(":")
+        if key == "flags":
+            if reader.peek() != "[":
+                raise ValueError("No flags in the provided JSON data")
+            reader.pos += 1
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                if reader.peek() == "]":
+                    return
+                reader.expect(",")
+        reader.value()
+        if reader.peek() == "}":
+            raise ValueError("No flags in the provided JSON data")
+        reader.expect(",")
@@ -0,0 +1,249 @@
+"""Change subscriptions for Flaggle.
+
+This module lets applications register callbacks for flag names or
+shell-style patterns (``"checkout.*"``) and have them called only when a
+refresh actually added, changed, or removed a matching flag.
+
+The refresh only matches the changed names and queues the affected
+subscriptions; callbacks run on a small, fixed pool of worker threads, so a
+slow subscriber never holds up polling. Changes arriving while a subscription
+is still queued or running are merged into one pending delivery, so the queue
+never holds more than one entry per subscription, and each subscription's
+callbacks run one at a time, in order.
+
+Classes:
+    Subscription: Handle of a callback subscribed to flag changes.
+    Subscribers: Matches flag changes against subscriptions and dispatches them.
+"""
+
+from fnmatch import translate
+from logging import getLogger
+from queue import SimpleQueue
+from re import compile as compile_pattern
+from threading import Lock, Thread, current_thread
+from typing import Callable, Optional
+
+from python_flaggle.flag import FlagChanges
+from python_flaggle.snapshot import FlagSnapshot
+
+logger = getLogger(__name__)
+
+_WILDCARDS = frozenset("*?[")
+_PATTERN_CACHE_SIZE = 10_000
+
+Callback = Callable[[FlagChanges, FlagSnapshot], None]
+
+
+class Subscription:
+    """Handle of a callback subscribed to changes of matching flags.
+
+    Attributes:
+        pattern (str): Flag name, or shell-style pattern, the subscription matches.
+        callback (Callable[[FlagChanges, FlagSnapshot], None]): Called with the
+            matching changes and the snapshot they produced.
+        active (bool): Whether the subscription still receives changes.
+    """
+    __slots__ = ("pattern", "callback", "active", "_match", "_pending", "_snapshot", "_scheduled")
+
+    def __init__(self, pattern: str, callback: Callback) -> None:
+        self.pattern: str = pattern
+        self.callback: Callback = callback
+        self.active: bool = True
+        self._match: Optional[Callable[[str], object]] = (
+            compile_pattern(translate(pattern)).match if _WILDCARDS & set(pattern) else None
+        )
+        self._pending: Optional[FlagChanges] = None
+        self._snapshot: Optional[FlagSnapshot] = None
+        self._scheduled: bool = False
+
+
+def _only(changes: FlagChanges, names: frozenset) -> FlagChanges:
+    """Restrict ``changes`` to ``names``."""
+    return FlagChanges(changes.added & names, changes.changed & names, changes.removed & names)
+
+
+def _merge(earlier: FlagChanges, later: FlagChanges, snapshot: FlagSnapshot) -> FlagChanges:
+    """Combine two consecutive sets of changes into their net effect on ``snapshot``."""
+    names = earlier.added | earlier.changed | earlier.removed | later.added | later.changed | later.removed
+    absent = frozenset(name for name in names if name not in snapshot.flags)
+    # A flag added and removed again before delivery was never seen, so it is left out.
+    added = (earlier.added | later.added) - absent - earlier.removed
+    return FlagChanges(added, names - absent - added, absent - earlier.added)
+
+
+class Subscribers:
+    """Matches flag changes against subscriptions and dispatches them on worker threads.
+
+    Exact flag names are looked up in a dict. Patterns are matched against a
+    changed name the first time it is seen, and the matching subscriptions are
+    remembered until the set of patterns changes. Worker threads start lazily,
+    up to ``workers``.
+
+    Attributes:
+        workers (int): Maximum number of worker threads running callbacks.
+    """
+    def __init__(self, workers: int = 1, name: str = "flaggle-subscribers") -> None:
+        """
+        Initialize without subscriptions or threads.
+
+        Args:
+            workers (int): Maximum number of worker threads (default: 1).
+            name (str): Name prefix of the worker threads.
+        Raises:
+            ValueError: If ``workers`` is not positive.
+        """
+        if workers < 1:
+            raise ValueError("Subscribers needs at least one worker")
+        self.workers: int = workers
+        self._name: str = name
+        self._exact: dict[str, list[Subscription]] = {}
+        self._patterns: tuple[list[Subscription], dict[str, tuple[Subscription, ...]]] = ([], {})
+        self._lock = Lock()
+        self._queue: SimpleQueue = SimpleQueue()
+        self._threads: list[Thread] = []
+        self._closed: bool = False
+
+    def __len__(self) -> int:
+        """Return the number of active subscriptions."""
+        return sum(map(len, self._exact.values())) + len(self._patterns[0])
+
+    def add(self, pattern: str, callback: Callback) -> Subscription:
+        """
+        Subscribe ``callback`` to changes of the flags matching ``pattern``.
+
+        Args:
+            pattern (str): A flag name, or a shell-style pattern such as ``"checkout.*"``.
+            callback (Callable[[FlagChanges, FlagSnapshot], None]): Called with the
+                matching changes and the snapshot they produced.
+        Returns:
+            Subscription: Handle to pass to ``remove``.
+        Raises:
+            RuntimeError: If closed.
+        """
+        subscription = Subscription(pattern, callback)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Subscribers are closed")
+            # Indexes are replaced, never mutated, so dispatch can read them without the lock.
+            if subscription._match is None:
+                self._exact = {**self._exact, pattern: self._exact.get(pattern, []) + [subscription]}
+            else:
+                self._patterns = (self._patterns[0] + [subscription], {})
+        return subscription
+
+    def remove(self, subscription: Subscription) -> None:
+        """
+        Stop delivering changes to ``subscription``. A callback already running completes.
+
+        Args:
+            subscription (Subscription): The handle returned by ``add``.
+        """
+        with self._lock:
+            subscription.active = False
+            if subscription._match is not None:
+                self._patterns = ([s for s in self._patterns[0] if s is not subscription], {})
+                return
+            remaining = [s for s in self._exact.get(subscription.pattern, ()) if s is not subscription]
+            exact = dict(self._exact)
+            if remaining:
+                exact[subscription.pattern] = remaining
+            else:
+                exact.pop(subscription.pattern, None)
+            self._exact = exact
+
+    def dispatch(self, changes: FlagChanges, snapshot: FlagSnapshot) -> int:
+        """
+        Queue a delivery to every subscription matching one of the changed flags.
+
+        Only matches names and queues; callbacks run on the worker threads.
+
+        Args:
+            changes (FlagChanges): Flags added, changed, and removed by a refresh.
+            snapshot (FlagSnapshot): The snapshot the refresh published.
+        Returns:
+            int: Number of subscriptions notified.
+        """
+        exact, (patterns, cache) = self._exact, self._patterns
+        if not (exact or patterns) or not any(changes):
+            return 0
+        names = changes.added | changes.changed | changes.removed
+        matched: dict[Subscription, set[str]] = {}
+        for name in names:
+            for subscription in exact.get(name, ()):
+                matched.setdefault(subscription, set()).add(name)
+            if not patterns:
+                continue
+            hits = cache.get(name)
+            if hits is None:
+                if len(cache) >= _PATTERN_CACHE_SIZE:
+                    cache.clear()
+                hits = cache[name] = tuple(s for s in patterns if s._match(name))
+            for subscription in hits:
+                matched.setdefault(subscription, set()).add(name)
+        for subscription, subscribed in matched.items():
+            self._deliver(subscription, _only(changes, frozenset(subscribed)), snapshot)
+        return len(matched)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Drop every subscription and stop the worker threads.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for each worker to finish
+                its current callback; None waits indefinitely.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for subscriptions in self._exact.values():
+                for subscription in subscriptions:
+                    subscription.active = False
+            for subscription in self._patterns[0]:
+                subscription.active = False
+            self._exact, self._patterns = {}, ([], {})
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            if thread is not current_thread():
+                thread.join(timeout)
+
+    def _deliver(self, subscription: Subscription, changes: FlagChanges, snapshot: FlagSnapshot) -> None:
+        """Merge ``changes`` into the subscription's pending delivery and queue it unless already queued."""
+        with self._lock:
+            if self._closed:
+                return
+            pending = subscription._pending
+            subscription._pending = changes if pending is None else _merge(pending, changes, snapshot)
+            subscription._snapshot = snapshot
+            if subscription._scheduled:
+                return
+            subscription._scheduled = True
+            if len(self._threads) < self.workers:
+                thread = Thread(target=self._work, name=f"{self._name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self._queue.put(subscription)
+
+    def _work(self) -> None:
+        """Worker loop: run queued subscriptions until closed."""
+        while True:
+            subscription = self._queue.get()
+            if subscription is None:
+                return
+            while True:
+                with self._lock:
+                    changes, snapshot = subscription._pending, subscription._snapshot
+                    subscription._pending = subscription._snapshot = None
+                    if changes is None or not subscription.active:
+                        subscription._scheduled = False
+                        break
+                if not any(changes):
+                    continue
+                try:
+                    subscription.callback(changes, snapshot)
+                except Exception as e:
+                    logger.error(
+                        "Subscriber %r for %r failed: %s", subscription.callback, subscription.pattern, e, exc_info=True
+                    )
@@ -0,0 +1,19 @@
+import pytest
+
+from python_flaggle import Flaggle
+
+
+@pytest.fixture(autouse=True)
+def close_flaggles(monkeypatch):
+    """Close every Flaggle a test leaves open, so no poller outlives the test's patches."""
+    created = []
+    init = Flaggle.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        created.append(self)
+
+    monkeypatch.setattr(Flaggle, "__init__", tracking_init)
+    yield
+    for flaggle in created:
+        flaggle.close()
@@ -0,0 +1,33 @@
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll ``condition`` until it is true or ``timeout`` seconds passed, and return its last result."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def document(*definitions, **values):
+    """Build a flags document from flag definitions and ``name=value`` flags."""
+    return {"flags": [*definitions, *({"name": name, "value": value} for name, value in values.items())]}
+
+
+@contextmanager
+def serve(handler):
+    """Serve ``handler`` on a local port from a background thread and yield the base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
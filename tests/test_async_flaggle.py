@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from python_flaggle import AsyncFlaggle, Flag, FlagChanges  # noqa: E402
+
+
+class FlagsApp:
+    """httpx MockTransport handler serving a flags document with an ETag."""
+
+    def __init__(self):
+        self.etag = "v1"
+        self.payload = {"flags": [{"name": "flag", "value": True}]}
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=self.payload, headers={"ETag": self.etag})
+
+
+def make_client(app):
+    return httpx.AsyncClient(transport=httpx.MockTransport(app))
+
+
+def test_async_flaggle_start_fetches_flags():
+    app = FlagsApp()
+
+    async def main():
+        f = AsyncFlaggle("http://x/flags", interval=60, client=make_client(app))
+        await f.start()
+        try:
+            assert f.flags["flag"].is_enabled() is True
+            assert f.snapshot().version == 1
+            assert f.full_fetch_count == 1
+            assert f.last_changes.added == {"flag"}
+            assert f.url == "http://x/flags"
+            assert f.interval == 60
+            assert f.timeout == 10
+            assert f.verify_ssl is True
+            assert f.evaluate_batch(["flag", "missing"], [1, 2]) == [[True, True], [False, False]]
+        finally:
+            await f.aclose()
+
+    asyncio.run(main())
+
+
+def test_async_flaggle_polls_with_conditional_get():
+    app = FlagsApp()
+
+    async def main():
+        async with AsyncFlaggle("http://x/flags", interval=0.01, client=make_client(app)) as f:
+            flags = f.flags
+            while f.not_modified_count < 2:
+                await asyncio.sleep(0.01)
+            assert f.flags is flags
+
+            app.etag = "v2"
+            app.payload = {"flags": [{"name": "flag", "value": False}]}
+            while f.full_fetch_count < 2:
+                await asyncio.sleep(0.01)
+            assert f.flags["flag"].is_enabled() is False
+            assert f.last_changes == FlagChanges(changed=frozenset({"flag"}))
+
+        assert f._task is None
+        assert app.requests[1].headers["If-None-Match"] == "v1"
+
+    asyncio.run(main())
+
+
+def test_async_flaggle_keeps_defaults_on_error(caplog):
+    def fail(request):
+        return httpx.Response(500)
+
+    async def main():
+        client = make_client(fail)
+        f = AsyncFlaggle(
+            "http://x/flags",
+            default_flags={"default": Flag("default", True)},
+            client=client,
+        )
+        with caplog.at_level(logging.ERROR):
+            await f.start()
+        await f.aclose()
+        assert f.flags["default"].is_enabled() is True
+        assert any("Error fetching flags" in r.message for r in caplog.records)
+        assert not client.is_closed
+
+    asyncio.run(main())
+
+
+def test_async_flaggle_invalid_payload(caplog):
+    def invalid(request):
+        return httpx.Response(200, json={"not_flags": []})
+
+    async def main():
+        f = AsyncFlaggle("http://x/flags", client=make_client(invalid))
+        with caplog.at_level(logging.ERROR):
+            assert await f._fetch_flags() == {}
+        assert any("Invalid response format" in r.message for r in caplog.records)
+
+    asyncio.run(main())
+
+
+def test_async_flaggle_closes_owned_client():
+    async def main():
+        f = AsyncFlaggle("http://x/flags")
+        await f.aclose()
+        assert f._client.is_closed
+
+    asyncio.run(main())
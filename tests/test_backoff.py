@@ -0,0 +1,73 @@
+from random import Random
+
+from python_flaggle.backoff import CircuitBreaker, RetryPolicy, full_jitter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_full_jitter_bounds():
+    random = Random(0).random
+    delays = [full_jitter(failures, 1.0, 30.0, random) for failures in range(1, 10) for _ in range(200)]
+
+    assert all(0 <= delay < 30.0 for delay in delays)
+    assert max(full_jitter(1, 1.0, 30.0, random) for _ in range(200)) < 2.0
+    assert max(delays) > 20.0
+    assert full_jitter(10_000, 1.0, 30.0, lambda: 0.5) == 15.0
+
+
+def test_breaker_opens_after_threshold():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+
+    for _ in range(2):
+        assert breaker.allow() is True
+        breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+    clock.now = 9.9
+    assert breaker.allow() is False
+
+
+def test_breaker_half_open_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.state == "half-open"
+    assert breaker.allow() is True
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+    clock.now = 20
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_breaker_without_threshold_never_opens():
+    breaker = CircuitBreaker(failure_threshold=0, reset_timeout=0)
+    for _ in range(100):
+        breaker.record_failure()
+
+    assert breaker.allow() is True
+    assert breaker.failures == 100
+
+
+def test_retry_policy_defaults():
+    policy = RetryPolicy()
+
+    assert policy.failure_threshold > 0
+    assert 0 <= policy.start_jitter < 1
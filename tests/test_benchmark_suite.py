@@ -0,0 +1,49 @@
+import json
+
+from benchmarks import suite
+from benchmarks.suite import compare, main, run
+
+
+def results(**seconds):
+    return {"meta": {}, "results": {name: {"seconds": value} for name, value in seconds.items()}}
+
+
+def test_compare_flags_regressions():
+    baseline = results(a=1.0, b=1.0, c=1.0, gone=1.0)
+    current = results(a=1.1, b=1.5, c=0.5, new=1.0)
+
+    rows = compare(baseline, current, threshold=0.2)
+
+    assert [(row[0], row[4]) for row in rows] == [("a", ""), ("b", "REGRESSION"), ("c", "faster")]
+    assert rows[1][3] == 1.5
+
+
+def test_run_records_selected_cases():
+    found = run("evaluate/boolean", repeat=1)
+
+    assert list(found["results"]) == ["evaluate/boolean"]
+    assert found["results"]["evaluate/boolean"]["seconds"] > 0
+    assert found["meta"]["python"]
+
+
+def test_run_builds_only_selected_cases(monkeypatch):
+    def unexpected(*args, **kwargs):
+        raise AssertionError("built a case that was not selected")
+
+    monkeypatch.setattr(suite, "document", unexpected)
+    monkeypatch.setattr(suite, "Flaggle", unexpected)
+    monkeypatch.setattr(suite, "ThreadingHTTPServer", unexpected)
+
+    assert list(run("in-array/10000/hit", repeat=1)["results"]) == ["in-array/10000/hit"]
+
+
+def test_save_then_compare(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    assert main(["-k", "from_string/eq", "--repeat", "1", "--save", str(path)]) == 0
+    saved = json.loads(path.read_text())
+    assert list(saved["results"]) == ["from_string/eq"]
+
+    saved["results"]["from_string/eq"]["seconds"] /= 10
+    path.write_text(json.dumps(saved))
+    assert main(["-k", "from_string/eq", "--repeat", "1", "--compare", str(path)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
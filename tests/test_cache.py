@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+from pytest import raises
+
+from python_flaggle import Flag, FlagOperation
+from python_flaggle.cache import CacheStats, EvaluationCache
+
+RULES = [{"attribute": "country", "operation": "in", "value": ["BR", "US"]}]
+
+
+class CountingFlag(Flag):
+    __slots__ = ("calls",)
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+        super().__init__(*args, **kwargs)
+
+    def is_enabled(self, other_value=None):
+        self.calls += 1
+        return super().is_enabled(other_value)
+
+
+class TestEvaluationCache:
+    def test_hits_and_misses(self):
+        cache = EvaluationCache(max_size=8)
+        flag = CountingFlag("env", "production", operation=FlagOperation.EQ)
+
+        assert cache.evaluate(flag, "production") is True
+        assert cache.evaluate(flag, "production") is True
+        assert cache.evaluate(flag, "staging") is False
+        assert cache.evaluate(flag) is True
+
+        assert flag.calls == 3
+        assert cache.stats == CacheStats(hits=1, misses=3, size=3)
+
+    def test_dict_contexts_are_keyed_on_items(self):
+        cache = EvaluationCache(max_size=8)
+        flag = CountingFlag("flag", False, rules=RULES)
+
+        assert cache.evaluate(flag, {"country": "BR"}) is True
+        assert cache.evaluate(flag, {"country": "BR"}) is True
+        assert cache.evaluate(flag, {"country": "FR"}) is False
+        assert cache.evaluate(flag, {"country": ["BR"]}) is False
+        assert cache.evaluate(flag, {"country": ["BR"]}) is False
+
+        assert flag.calls == 4
+        assert cache.stats.size == 2
+
+    def test_equal_values_of_different_types_are_cached_separately(self):
+        cache = EvaluationCache(max_size=16)
+        flag = Flag("rollout", 50, operation=FlagOperation.PCT)
+        ruled = Flag("ruled", False, rules=[{"attribute": "id", "operation": "pct", "value": 50}])
+
+        for value in (2, 2.0, 1, True, 1.0):
+            assert cache.evaluate(flag, value) is flag.is_enabled(value)
+            assert cache.evaluate(ruled, {"id": value}) is ruled.is_enabled({"id": value})
+        assert cache.evaluate(flag, 2) is False
+        assert cache.evaluate(flag, 2.0) is True
+
+    def test_lru_eviction(self):
+        cache = EvaluationCache(max_size=2)
+        flag = CountingFlag("min", 3, operation=FlagOperation.GE)
+
+        cache.evaluate(flag, 1)
+        cache.evaluate(flag, 2)
+        cache.evaluate(flag, 1)
+        cache.evaluate(flag, 3)
+        cache.evaluate(flag, 1)
+        cache.evaluate(flag, 2)
+
+        assert flag.calls == 4
+        assert cache.stats == CacheStats(hits=2, misses=4, evictions=2, size=2)
+
+    def test_ttl_expiry(self):
+        cache = EvaluationCache(max_size=8, ttl=10)
+        flag = CountingFlag("min", 3, operation=FlagOperation.GE)
+
+        with patch("python_flaggle.cache.monotonic", return_value=100.0):
+            cache.evaluate(flag, 5)
+            cache.evaluate(flag, 5)
+        with patch("python_flaggle.cache.monotonic", return_value=110.0):
+            cache.evaluate(flag, 5)
+
+        assert flag.calls == 2
+        assert cache.stats == CacheStats(hits=1, misses=2, evictions=1, size=1)
+
+    def test_invalidate_drops_only_named_flags(self):
+        cache = EvaluationCache(max_size=8)
+        a = Flag("a", 3, operation=FlagOperation.GE)
+        b = Flag("b", 3, operation=FlagOperation.LE)
+        for value in (1, 2, 3):
+            cache.evaluate(a, value)
+            cache.evaluate(b, value)
+
+        cache.invalidate(["a", "missing"])
+
+        assert cache.stats.invalidations == 3
+        assert len(cache) == 3
+        cache.evaluate(b, 1)
+        assert cache.stats.hits == 1
+
+    def test_replaced_flag_is_never_served_stale(self):
+        cache = EvaluationCache(max_size=8)
+        old = Flag("min", 3, operation=FlagOperation.GE)
+        new = Flag("min", 10, operation=FlagOperation.GE)
+
+        assert cache.evaluate(old, 5) is True
+        assert cache.evaluate(new, 5) is False
+        assert cache.stats.invalidations == 1
+
+    def test_clear(self):
+        cache = EvaluationCache(max_size=8)
+        cache.evaluate(Flag("a", True), 1)
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_settings(self):
+        with raises(ValueError):
+            EvaluationCache(max_size=0)
+        with raises(ValueError):
+            EvaluationCache(max_size=1, ttl=-1)
@@ -1,8 +1,9 @@
+from sys import intern
 from unittest.mock import patch
 
-from pytest import raises
+from pytest import importorskip, mark, raises
 
-from python_flaggle import Flag, FlagOperation, FlagType
+from python_flaggle import Flag, FlagChanges, FlagOperation, FlagType
 
 
 class TestFlagType:
@@ -344,6 +345,328 @@ class TestFlag:
                 self._value = "irrelevant"
                 self._description = None
                 self._operation = None
+                self._compile()
 
         flag = DummyFlag()
         assert flag.is_enabled() is False
+
+    def test_is_enabled_uses_compiled_evaluator(self):
+        flag = Flag("testint", 3, operation=FlagOperation.GE)
+
+        assert callable(flag._evaluate)
+        assert flag.is_enabled(4) is True
+        assert flag.is_enabled(2) is False
+        assert flag.is_enabled() is True
+
+    def test_is_enabled_does_not_log(self):
+        flag = Flag("teststr", "test", operation=FlagOperation.EQ)
+
+        with patch("python_flaggle.flag.logger.debug") as mock_debug:
+            flag.is_enabled("test")
+            flag.is_enabled()
+            mock_debug.assert_not_called()
+
+    def test_is_enabled_compiled_operations(self):
+        assert Flag("eq", 1, operation=FlagOperation.EQ).is_enabled(1) is True
+        assert Flag("ne", 1, operation=FlagOperation.NE).is_enabled(1) is False
+        assert Flag("gt", 1, operation=FlagOperation.GT).is_enabled(2) is True
+        assert Flag("lt", 1, operation=FlagOperation.LT).is_enabled(2) is False
+        assert Flag("le", 1.5, operation=FlagOperation.LE).is_enabled(1.5) is True
+        assert Flag("in", ["a"], operation=FlagOperation.IN).is_enabled("a") is True
+        assert Flag("ni", ["a"], operation=FlagOperation.NI).is_enabled("a") is False
+        assert Flag("in", [], operation=FlagOperation.IN).is_enabled() is False
+        assert Flag("null", None, operation=FlagOperation.EQ).is_enabled(None) is False
+        assert Flag("bool", False, operation=FlagOperation.EQ).is_enabled(False) is False
+
+    def test_is_enabled_custom_operation(self):
+        flag = Flag("custom", 10, operation=lambda first, second: first % second == 0)
+
+        assert flag.is_enabled(20) is True
+        assert flag.is_enabled(21) is False
+
+    def test_is_enabled_in_large_array(self):
+        values = list(range(100_000))
+        flag = Flag("tenants", values, operation=FlagOperation.IN)
+        excluded = Flag("blocked", values, operation=FlagOperation.NI)
+
+        assert flag.value is values
+        assert flag.is_enabled(99_999) is True
+        assert flag.is_enabled(100_000) is False
+        assert flag.is_enabled(1.0) is True
+        assert excluded.is_enabled(99_999) is False
+        assert excluded.is_enabled(-1) is True
+
+    def test_is_enabled_in_unhashable_members(self):
+        flag = Flag("pairs", [[2, "b"], [1, "a"]], operation=FlagOperation.IN)
+        excluded = Flag("pairs", [[2, "b"], [1, "a"]], operation=FlagOperation.NI)
+
+        assert flag.is_enabled([1, "a"]) is True
+        assert flag.is_enabled([3, "c"]) is False
+        assert flag.is_enabled("a") is False
+        assert excluded.is_enabled([1, "a"]) is False
+        assert excluded.is_enabled("a") is True
+
+    def test_is_enabled_in_unorderable_members(self):
+        flag = Flag("mixed", [{"a": 1}, [1]], operation=FlagOperation.IN)
+
+        assert flag.is_enabled({"a": 1}) is True
+        assert flag.is_enabled([1]) is True
+        assert flag.is_enabled([2]) is False
+
+    def test_is_enabled_in_unhashable_value(self):
+        flag = Flag("regions", ["BR", "PT"], operation=FlagOperation.IN)
+        excluded = Flag("regions", ["BR", "PT"], operation=FlagOperation.NI)
+
+        assert flag.is_enabled(["BR"]) is False
+        assert excluded.is_enabled(["BR"]) is True
+
+    def test_is_enabled_in_string_value(self):
+        flag = Flag("substring", "production", operation=FlagOperation.IN)
+
+        assert flag.is_enabled("prod") is True
+        assert flag.is_enabled("staging") is False
+
+    def test_flag_is_slotted(self):
+        flag = Flag("slotted", True)
+
+        assert not hasattr(flag, "__dict__")
+        with raises(AttributeError):
+            flag.extra = 1
+
+    def test_flag_interns_name_and_value(self):
+        name = "".join(["inter", "ned"])
+        value = "".join(["produc", "tion"])
+        flag = Flag(name, value, operation=FlagOperation.EQ)
+
+        assert flag.name is intern("interned")
+        assert flag.value is intern("production")
+        assert Flag("list", ["a"]).value == ["a"]
+
+    def test_flag_shares_constant_evaluators(self):
+        assert Flag("a", True)._evaluate is Flag("b", True)._evaluate
+        assert Flag("a", None)._evaluate is Flag("b", False)._evaluate
+        assert Flag("a", 3)._evaluate is Flag("b", True)._evaluate
+
+    def test_to_dict(self):
+        assert Flag("a", True).to_dict() == {"name": "a", "value": True}
+        assert Flag("b", 3, "min", FlagOperation.GE).to_dict() == {
+            "name": "b",
+            "value": 3,
+            "description": "min",
+            "operation": "ge",
+        }
+        with raises(ValueError):
+            Flag("c", 3, operation=lambda a, b: a == b).to_dict()
+
+    def test_to_json_round_trip(self):
+        flags = {
+            "a": Flag("a", ["x", "y"], "list", FlagOperation.NI),
+            "b": Flag("b", None),
+        }
+
+        loaded = Flag.from_json(Flag.to_json(flags))
+        assert loaded == flags
+        assert loaded["a"].is_enabled("z") is True
+        assert loaded["a"].description == "list"
+
+    @mark.parametrize(
+        "flag",
+        [
+            Flag("bool", True),
+            Flag("off", False),
+            Flag("plain", 3),
+            Flag("null", None, operation=FlagOperation.EQ),
+            Flag("gt", 3, operation=FlagOperation.GT),
+            Flag("ge", 2.5, operation=FlagOperation.GE),
+            Flag("lt", 3, operation=FlagOperation.LT),
+            Flag("le", 3, operation=FlagOperation.LE),
+            Flag("eq", 3, operation=FlagOperation.EQ),
+            Flag("ne", 3, operation=FlagOperation.NE),
+            Flag("in", [1, 3, 5.5], operation=FlagOperation.IN),
+            Flag("ni", [1, 3, 5.5], operation=FlagOperation.NI),
+            Flag("in_unhashable", [[1], 3], operation=FlagOperation.IN),
+            Flag("custom", 3, operation=lambda a, b: a % b == 0),
+            Flag("pct", 50, operation=FlagOperation.PCT),
+        ],
+        ids=lambda flag: flag.name,
+    )
+    def test_is_enabled_many_matches_is_enabled(self, flag):
+        values = [0, 1, 2.5, 3, 4, 5.5, 6, None]
+
+        assert flag.is_enabled_many(values) == [flag.is_enabled(value) for value in values]
+        assert flag.is_enabled_many(values[:-1]) == [flag.is_enabled(value) for value in values[:-1]]
+        assert flag.is_enabled_many([]) == []
+
+    def test_is_enabled_many_strings(self):
+        flag = Flag("region", ["BR", "US"], operation=FlagOperation.IN)
+        substring = Flag("prefix", "beta-users", operation=FlagOperation.IN)
+
+        assert flag.is_enabled_many(("BR", "JP", ["BR"])) == [True, False, False]
+        assert substring.is_enabled_many(["beta", "alpha"]) == [True, False]
+
+    def test_is_enabled_many_numpy(self):
+        numpy = importorskip("numpy")
+        column = numpy.array([0, 1, 2.5, 3, 4, 5.5])
+        flags = [
+            Flag("ge", 3, operation=FlagOperation.GE),
+            Flag("lt", 2.5, operation=FlagOperation.LT),
+            Flag("eq", 3, operation=FlagOperation.EQ),
+            Flag("in", [1, 5.5], operation=FlagOperation.IN),
+            Flag("ni", [1, 5.5], operation=FlagOperation.NI),
+            Flag("on", True),
+            Flag("strings", ["1"], operation=FlagOperation.IN),
+            Flag("custom", 2, operation=lambda a, b: a > b),
+            Flag("pct", 50, operation=FlagOperation.PCT),
+        ]
+
+        for flag in flags:
+            result = flag.is_enabled_many(column)
+            assert isinstance(result, (numpy.ndarray, list))
+            assert list(result) == [flag.is_enabled(value) for value in column.tolist()]
+        assert flags[0].is_enabled_many(column).dtype == bool
+
+    def test_percentage_rollout(self):
+        keys = [f"user-{i}" for i in range(10_000)]
+        five = Flag("new_checkout", 5, operation=FlagOperation.PCT)
+        ten = Flag("new_checkout", 10.0, operation=FlagOperation.PCT)
+
+        enabled_five = {key for key in keys if five.is_enabled(key)}
+        enabled_ten = {key for key in keys if ten.is_enabled(key)}
+
+        assert 400 < len(enabled_five) < 600
+        assert enabled_five < enabled_ten
+        assert five.salt == "new_checkout"
+        assert five.is_enabled(None) is False
+        assert Flag("all", 100, operation=FlagOperation.PCT).is_enabled() is True
+        assert not any(Flag("none", 0, operation=FlagOperation.PCT).is_enabled_many(keys))
+
+    def test_percentage_salt(self):
+        keys = [f"user-{i}" for i in range(1_000)]
+        salted = Flag("a", 50, operation=FlagOperation.PCT, salt="shared")
+        same = Flag("b", 50, operation=FlagOperation.PCT, salt="shared")
+        unsalted = Flag("a", 50, operation=FlagOperation.PCT)
+
+        assert salted.salt == "shared"
+        assert salted.is_enabled_many(keys) == same.is_enabled_many(keys)
+        assert salted.is_enabled_many(keys) != unsalted.is_enabled_many(keys)
+        assert Flag("n", 1).salt is None
+
+    def test_percentage_invalid(self):
+        for value in (-1, 101, "5", [5], None):
+            with raises(ValueError):
+                Flag("pct", value, operation=FlagOperation.PCT)
+        assert FlagOperation.from_string("pct") is FlagOperation.PCT
+        assert FlagOperation.PCT("user-1", 100, "pct") is True
+        assert FlagOperation.PCT("user-1", 0, "pct") is False
+        assert FlagOperation.PCT("user-1", 100) is True
+        assert FlagOperation.PCT("user-1", 0) is False
+
+    def test_percentage_operation_matches_flag(self):
+        flag = Flag("new_checkout", 30, operation=FlagOperation.PCT)
+        keys = [f"user-{i}" for i in range(1000)]
+
+        assert [FlagOperation.PCT(key, 30, "new_checkout") for key in keys] == flag.is_enabled_many(keys)
+        assert [FlagOperation.PCT(key, 30, "other") for key in keys] != flag.is_enabled_many(keys)
+
+    def test_percentage_json(self):
+        data = {
+            "flags": [
+                {"name": "a", "value": 5, "operation": "pct"},
+                {"name": "b", "value": 5, "operation": "pct", "salt": "a"},
+            ]
+        }
+
+        flags = Flag.from_json(data)
+        assert flags["b"].salt == "a"
+        assert flags["a"].is_enabled("user-7") is flags["b"].is_enabled("user-7")
+        assert Flag.to_json(flags) == data
+
+        data["flags"][1]["salt"] = "c"
+        reloaded = Flag.from_json(data, previous=flags)
+        assert reloaded["a"] is flags["a"]
+        assert reloaded["b"] is not flags["b"]
+        assert reloaded["b"].salt == "c"
+
+        with raises(ValueError):
+            Flag.from_json({"flags": [{"name": "bad", "value": 500, "operation": "pct"}]})
+
+    def test_from_stream(self):
+        chunks = [
+            b'{"flags": [{"name": "test", "description": "a test", ',
+            b'"value": "testflag", "operation": "eq"}, {"value": 1}]}',
+        ]
+
+        flags = Flag.from_stream(chunks)
+        assert list(flags) == ["test"]
+        assert flags["test"].description == "a test"
+        assert flags["test"].is_enabled("testflag") is True
+        assert flags["test"].is_enabled("different_test") is False
+        assert Flag.from_stream(chunks, previous=flags)["test"] is flags["test"]
+
+    def test_from_stream_invalid(self):
+        with raises(ValueError, match="No flags"):
+            Flag.from_stream([b'{"flags": {}}'])
+        with raises(ValueError, match="invalid operation"):
+            Flag.from_stream([b'{"flags": [{"name": "a", "value": 1, "operation": "xx"}]}'])
+        with raises(ValueError, match="Invalid JSON data"):
+            Flag.from_stream([b'{"flags": ["a"]}'])
+
+    def test_from_json_reuses_unchanged_flags(self):
+        json_data = {
+            "flags": [
+                {"name": "same", "value": ["BR", "PT"], "operation": "in"},
+                {"name": "value", "value": 1},
+                {"name": "type", "value": 1},
+                {"name": "description", "value": True, "description": "old"},
+                {"name": "operation", "value": 3, "operation": "ge"},
+                {"name": "removed", "value": True},
+            ]
+        }
+        previous = Flag.from_json(json_data)
+        json_data["flags"] = [
+            {"name": "same", "value": ["BR", "PT"], "operation": "in"},
+            {"name": "value", "value": 2},
+            {"name": "type", "value": True},
+            {"name": "description", "value": True, "description": "new"},
+            {"name": "operation", "value": 3, "operation": "gt"},
+            {"name": "added", "value": True},
+        ]
+
+        flags = Flag.from_json(json_data, previous=previous)
+
+        assert flags["same"] is previous["same"]
+        for name in ("value", "type", "description", "operation"):
+            assert flags[name] is not previous[name]
+        assert flags["type"].value is True
+        assert flags["operation"].is_enabled(3) is False
+
+        changes = FlagChanges.between(previous, flags)
+        assert changes.added == {"added"}
+        assert changes.changed == {"value", "type", "description", "operation"}
+        assert changes.removed == {"removed"}
+
+    def test_from_json_rebuilds_other_flag_classes(self):
+        class CustomFlag(Flag):
+            pass
+
+        json_data = {"flags": [{"name": "test", "value": True}]}
+        previous = {"test": CustomFlag("test", True)}
+
+        flags = Flag.from_json(json_data, previous=previous)
+        assert type(flags["test"]) is Flag
+
+
+class TestFlagChanges:
+    def test_between_identical(self):
+        flags = {"test": Flag("test", True)}
+
+        assert FlagChanges.between(flags, flags) == FlagChanges()
+        assert FlagChanges.between(flags, dict(flags)) == FlagChanges()
+
+    def test_between_rebuilt(self):
+        old = {"test": Flag("test", True)}
+        new = {"test": Flag("test", True)}
+
+        assert FlagChanges.between(old, new).changed == {"test"}
+        assert FlagChanges.between({}, new).added == {"test"}
+        assert FlagChanges.between(old, {}).removed == {"test"}
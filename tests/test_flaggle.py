@@ -7,7 +7,7 @@ from python_flaggle import Flag, Flaggle
 
 class TestFlaggle:
     def test_init(self):
-        with patch("python_flaggle.flaggle.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -28,6 +28,8 @@ class TestFlaggle:
                 "http://example.com/flags",
                 timeout=10,
                 verify=True,
+                headers={},
+                stream=False,
             )
             assert flaggle.flags == {"test_flag": Flag(name="test_flag", value=True)}
             assert flaggle.last_update is not None
@@ -44,13 +46,14 @@ class TestFlaggleComprehensive:
     def setup_method(self):
         self.default_flags = {"default_flag": Flag(name="default_flag", value=True)}
         self.url = "http://example.com/flags"
-        self.flaggle = Flaggle(
-            url=self.url,
-            interval=1,
-            default_flags=self.default_flags,
-            timeout=5,
-            verify_ssl=False,
-        )
+        with patch("requests.Session.get", side_effect=ConnectionError("offline")):
+            self.flaggle = Flaggle(
+                url=self.url,
+                interval=1,
+                default_flags=self.default_flags,
+                timeout=5,
+                verify_ssl=False,
+            )
 
     def test_properties(self):
         assert self.flaggle.flags == self.flaggle._flags
@@ -65,6 +68,8 @@ class TestFlaggleComprehensive:
             def raise_for_status(self):
                 pass
 
+            headers = {}
+
             def json(self):
                 return {"flags": [{"name": "flag1", "value": True}]}
 
@@ -76,7 +81,7 @@ class TestFlaggleComprehensive:
             def text(self):
                 return '{"flags": [{"name": "flag1", "value": true}]}'
 
-        monkeypatch.setattr("python_flaggle.flaggle.get", lambda *a, **k: MockResponse())
+        monkeypatch.setattr("requests.Session.get", lambda *a, **k: MockResponse())
         flags = self.flaggle._fetch_flags()
         assert "flag1" in flags
 
@@ -86,7 +91,7 @@ class TestFlaggleComprehensive:
 
             raise RequestException("fail")
 
-        monkeypatch.setattr("python_flaggle.flaggle.get", raise_exc)
+        monkeypatch.setattr("requests.Session.get", raise_exc)
         assert self.flaggle._fetch_flags() == {}
 
     def test_fetch_flags_key_error(self, monkeypatch):
@@ -105,7 +110,7 @@ class TestFlaggleComprehensive:
             def text(self):
                 return "{}"
 
-        monkeypatch.setattr("python_flaggle.flaggle.get", lambda *a, **k: MockResponse())
+        monkeypatch.setattr("requests.Session.get", lambda *a, **k: MockResponse())
         assert self.flaggle._fetch_flags() == {}
 
     def test_update_with_data(self, monkeypatch):
@@ -127,7 +132,8 @@ class TestFlaggleComprehensive:
         assert self.flaggle._flags == old_flags
 
     def test_schedule_update_starts_thread(self):
-        f = Flaggle(self.url, interval=1, default_flags=self.default_flags)
+        with patch("requests.Session.get", side_effect=ConnectionError("offline")):
+            f = Flaggle(self.url, interval=1, default_flags=self.default_flags)
         assert hasattr(f, "_scheduler_thread")
         assert isinstance(f._scheduler_thread, threading.Thread)
         assert f._scheduler_thread.daemon
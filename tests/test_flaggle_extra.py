@@ -1,16 +1,35 @@
+import json
 import logging
+import os
+import queue
 import threading
+import time
 import types
+from http.server import BaseHTTPRequestHandler
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from python_flaggle import Flag, Flaggle
+from python_flaggle import (
+    Flag,
+    FlagChanges,
+    Flaggle,
+    FlaggleMetrics,
+    MemorySource,
+    RefreshScheduler,
+    RetryPolicy,
+    create_session,
+    render_prometheus,
+)
+from python_flaggle.shared import FlagImageReader, FlagImageWriter
+from tests.helpers import serve, wait_for
 
 
 def test_flaggle_init_sets_last_update_and_flags(monkeypatch):
     # Patch get to return a valid response
     class MockResponse:
+        headers = {}
+
         def raise_for_status(self):
             pass
 
@@ -25,7 +44,7 @@ def test_flaggle_init_sets_last_update_and_flags(monkeypatch):
         def text(self):
             return '{"flags": [{"name": "flag", "value": true}]}'
 
-    monkeypatch.setattr("python_flaggle.flaggle.get", lambda *a, **k: MockResponse())
+    monkeypatch.setattr("requests.Session.get", lambda *a, **k: MockResponse())
     f = Flaggle("http://x", interval=1, default_flags={"f": Flag("f", True)})
     assert isinstance(f.last_update, type(f._last_update))
     assert isinstance(f.flags, dict)
@@ -33,7 +52,7 @@ def test_flaggle_init_sets_last_update_and_flags(monkeypatch):
 
 def test_flaggle_update_uses_default_flags_on_empty(monkeypatch):
     monkeypatch.setattr(
-        "python_flaggle.flaggle.get",
+        "requests.Session.get",
         lambda *a, **k: MagicMock(
             json=lambda: {"flags": []},
             raise_for_status=lambda: None,
@@ -51,7 +70,7 @@ def test_flaggle_update_uses_default_flags_on_empty(monkeypatch):
 
 def test_flaggle_schedule_update_starts_thread(monkeypatch):
     monkeypatch.setattr(
-        "python_flaggle.flaggle.get",
+        "requests.Session.get",
         lambda *a, **k: MagicMock(
             json=lambda: {"flags": []},
             raise_for_status=lambda: None,
@@ -67,7 +86,7 @@ def test_flaggle_schedule_update_starts_thread(monkeypatch):
 
 def test_flaggle_recurring_update_calls(monkeypatch):
     monkeypatch.setattr(
-        "python_flaggle.flaggle.get",
+        "requests.Session.get",
         lambda *a, **k: MagicMock(
             json=lambda: {"flags": []},
             raise_for_status=lambda: None,
@@ -90,14 +109,14 @@ def test_flaggle_fetch_flags_handles_request_exception(monkeypatch):
 
         raise RequestException("fail")
 
-    monkeypatch.setattr("python_flaggle.flaggle.get", raise_exc)
+    monkeypatch.setattr("requests.Session.get", raise_exc)
     f = Flaggle("http://x", interval=1, default_flags={"f": Flag("f", True)})
     assert f._fetch_flags() == {}
 
 
 def test_flaggle_properties(monkeypatch):
     monkeypatch.setattr(
-        "python_flaggle.flaggle.get",
+        "requests.Session.get",
         lambda *a, **k: MagicMock(
             json=lambda: {"flags": []},
             raise_for_status=lambda: None,
@@ -129,7 +148,7 @@ def test_flaggle_fetch_flags_unexpected_exception(monkeypatch, caplog):
     def raise_exc(*a, **k):
         raise RuntimeError("unexpected")
 
-    monkeypatch.setattr("python_flaggle.flaggle.get", raise_exc)
+    monkeypatch.setattr("requests.Session.get", raise_exc)
     f = DummyFlaggle("http://x", interval=1, default_flags={"f": Flag("f", True)})
     with caplog.at_level(logging.CRITICAL):
         result = f._fetch_flags()
@@ -141,6 +160,7 @@ def test_flaggle_fetch_flags_unexpected_exception(monkeypatch, caplog):
 
 def test_flaggle_update_handles_exception(monkeypatch, caplog):
     """Test that _update logs critical on unexpected exception."""
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
 
     class DummyFlaggle(Flaggle):
         pass
@@ -160,6 +180,7 @@ def test_flaggle_update_handles_exception(monkeypatch, caplog):
 
 def test_flaggle_recurring_update_reschedule_exception(monkeypatch, caplog):
     """Test that recurring_update logs critical if rescheduling fails."""
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
     f = Flaggle("http://x", interval=1, default_flags={"f": Flag("f", True)})
 
     def raise_enter(*a, **k):
@@ -175,6 +196,7 @@ def test_flaggle_recurring_update_reschedule_exception(monkeypatch, caplog):
 
 def test_flaggle_recurring_update_update_exception(monkeypatch, caplog):
     """Test that recurring_update logs error if _update fails."""
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
     f = Flaggle("http://x", interval=1, default_flags={"f": Flag("f", True)})
 
     def raise_update():
@@ -188,3 +210,789 @@ def test_flaggle_recurring_update_update_exception(monkeypatch, caplog):
         assert any(
             "Error during recurring flag update" in r.message for r in caplog.records
         )
+
+
+class ConditionalServer:
+    """Fake ``get`` that answers 304 when the request carries the current ETag."""
+
+    def __init__(self, etag="v1", last_modified="Wed, 21 Oct 2015 07:28:00 GMT"):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+        self.payload = {"flags": [{"name": "flag", "value": True}]}
+
+    def __call__(self, url, **kwargs):
+        headers = kwargs.get("headers", {})
+        self.requests.append(headers)
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return MagicMock(status_code=304, headers={})
+        return MagicMock(
+            status_code=200,
+            json=MagicMock(return_value=self.payload),
+            raise_for_status=lambda: None,
+            headers={"ETag": self.etag, "Last-Modified": self.last_modified} if self.etag else {},
+        )
+
+
+def test_flaggle_sends_conditional_headers(monkeypatch):
+    server = ConditionalServer()
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+
+    f._update()
+
+    assert server.requests[0] == {}
+    assert server.requests[1] == {
+        "If-None-Match": "v1",
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+
+
+def test_flaggle_not_modified_skips_parsing(monkeypatch):
+    server = ConditionalServer()
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+    flags = f.flags
+    previous_update = f.last_update
+
+    with patch("python_flaggle.flaggle.Flag.from_json") as mock_from_json:
+        f._update()
+        mock_from_json.assert_not_called()
+
+    assert f.flags is flags
+    assert f.last_update > previous_update
+    assert f.full_fetch_count == 1
+    assert f.not_modified_count == 1
+
+
+def test_flaggle_refetches_after_change(monkeypatch):
+    server = ConditionalServer()
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+
+    server.etag = "v2"
+    server.payload = {"flags": [{"name": "flag", "value": False}]}
+    f._update()
+
+    assert f.flags["flag"].is_enabled() is False
+    assert f.source.etag == "v2"
+    assert f.full_fetch_count == 2
+    assert f.not_modified_count == 0
+
+
+def test_flaggle_clears_missing_validators(monkeypatch):
+    server = ConditionalServer()
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+
+    server.etag = None
+    server.last_modified = None
+    f._update()
+    f._update()
+
+    assert server.requests[-1] == {}
+    assert f.full_fetch_count == 3
+
+
+class FlagsHandler(BaseHTTPRequestHandler):
+    """Serves a fixed flags document over keep-alive HTTP/1.1 connections."""
+
+    protocol_version = "HTTP/1.1"
+    body = b'{"flags": [{"name": "flag", "value": true}]}'
+    client_ports = []
+    etag = None
+
+    def do_GET(self):
+        self.client_ports.append(self.client_address[1])
+        if self.etag and self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.etag:
+            self.send_header("ETag", self.etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flags_server():
+    FlagsHandler.client_ports = []
+    FlagsHandler.etag = None
+    with serve(FlagsHandler) as url:
+        yield url + "/flags"
+
+
+def test_flaggle_reuses_connection_across_updates(flags_server):
+    f = Flaggle(flags_server, interval=60)
+    f._update()
+    f._update()
+
+    assert f.full_fetch_count == 3
+    assert len(FlagsHandler.client_ports) == 3
+    assert len(set(FlagsHandler.client_ports)) == 1
+
+
+def test_flaggle_streaming_reuses_connection_after_not_modified(flags_server):
+    FlagsHandler.etag = '"v1"'
+    f = Flaggle(flags_server, interval=60, streaming=True)
+    for _ in range(5):
+        f._update()
+
+    assert f.full_fetch_count == 1
+    assert f.not_modified_count == 5
+    assert len(set(FlagsHandler.client_ports)) == 1
+
+
+def test_flaggle_instances_share_injected_session(flags_server):
+    session = create_session(pool_size=2)
+    first = Flaggle(flags_server, interval=60, session=session)
+    second = Flaggle(flags_server + "?tenant=2", interval=60, session=session)
+
+    assert first.session is second.session is session
+    assert first.flags["flag"].is_enabled() is True
+    assert second.flags["flag"].is_enabled() is True
+    assert len(set(FlagsHandler.client_ports)) == 1
+
+
+def test_create_session_pool_size():
+    session = create_session(pool_size=3)
+
+    assert session.get_adapter("https://example.com")._pool_maxsize == 3
+    assert session.get_adapter("http://example.com")._pool_maxsize == 3
+    assert session.get_adapter("http://example.com")._pool_connections == 10
+    assert create_session(pool_hosts=2).get_adapter("https://example.com")._pool_connections == 2
+
+
+def test_flaggle_update_reports_changes(monkeypatch):
+    server = ConditionalServer()
+    server.payload = {
+        "flags": [
+            {"name": "kept", "value": ["BR", "PT"], "operation": "in"},
+            {"name": "flag", "value": True},
+        ]
+    }
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+    kept = f.flags["kept"]
+    assert f.last_changes.added == {"kept", "flag"}
+
+    server.etag = "v2"
+    server.payload = {
+        "flags": [
+            {"name": "kept", "value": ["BR", "PT"], "operation": "in"},
+            {"name": "new", "value": 1},
+        ]
+    }
+    changes = f._update()
+
+    assert f.flags["kept"] is kept
+    assert changes.added == {"new"}
+    assert changes.changed == frozenset()
+    assert changes.removed == {"flag"}
+    assert f.last_changes is changes
+
+    server.etag = "v2"
+    assert f._update() == FlagChanges()
+    assert f.last_changes == FlagChanges()
+
+
+def test_flaggle_snapshot_versions(monkeypatch):
+    server = ConditionalServer()
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60, default_flags={"f": Flag("f", True)})
+    first = f.snapshot()
+    assert first.version == 1
+    assert first.is_enabled("flag") is True
+    assert first.get("f") is None
+
+    f._update()
+    assert f.snapshot() is first
+
+    server.etag = "v2"
+    server.payload = {"flags": [{"name": "flag", "value": False}]}
+    f._update()
+    second = f.snapshot()
+
+    assert second.version == 2
+    assert second.is_enabled("flag") is False
+    assert first.is_enabled("flag") is True
+    assert second.is_enabled("missing") is False
+
+
+def test_flaggle_snapshot_is_immutable(monkeypatch):
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
+    f = Flaggle("http://x", interval=60)
+    snapshot = f.snapshot()
+
+    with pytest.raises(TypeError):
+        snapshot.flags["flag"] = Flag("flag", False)
+    with pytest.raises(AttributeError):
+        snapshot.version = 42
+    f.flags["flag"] = Flag("flag", False)
+    f.flags["other"] = Flag("other", True)
+    assert snapshot.is_enabled("flag") is True
+    assert snapshot.get("other") is None
+
+
+def test_flaggle_snapshot_reads_are_consistent(monkeypatch):
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
+    f = Flaggle("http://x", interval=60)
+    generation = {"value": 0}
+
+    def fetch():
+        generation["value"] += 1
+        return {
+            f"flag_{i}": Flag(f"flag_{i}", generation["value"]) for i in range(20)
+        }
+
+    f._fetch_flags = fetch
+    stop = threading.Event()
+    mixed = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = f.snapshot()
+            if len({flag.value for flag in snapshot.flags.values()}) != 1:
+                mixed.append(snapshot.version)
+
+    f._update()
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(200):
+        f._update()
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert mixed == []
+    assert f.snapshot().version == 202
+
+
+def test_flaggle_streaming_fetch(flags_server):
+    f = Flaggle(flags_server, interval=60, streaming=True)
+
+    assert f.streaming is True
+    assert f.flags["flag"].is_enabled() is True
+    assert f.full_fetch_count == 1
+
+
+def test_flaggle_fetch_decodes_body_once(monkeypatch):
+    response = MagicMock(status_code=200, headers={}, raise_for_status=lambda: None)
+    response.json.return_value = {"flags": [{"name": "flag", "value": True}]}
+    monkeypatch.setattr("requests.Session.get", lambda *a, **k: response)
+
+    Flaggle("http://x", interval=60)
+
+    response.json.assert_called_once_with()
+
+
+def test_flaggle_evaluate_batch(monkeypatch):
+    server = ConditionalServer()
+    server.payload = {
+        "flags": [
+            {"name": "min_score", "value": 0.5, "operation": "ge"},
+            {"name": "allowed", "value": [2, 3], "operation": "in"},
+        ]
+    }
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+
+    matrix = f.evaluate_batch(["min_score", "allowed", "missing"], [0.1, 2, 3])
+
+    assert matrix == [[False, True, True], [False, True, True], [False, False, False]]
+
+    rows = f.evaluate_batch(["missing", "other"], [1, 2])
+    rows[0][0] = True
+    assert rows[1] == [False, False]
+
+
+def test_flaggle_evaluate_batch_numpy(monkeypatch):
+    numpy = pytest.importorskip("numpy")
+    server = ConditionalServer()
+    server.payload = {"flags": [{"name": "min_score", "value": 0.5, "operation": "ge"}]}
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60)
+
+    matrix = f.evaluate_batch(["min_score", "missing"], numpy.array([0.1, 0.5, 0.9]))
+
+    assert matrix.dtype == bool
+    assert matrix.tolist() == [[False, True, True], [False, False, False]]
+
+
+def test_flaggle_eval_cache_invalidates_changed_flags(monkeypatch):
+    server = ConditionalServer()
+    server.payload = {
+        "flags": [
+            {"name": "env", "value": "production", "operation": "eq"},
+            {"name": "min", "value": 3, "operation": "ge"},
+        ]
+    }
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=60, eval_cache_size=16)
+
+    assert f.is_enabled("env", "production") is True
+    assert f.is_enabled("env", "production") is True
+    assert f.is_enabled("min", 5) is True
+    assert f.is_enabled("missing") is False
+    assert f.eval_cache_stats.hits == 1
+    assert f.eval_cache_stats.size == 2
+
+    server.etag = "v2"
+    server.payload = {
+        "flags": [
+            {"name": "env", "value": "production", "operation": "eq"},
+            {"name": "min", "value": 10, "operation": "ge"},
+        ]
+    }
+    f._update()
+
+    assert f.eval_cache_stats.invalidations == 1
+    assert f.eval_cache_stats.size == 1
+    assert f.is_enabled("min", 5) is False
+    assert f.is_enabled("env", "production") is True
+    assert f.eval_cache_stats.hits == 2
+
+
+def test_flaggle_without_eval_cache(monkeypatch):
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
+    f = Flaggle("http://x", interval=60)
+
+    assert f.eval_cache_stats is None
+    assert f.is_enabled("flag") is True
+    assert f.is_enabled("missing") is False
+
+
+class OutageHandler(BaseHTTPRequestHandler):
+    """Serves flags, or 503 while ``available`` is False, counting requests."""
+
+    available = True
+    request_times = []
+
+    def do_GET(self):
+        self.request_times.append(time.monotonic())
+        body = FlagsHandler.body if self.available else b"unavailable"
+        self.send_response(200 if self.available else 503)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def outage_server():
+    OutageHandler.available = True
+    OutageHandler.request_times = []
+    with serve(OutageHandler) as url:
+        yield url + "/flags"
+
+
+def test_flaggle_backs_off_during_outage(outage_server, caplog):
+    caplog.set_level(logging.CRITICAL)
+    OutageHandler.available = False
+    policy = RetryPolicy(max_delay=0.2, failure_threshold=3, reset_timeout=0.5, start_jitter=0)
+    f = Flaggle(outage_server, interval=0.02, retry=policy)
+    time.sleep(1.5)
+    f.close()
+    with_breaker = len(OutageHandler.request_times)
+
+    OutageHandler.request_times = []
+    fixed = Flaggle(outage_server, interval=0.02, retry=None)
+    time.sleep(1.5)
+    fixed.close()
+    without_breaker = len(OutageHandler.request_times)
+
+    # 3 failures open the circuit, then one trial request per 0.5 s cool-down.
+    assert with_breaker <= 8
+    assert without_breaker > 3 * with_breaker
+    assert f.circuit_state in ("open", "half-open")
+    assert f.consecutive_failures >= 3
+    assert fixed.circuit_state == "closed"
+
+
+def test_flaggle_recovers_after_outage(outage_server, caplog):
+    caplog.set_level(logging.CRITICAL)
+    OutageHandler.available = False
+    policy = RetryPolicy(max_delay=0.05, failure_threshold=2, reset_timeout=0.2, start_jitter=0)
+    f = Flaggle(outage_server, interval=0.02, retry=policy)
+    wait_for(lambda: f.circuit_state != "closed")
+    assert f.flags == {}
+
+    OutageHandler.available = True
+    wait_for(lambda: f.flags)
+    f.close()
+
+    assert f.flags["flag"].is_enabled() is True
+    assert f.circuit_state == "closed"
+    assert f.consecutive_failures == 0
+
+
+def test_flaggle_poll_delays(monkeypatch):
+    monkeypatch.setattr("requests.Session.get", ConditionalServer())
+    f = Flaggle("http://x", interval=10, retry=RetryPolicy(max_delay=25, start_jitter=0.5))
+    f._random.random = lambda: 1.0
+
+    assert f.retry.max_delay == 25
+    assert f._first_delay() == 5
+    assert f._next_delay() == 10
+    f._breaker.failures = 1
+    assert f._next_delay() == 20
+    f._breaker.failures = 5
+    assert f._next_delay() == 25
+    f._random.random = lambda: 0.0
+    assert f._next_delay() == 10
+
+    hourly = Flaggle("http://x", interval=3600, retry=RetryPolicy(max_delay=300))
+    for failures in (1, 5):
+        hourly._breaker.failures = failures
+        assert hourly._next_delay() == 3600
+
+    fixed = Flaggle("http://x", interval=10, retry=None)
+    fixed._breaker.failures = 5
+    assert fixed._first_delay() == 10
+    assert fixed._next_delay() == 10
+
+
+class PushHandler(BaseHTTPRequestHandler):
+    """Serves flags at ``/flags`` and streams queued events, chunked, at ``/events``."""
+
+    protocol_version = "HTTP/1.1"
+    events = None
+    streaming = True
+    polls = []
+
+    def do_GET(self):
+        if self.path != "/events":
+            self.polls.append(time.monotonic())
+            body = FlagsHandler.body
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if not self.streaming:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        while True:
+            chunk = self.events.get()
+            if chunk is None:
+                self.wfile.write(b"0\r\n\r\n")
+                self.close_connection = True
+                return
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def push_server():
+    PushHandler.events = queue.Queue()
+    PushHandler.streaming = True
+    PushHandler.polls = []
+    with serve(PushHandler) as url:
+        yield url
+        PushHandler.events.put(None)
+
+
+def push_event(value):
+    document = json.dumps({"flags": [{"name": "flag", "value": value}]})
+    PushHandler.events.put(f"event: flags\ndata: {document}\n\n".encode())
+
+
+def test_flaggle_applies_pushed_flags(push_server):
+    f = Flaggle(push_server + "/flags", interval=60, push_url=push_server + "/events")
+    assert f.push_url == push_server + "/events"
+    assert wait_for(lambda: f.push_connected)
+
+    sent = time.monotonic()
+    push_event(False)
+    assert wait_for(lambda: f.flags["flag"].is_enabled() is False)
+    latency = time.monotonic() - sent
+    f.close()
+
+    assert latency < 0.5
+    assert f.snapshot().version == 2
+    assert f.last_changes.changed == {"flag"}
+
+
+def test_flaggle_pushes_without_url(push_server):
+    source = MemorySource({"flags": [{"name": "flag", "value": True}]})
+    with Flaggle(source=source, interval=60, push_url=push_server + "/events") as f:
+        assert f.session is not None
+        assert wait_for(lambda: f.push_connected)
+        push_event(False)
+        assert wait_for(lambda: f.flags["flag"].is_enabled() is False)
+    assert not f.session.adapters["http://"].poolmanager.pools
+
+
+def test_flaggle_polls_only_while_push_is_disconnected(push_server, caplog):
+    caplog.set_level(logging.CRITICAL)
+    policy = RetryPolicy(max_delay=60, start_jitter=0)
+    f = Flaggle(push_server + "/flags", interval=0.05, push_url=push_server + "/events", retry=policy)
+    assert wait_for(lambda: f.push_connected)
+    time.sleep(0.2)
+    polls_while_connected = len(PushHandler.polls)
+
+    PushHandler.streaming = False
+    PushHandler.events.put(None)
+    assert wait_for(lambda: not f.push_connected)
+    assert wait_for(lambda: len(PushHandler.polls) >= polls_while_connected + 3)
+    f.close()
+
+    # Only the initial fetch happens while the stream is up.
+    assert polls_while_connected == 1
+
+
+def test_flaggle_starts_from_disk_cache(flags_server, tmp_path, caplog):
+    caplog.set_level(logging.CRITICAL)
+    cache = str(tmp_path / "flags.cache")
+    first = Flaggle(flags_server, interval=60, cache_path=cache)
+    first.close()
+    assert first.cache_path == cache
+    assert FlagImageReader(cache).read()["flag"].is_enabled() is True
+
+    # The server is unreachable, but the cache still provides the flags.
+    offline = Flaggle("http://127.0.0.1:9/flags", interval=60, timeout=1, cache_path=cache)
+    offline.close()
+    assert offline.full_fetch_count == 0
+    assert offline.flags["flag"].is_enabled() is True
+    assert offline.snapshot().is_enabled("flag") is True
+
+
+def test_flaggle_refreshes_cached_flags_in_background(flags_server, tmp_path):
+    cache = str(tmp_path / "flags.cache")
+    FlagImageWriter(cache).write(Flag.from_json({"flags": [{"name": "flag", "value": False}, {"name": "old", "value": True}]}))
+
+    f = Flaggle(flags_server, interval=60, cache_path=cache)
+    assert f.flags["flag"].is_enabled() is False
+    assert wait_for(lambda: set(FlagImageReader(cache).read()) == {"flag"})
+    f.close()
+
+    assert f.full_fetch_count == 1
+    assert f.flags["flag"].is_enabled() is True
+    assert f.last_changes.removed == {"old"}
+
+
+def test_flaggle_ignores_invalid_disk_cache(flags_server, tmp_path, caplog):
+    cache = tmp_path / "flags.cache"
+    cache.write_bytes(b"garbage")
+
+    f = Flaggle(flags_server, interval=60, cache_path=str(cache))
+    f.close()
+
+    assert f.full_fetch_count == 1
+    assert f.flags["flag"].is_enabled() is True
+    assert "Ignoring unreadable flag cache" in caplog.text
+    assert FlagImageReader(str(cache)).read()["flag"].is_enabled() is True
+
+
+class SlowHandler(FlagsHandler):
+    """Serves the flags document after a delay."""
+
+    delay = 0.3
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        super().do_GET()
+
+
+@pytest.fixture
+def slow_server():
+    with serve(SlowHandler) as url:
+        yield url + "/flags"
+
+
+def test_flaggle_non_blocking_start(slow_server):
+    defaults = {"flag": Flag("flag", False)}
+    start = time.monotonic()
+    f = Flaggle(slow_server, interval=60, default_flags=defaults, blocking=False)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < SlowHandler.delay
+    assert f.ready is False
+    assert f.flags["flag"].is_enabled() is False
+    assert f.wait_ready(timeout=5) is True
+    f.close()
+    assert f.ready is True
+    assert f.flags["flag"].is_enabled() is True
+    assert f.full_fetch_count == 1
+
+
+def test_flaggle_wait_ready_times_out(caplog):
+    caplog.set_level(logging.CRITICAL)
+    f = Flaggle("http://127.0.0.1:9/flags", interval=60, timeout=1, blocking=False, retry=None)
+    assert f.wait_ready(timeout=0.2) is False
+    f.close()
+    assert f.flags == {}
+
+
+def test_flaggle_blocking_start_is_ready(flags_server):
+    f = Flaggle(flags_server, interval=60)
+    f.close()
+    assert f.ready is True
+    assert f.wait_ready(timeout=0) is True
+
+
+def test_flaggles_share_a_scheduler(monkeypatch):
+    server = ConditionalServer()
+    fetched = []
+
+    def get(session, url, **kwargs):
+        fetched.append(url)
+        return server(url, **kwargs)
+
+    monkeypatch.setattr("requests.Session.get", get)
+    scheduler = RefreshScheduler(workers=2)
+    before = threading.active_count()
+
+    clients = [Flaggle("http://shared", interval=0.02, scheduler=scheduler) for _ in range(200)]
+    assert wait_for(lambda: fetched.count("http://shared") >= 3 * len(clients))
+
+    assert threading.active_count() - before <= 2
+    assert len(scheduler) == 200
+    for client in clients:
+        client.close()
+    assert len(scheduler) == 0
+    time.sleep(0.05)
+    requests_after_close = fetched.count("http://shared")
+    time.sleep(0.1)
+    assert fetched.count("http://shared") == requests_after_close
+    scheduler.close(timeout=1)
+
+
+def test_flaggle_close_cancels_dedicated_poll(monkeypatch):
+    server = ConditionalServer()
+    monkeypatch.setattr("requests.Session.get", server)
+    f = Flaggle("http://x", interval=0.02, retry=None)
+    assert wait_for(lambda: len(server.requests) >= 3)
+    f.close()
+    f._scheduler_thread.join(timeout=1)
+
+    assert not f._scheduler_thread.is_alive()
+    assert f.flags["flag"].is_enabled() is True
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_flaggle_close_releases_threads_and_fds(monkeypatch):
+    response = MagicMock(
+        status_code=200,
+        json=MagicMock(return_value={"flags": [{"name": "flag", "value": True}]}),
+        raise_for_status=lambda: None,
+        headers={},
+    )
+    monkeypatch.setattr("requests.Session.get", lambda *a, **k: response)
+    threads, fds = threading.active_count(), open_fds()
+
+    for _ in range(10_000):
+        with Flaggle("http://x", interval=60) as f:
+            assert f.flags["flag"].is_enabled() is True
+
+    # Leaking would leave one thread per instance; allow for other tests' stragglers.
+    assert wait_for(lambda: threading.active_count() <= threads + 5)
+    assert open_fds() <= fds + 5
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_flaggle_close_releases_connections(flags_server):
+    warm = Flaggle(flags_server, interval=60)
+    warm.close()
+    threads, fds = threading.active_count(), open_fds()
+
+    clients = [Flaggle(flags_server, interval=60) for _ in range(100)]
+    for client in clients:
+        client.close()
+
+    # Each close drops the keep-alive connection, so the server's handler threads exit too.
+    # Leaking would leave 100 threads and 200 sockets; allow for other tests' stragglers.
+    assert wait_for(lambda: threading.active_count() <= threads + 5 and open_fds() <= fds + 5)
+
+
+def test_flaggle_close_keeps_injected_session(flags_server):
+    session = create_session()
+    with Flaggle(flags_server, interval=60, session=session):
+        pass
+    assert Flaggle(flags_server, interval=60, session=session).flags["flag"].is_enabled() is True
+    session.close()
+
+
+def test_flaggle_close_is_prompt_and_idempotent(push_server):
+    f = Flaggle(push_server + "/flags", interval=3600, push_url=push_server + "/events")
+    assert wait_for(lambda: f.push_connected)
+
+    start = time.monotonic()
+    f.close()
+    f.close()
+    f._scheduler_thread.join(timeout=2)
+    f._push_thread.join(timeout=2)
+
+    assert time.monotonic() - start < 1
+    assert not f._scheduler_thread.is_alive()
+    assert not f._push_thread.is_alive()
+    assert not f.push_connected
+    assert f.flags["flag"].is_enabled() is True
+
+
+def test_flaggle_records_metrics(flags_server):
+    snapshots = []
+    metrics = FlaggleMetrics(sink=snapshots.append)
+    f = Flaggle(flags_server, interval=0.05, metrics=metrics, retry=None)
+    assert f.metrics is metrics
+    for _ in range(3):
+        f.is_enabled("flag")
+    f.is_enabled("missing")
+    f.evaluate_batch(["flag"], [1, 2])
+    assert wait_for(lambda: snapshots)
+    f.close()
+
+    snapshot = metrics.snapshot()
+    assert snapshot.evaluations == {"flag": 5, "missing": 1}
+    assert snapshot.fetch_seconds.count >= 2
+    assert snapshot.parse_seconds.count == snapshot.payload_bytes.count >= 1
+    assert snapshot.payload_bytes.sum == len(FlagsHandler.body) * snapshot.payload_bytes.count
+    assert 0 <= snapshot.staleness_seconds < 5
+    assert snapshot.failures == 0
+    assert "flaggle_evaluations_total{flag=\"flag\"} 5" in render_prometheus(snapshot)
+
+
+def test_flaggle_records_streamed_payload_size(flags_server):
+    metrics = FlaggleMetrics()
+    with Flaggle(flags_server, interval=3600, metrics=metrics, streaming=True):
+        pass
+
+    snapshot = metrics.payload_bytes.snapshot()
+    assert snapshot.count == 1
+    assert 0 < snapshot.sum <= len(FlagsHandler.body)
+
+
+def test_flaggle_metrics_count_failures(outage_server, caplog):
+    caplog.set_level(logging.CRITICAL)
+    OutageHandler.available = False
+    metrics = FlaggleMetrics()
+    f = Flaggle(outage_server, interval=60, metrics=metrics)
+    f.close()
+
+    snapshot = metrics.snapshot()
+    assert snapshot.failures == 1
+    assert snapshot.staleness_seconds is None
+    assert snapshot.fetch_seconds.count == 1
+    assert snapshot.parse_seconds.count == 0
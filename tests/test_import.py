@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("requests", "urllib3", "httpx", "asyncio", "sched", "numpy")
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Run ``code`` in a fresh interpreter with -X importtime; map module to cumulative microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def loaded_modules(code: str) -> set[str]:
+    """Run ``code`` in a fresh interpreter and return the modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"],
+        capture_output=True, text=True, check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_import_does_not_load_http_stack():
+    times = import_times(
+        "import python_flaggle; python_flaggle.Flag.from_json({'flags': [{'name': 'a', 'value': True}]})"
+    )
+
+    assert "python_flaggle" in times
+    assert not set(HEAVY) & set(times), (
+        f"import python_flaggle took {times['python_flaggle'] / 1000:.1f} ms and loaded {sorted(set(HEAVY) & set(times))}"
+    )
+
+
+@pytest.mark.parametrize(
+    "name, loaded",
+    [
+        ("FlagSnapshot", "python_flaggle.snapshot"),
+        ("RetryPolicy", "python_flaggle.backoff"),
+        ("FlaggleMetrics", "python_flaggle.metrics"),
+        ("RefreshScheduler", "python_flaggle.scheduler"),
+    ],
+)
+def test_lazy_exports_load_only_their_module(name, loaded):
+    modules = loaded_modules(f"from python_flaggle import {name}")
+
+    assert loaded in modules
+    assert "requests" not in modules
+
+
+def test_flaggle_loads_requests_on_first_session():
+    modules = loaded_modules("from python_flaggle import Flaggle")
+    assert "python_flaggle.flaggle" in modules
+    assert "requests" not in modules
+
+    modules = loaded_modules("from python_flaggle import create_session; create_session()")
+    assert "requests" in modules
+
+
+def test_lazy_exports():
+    import python_flaggle
+    from python_flaggle.flaggle import Flaggle
+
+    assert python_flaggle.Flaggle is Flaggle
+    assert set(python_flaggle.__all__) <= set(dir(python_flaggle))
+    with pytest.raises(AttributeError):
+        python_flaggle.Missing
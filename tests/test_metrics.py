@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from python_flaggle.metrics import FlaggleMetrics, Histogram, render_prometheus
+
+
+def test_histogram_buckets():
+    histogram = Histogram([0.1, 1, 0.5])
+    for value in (0.05, 0.1, 0.3, 0.9, 7):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+
+    assert snapshot.bounds == (0.1, 0.5, 1)
+    assert snapshot.counts == (2, 1, 1, 1)
+    assert snapshot.count == 5
+    assert snapshot.sum == pytest.approx(8.35)
+    with pytest.raises(ValueError):
+        Histogram([])
+
+
+def test_counts_are_summed_across_thread_shards():
+    metrics = FlaggleMetrics()
+
+    def evaluate():
+        for _ in range(1000):
+            metrics.count("a")
+        metrics.count("b", 5)
+
+    threads = [threading.Thread(target=evaluate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.evaluations() == {"a": 8000, "b": 40}
+
+
+def test_shards_of_exited_threads_are_folded():
+    metrics = FlaggleMetrics()
+    metrics.count("a")
+    for _ in range(1000):
+        thread = threading.Thread(target=metrics.count, args=("a",))
+        thread.start()
+        thread.join()
+
+    assert metrics.evaluations() == {"a": 1001}
+    assert len(metrics._shards) <= 2
+
+
+def test_snapshot_and_sink(caplog):
+    received = []
+    metrics = FlaggleMetrics(sink=received.append)
+    assert metrics.snapshot().staleness_seconds is None
+
+    metrics.record_failure()
+    metrics.record_update(0)
+    list(metrics.measure_size([b"ab", b"cde"]))
+    metrics.flush()
+
+    assert received[0].failures == 1
+    assert received[0].staleness_seconds > 0
+    assert received[0].payload_bytes.sum == 5
+
+    metrics.sink = lambda snapshot: 1 / 0
+    metrics.flush()
+    assert "Metrics sink failed" in caplog.text
+
+
+def test_measure_size_records_streamed_bytes():
+    metrics = FlaggleMetrics()
+    assert list(metrics.measure_size([b"ab", b"cde"])) == [b"ab", b"cde"]
+    assert metrics.payload_bytes.snapshot().sum == 5
+
+
+def test_measure_size_records_bytes_when_closed_early():
+    metrics = FlaggleMetrics()
+    chunks = metrics.measure_size([b"ab", b"cde", b"f"])
+    assert next(chunks) == b"ab"
+    chunks.close()
+
+    snapshot = metrics.payload_bytes.snapshot()
+    assert (snapshot.count, snapshot.sum) == (1, 2)
+
+
+def test_render_prometheus():
+    metrics = FlaggleMetrics(latency_buckets=[0.01, 0.1])
+    metrics.count('say "hi"')
+    metrics.count("beta", 2)
+    metrics.fetch_seconds.observe(0.05)
+    metrics.fetch_seconds.observe(0.5)
+    text = render_prometheus(metrics.snapshot())
+    lines = text.splitlines()
+
+    assert text.endswith("\n")
+    assert 'flaggle_evaluations_total{flag="beta"} 2' in lines
+    assert 'flaggle_evaluations_total{flag="say \\"hi\\""} 1' in lines
+    assert 'flaggle_fetch_duration_seconds_bucket{le="0.01"} 0' in lines
+    assert 'flaggle_fetch_duration_seconds_bucket{le="0.1"} 1' in lines
+    assert 'flaggle_fetch_duration_seconds_bucket{le="+Inf"} 2' in lines
+    assert "flaggle_fetch_duration_seconds_count 2" in lines
+    assert "flaggle_fetch_failures_total 0" in lines
+    assert not any(line.startswith("flaggle_staleness_seconds") for line in lines)
+    assert "# TYPE flaggle_payload_bytes histogram" in lines
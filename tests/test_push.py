@@ -0,0 +1,42 @@
+import pytest
+
+from python_flaggle.push import ServerSentEvent, iter_events
+
+STREAM = (
+    b": keep-alive\n"
+    b"retry: 2500\n"
+    b"\n"
+    b"id: 1\n"
+    b"event: flags\n"
+    b'data: {"flags": []}\n'
+    b"\n"
+    b"data: first\r\n"
+    b"data:second\r\n"
+    b"\r\n"
+    b"id: 2\rdata: caf\xc3\xa9\r\r"
+)
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(STREAM)])
+def test_iter_events_any_chunking(size):
+    events = list(iter_events(split(STREAM, size)))
+
+    assert events == [
+        ServerSentEvent("flags", '{"flags": []}', "1", 2500),
+        ServerSentEvent("message", "first\nsecond", "1", 2500),
+        ServerSentEvent("message", "café", "2", 2500),
+    ]
+
+
+def test_iter_events_ignores_unfinished_and_empty_events():
+    events = list(iter_events([b"event: ping\n\n", b"data: partial"]))
+    assert events == []
+
+
+def test_iter_events_ignores_invalid_fields():
+    stream = b"id: a\0b\nretry: soon\nunknown: x\ndata\n\n"
+    assert list(iter_events([stream])) == [ServerSentEvent("message", "", None, None)]
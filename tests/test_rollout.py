@@ -0,0 +1,60 @@
+from pytest import approx, importorskip
+
+from python_flaggle.rollout import BUCKETS, bucket, buckets, in_rollout, salt_seed, threshold
+
+KEYS = [f"user-{i}" for i in range(100_000)]
+
+
+def test_bucket_is_deterministic_and_in_range():
+    seed = salt_seed("new_checkout")
+
+    assert bucket("user-1", seed) == bucket("user-1", seed)
+    assert bucket(42, seed) == bucket("42", seed) == bucket(b"42", seed)
+    assert all(0 <= found < BUCKETS for found in buckets(KEYS[:1000], seed))
+
+
+def test_buckets_match_bucket():
+    seed = salt_seed("flag")
+    keys = KEYS[:1000] + [7, 3.5, b"raw", "日本"]
+
+    assert buckets(keys, seed) == [bucket(key, seed) for key in keys]
+
+
+def test_buckets_numpy():
+    numpy = importorskip("numpy")
+    seed = salt_seed("flag")
+    ids = numpy.arange(1000)
+    names = numpy.array(KEYS[:1000])
+
+    assert buckets(ids, seed).tolist() == [bucket(i, seed) for i in range(1000)]
+    assert buckets(names, seed).tolist() == buckets(KEYS[:1000], seed)
+
+
+def test_distribution_is_uniform():
+    counts = [0] * 100
+    for found in buckets(KEYS, salt_seed("uniformity")):
+        counts[found * 100 // BUCKETS] += 1
+
+    expected = len(KEYS) / len(counts)
+    chi_square = sum((count - expected) ** 2 / expected for count in counts)
+    # 99 degrees of freedom: the 99.9th percentile is about 148.2.
+    assert chi_square < 148.2
+
+
+def test_salts_select_independent_populations():
+    first = {key for key in KEYS if bucket(key, salt_seed("flag_a")) < BUCKETS // 10}
+    second = {key for key in KEYS if bucket(key, salt_seed("flag_b")) < BUCKETS // 10}
+
+    assert 9_000 < len(first) < 11_000
+    assert 9_000 < len(second) < 11_000
+    # Independent 10% populations overlap on about 1% of keys.
+    assert 800 < len(first & second) < 1_200
+
+
+def test_in_rollout():
+    seed = salt_seed("flag")
+
+    assert threshold(5) == 500 and threshold(100) == BUCKETS
+    assert sum(in_rollout(key, seed, threshold(10)) for key in KEYS) / len(KEYS) == approx(0.1, abs=0.01)
+    assert in_rollout(None, seed, threshold(100)) is True
+    assert in_rollout(None, seed, threshold(99.99)) is False
@@ -0,0 +1,138 @@
+from pytest import mark, raises
+
+from python_flaggle import Flag, FlagOperation, FlagSnapshot
+from python_flaggle.rules import RuleSet
+
+RULES = [
+    {
+        "all": [
+            {"attribute": "country", "operation": "in", "value": ["BR", "US"]},
+            {"attribute": "app_version", "operation": "ge", "value": 5},
+        ]
+    },
+    {
+        "any": [
+            {"attribute": "beta", "value": True},
+            {"attribute": "team", "operation": "in", "value": "platform-infra"},
+        ],
+        "enabled": True,
+    },
+    {"attribute": "plan", "value": "free", "enabled": False},
+    {"attribute": "user_id", "operation": "pct", "value": 50},
+]
+
+
+class TestRuleSet:
+    @mark.parametrize(
+        "context, expected",
+        [
+            ({"country": "BR", "app_version": 5}, True),
+            ({"country": "BR", "app_version": 4}, False),
+            ({"country": "FR", "app_version": 9}, False),
+            ({"beta": True}, True),
+            ({"beta": False}, False),
+            ({"team": "infra"}, True),
+            ({"plan": "free", "user_id": "user-1"}, False),
+            ({}, False),
+            ({"country": None, "app_version": 5}, False),
+        ],
+    )
+    def test_first_matching_rule_decides(self, context, expected):
+        rules = RuleSet(RULES[:3], salt="flag", default=False)
+
+        assert rules.evaluate(context) is expected
+
+    def test_default(self):
+        assert RuleSet(RULES, salt="flag", default=True).evaluate(None) is True
+        assert RuleSet([], salt="flag", default=True).evaluate({"beta": True}) is True
+
+    @mark.parametrize("context", ["user-1", 5, ["country"]])
+    def test_non_mapping_context(self, context):
+        with raises(TypeError, match="mapping context"):
+            RuleSet(RULES, salt="flag", default=False).evaluate(context)
+        with raises(TypeError, match="mapping context"):
+            Flag("new_checkout", False, rules=RULES).is_enabled(context)
+
+    def test_nested_groups(self):
+        rules = RuleSet(
+            [{"any": [{"all": [{"attribute": "a", "value": 1}, {"attribute": "b", "value": 2}]},
+                      {"attribute": "c", "operation": "ne", "value": None}]}],
+            salt="flag",
+            default=False,
+        )
+
+        assert rules.evaluate({"a": 1, "b": 2}) is True
+        assert rules.evaluate({"a": 1, "b": 3}) is False
+        assert rules.evaluate({"c": 0}) is True
+
+    def test_percentage_condition_uses_flag_salt(self):
+        rules = RuleSet([RULES[3]], salt="flag", default=False)
+        flag = Flag("flag", 50, operation=FlagOperation.PCT)
+
+        for user_id in range(200):
+            assert rules.evaluate({"user_id": user_id}) is flag.is_enabled(user_id)
+
+    @mark.parametrize(
+        "definitions",
+        [
+            {"attribute": "a"},
+            ["a"],
+            [{"all": []}],
+            [{"any": "a"}],
+            [{"operation": "eq", "value": 1}],
+            [{"attribute": "a", "operation": "between", "value": 1}],
+            [{"attribute": "a", "value": {"nested": 1}}],
+            [{"attribute": "a", "operation": "in", "value": None}],
+            [{"attribute": "a", "operation": "ni", "value": True}],
+            [{"attribute": "a", "operation": "in", "value": 5}],
+        ],
+    )
+    def test_invalid_rules(self, definitions):
+        with raises(ValueError):
+            RuleSet(definitions, salt="flag", default=False)
+
+
+class TestFlagRules:
+    def test_flag_with_rules(self):
+        flag = Flag("new_checkout", False, rules=RULES)
+
+        assert flag.rules is RULES
+        assert flag.salt == "new_checkout"
+        assert flag.is_enabled() is False
+        assert flag.is_enabled({"country": "US", "app_version": 7}) is True
+        assert flag.is_enabled_many([{"beta": True}, {"plan": "free"}]) == [True, False]
+        assert Flag("on", True, rules=[]).is_enabled({"beta": True}) is True
+
+    def test_rules_exclude_operation(self):
+        with raises(ValueError):
+            Flag("flag", 5, operation=FlagOperation.GE, rules=RULES)
+
+    def test_single_operation_flags_are_unchanged(self):
+        flag = Flag("min_version", 3, operation=FlagOperation.GE)
+
+        assert flag.rules is None
+        assert flag.is_enabled(4) is True
+        assert "rules" not in flag.to_dict()
+
+    def test_json_round_trip_and_reuse(self):
+        data = {"flags": [{"name": "flag", "value": False, "rules": RULES, "salt": "shared"}]}
+
+        flags = Flag.from_json(data)
+        assert flags["flag"].salt == "shared"
+        assert Flag.to_json(flags) == data
+        assert Flag.from_json(data, previous=flags)["flag"] is flags["flag"]
+
+        changed = {"flags": [{"name": "flag", "value": False, "rules": RULES[:1]}]}
+        assert Flag.from_json(changed, previous=flags)["flag"] is not flags["flag"]
+        plain = {"flags": [{"name": "flag", "value": False}]}
+        assert Flag.from_json(plain, previous=flags)["flag"].rules is None
+
+    def test_invalid_rules_in_json(self):
+        with raises(ValueError):
+            Flag.from_json({"flags": [{"name": "flag", "value": False, "rules": [{"all": []}]}]})
+
+    def test_snapshot_evaluates_context(self):
+        snapshot = FlagSnapshot.of({"flag": Flag("flag", False, rules=RULES)})
+
+        assert snapshot.is_enabled("flag", {"beta": True}) is True
+        assert snapshot.is_enabled("flag") is False
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from python_flaggle.scheduler import RefreshScheduler, shared_scheduler
+from tests.helpers import wait_for
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = RefreshScheduler(workers=2)
+    yield scheduler
+    scheduler.close(timeout=1)
+
+
+def test_runs_jobs_in_due_order(scheduler):
+    order = []
+    for name, delay in (("late", 0.15), ("early", 0.05), ("middle", 0.1)):
+        scheduler.register(lambda name=name: order.append(name), delay)
+
+    assert wait_for(lambda: len(order) == 3)
+    assert order == ["early", "middle", "late"]
+    # Callbacks returning None run once.
+    assert len(scheduler) == 0
+
+
+def test_reschedules_with_returned_delay(scheduler):
+    runs = []
+
+    def refresh():
+        runs.append(time.monotonic())
+        return 0.02 if len(runs) < 5 else None
+
+    scheduler.register(refresh, 0)
+    assert wait_for(lambda: len(runs) == 5)
+    time.sleep(0.05)
+
+    assert len(runs) == 5
+    assert all(later - earlier >= 0.02 for earlier, later in zip(runs, runs[1:]))
+
+
+def test_unregister_stops_job(scheduler):
+    runs = []
+    job = scheduler.register(lambda: runs.append(1) or 0.01, 0)
+    assert wait_for(lambda: len(runs) >= 2)
+    scheduler.unregister(job)
+    stopped_at = len(runs)
+    time.sleep(0.05)
+
+    assert job.cancelled
+    assert len(runs) <= stopped_at + 1
+    assert len(scheduler) == 0
+
+
+def test_survivors_keep_their_rate_after_unregister():
+    scheduler = RefreshScheduler(workers=1)
+    counts = [0] * 5
+    jobs = [scheduler.register(lambda i=i: counts.__setitem__(i, counts[i] + 1) or 0.3, 0.3) for i in range(5)]
+    time.sleep(0.05)
+    for job in jobs[:3]:
+        scheduler.unregister(job)
+    time.sleep(1.5)
+    cancelled = scheduler._cancelled
+    scheduler.close(timeout=1)
+
+    assert counts[:3] == [0, 0, 0]
+    assert all(4 <= count <= 5 for count in counts[3:])
+    assert cancelled == 0
+
+
+def test_many_jobs_share_the_worker_pool(scheduler):
+    counts = [0] * 500
+    lock = threading.Lock()
+
+    def refresh(i):
+        with lock:
+            counts[i] += 1
+        return 0.01
+
+    before = threading.active_count()
+    jobs = [scheduler.register(lambda i=i: refresh(i), 0) for i in range(500)]
+    assert wait_for(lambda: min(counts) >= 3)
+
+    assert scheduler.threads == 2
+    assert threading.active_count() - before <= 2
+    for job in jobs:
+        scheduler.unregister(job)
+    assert len(scheduler) == 0
+    assert len(scheduler._heap) < 500
+
+
+def test_failing_job_is_unregistered(scheduler, caplog):
+    def refresh():
+        raise RuntimeError("boom")
+
+    with caplog.at_level(logging.CRITICAL):
+        job = scheduler.register(refresh, 0)
+        assert wait_for(lambda: job.cancelled)
+    assert "failed and was unregistered" in caplog.text
+
+
+def test_close_stops_workers():
+    scheduler = RefreshScheduler(workers=3)
+    for _ in range(3):
+        scheduler.register(lambda: 0.01, 0)
+    threads = list(scheduler._threads)
+    scheduler.close(timeout=1)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(scheduler) == 0
+    with pytest.raises(RuntimeError):
+        scheduler.register(lambda: None, 0)
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        RefreshScheduler(workers=0)
+
+
+def test_shared_scheduler_is_reused_until_closed():
+    shared = shared_scheduler()
+    assert shared_scheduler() is shared
+    shared.close()
+    assert shared_scheduler() is not shared
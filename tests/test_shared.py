@@ -0,0 +1,164 @@
+import os
+import subprocess
+import sys
+from stat import S_ISDIR
+
+from pytest import raises
+
+from python_flaggle import Flag, FlagOperation, Flaggle
+from python_flaggle.shared import HEADER, MAGIC, FlagImageReader, FlagImageWriter, read_version
+
+FLAGS = {
+    "feature_a": Flag("feature_a", True, "Feature A"),
+    "region": Flag("region", ["BR", "日本"], operation=FlagOperation.IN),
+}
+
+
+class TestFlagImage:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "flags.img")
+        writer = FlagImageWriter(path)
+        reader = FlagImageReader(path)
+
+        assert writer.write(FLAGS) == 1
+        flags = reader.read()
+
+        assert reader.version == 1
+        assert flags == FLAGS
+        assert flags["feature_a"].description == "Feature A"
+        assert flags["region"].is_enabled("日本") is True
+        assert flags["region"].is_enabled("US") is False
+
+    def test_unchanged_image_is_not_decoded(self, tmp_path):
+        path = str(tmp_path / "flags.img")
+        writer = FlagImageWriter(path)
+        reader = FlagImageReader(path)
+        writer.write(FLAGS)
+        previous = reader.read()
+
+        assert reader.read(previous=previous) is None
+
+        writer.write(FLAGS)
+        flags = reader.read(previous=previous)
+        assert reader.version == 2
+        assert flags["region"] is previous["region"]
+
+    def test_same_version_rewritten_is_skipped(self, tmp_path):
+        path = str(tmp_path / "flags.img")
+        FlagImageWriter(path).write(FLAGS)
+        reader = FlagImageReader(path)
+        reader.read()
+        with open(path, "rb") as file:
+            image = file.read()
+        os.unlink(path)
+        with open(path, "wb") as file:
+            file.write(image)
+
+        assert reader.read() is None
+
+    def test_version_continues_after_writer_restart(self, tmp_path):
+        path = str(tmp_path / "flags.img")
+        FlagImageWriter(path).write(FLAGS)
+
+        writer = FlagImageWriter(path)
+        assert writer.version == 1
+        assert writer.write(FLAGS) == 2
+        assert read_version(path) == 2
+        assert read_version(str(tmp_path / "missing.img")) == 0
+
+    def test_writer_replaces_invalid_image(self, tmp_path):
+        path = tmp_path / "flags.img"
+        path.write_bytes(b"garbage")
+
+        writer = FlagImageWriter(str(path))
+        assert writer.version == 0
+        assert writer.write(FLAGS) == 1
+        assert os.listdir(tmp_path) == ["flags.img"]
+
+    def test_writer_syncs_image_and_directory(self, tmp_path, monkeypatch):
+        synced = []
+        fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: synced.append(S_ISDIR(os.fstat(fd).st_mode)) or fsync(fd))
+
+        FlagImageWriter(str(tmp_path / "flags.img")).write(FLAGS)
+        assert synced == [False, True]
+
+    def test_writer_rejects_unserialisable_flags(self, tmp_path):
+        path = tmp_path / "flags.img"
+        custom = {"custom": Flag("custom", 1, operation=lambda a, b: a == b)}
+
+        with raises(ValueError):
+            FlagImageWriter(str(path)).write(custom)
+        assert os.listdir(tmp_path) == []
+
+    def test_invalid_images(self, tmp_path):
+        path = tmp_path / "flags.img"
+        reader = FlagImageReader(str(path))
+
+        with raises(FileNotFoundError):
+            reader.read()
+        path.write_bytes(b"x" * HEADER.size)
+        with raises(ValueError, match="not a flag image"):
+            reader.read()
+        path.write_bytes(HEADER.pack(MAGIC, 1, 100) + b"{}")
+        with raises(ValueError, match="truncated"):
+            reader.read()
+        path.write_bytes(MAGIC)
+        with raises(ValueError, match="truncated"):
+            read_version(str(path))
+
+
+class TestFlaggleSharedImage:
+    def test_requires_url_or_image(self):
+        with raises(ValueError):
+            Flaggle()
+
+    def test_reader_loads_published_flags(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "flags.img")
+        FlagImageWriter(path).write(FLAGS)
+
+        f = Flaggle(shared_image=path, interval=60)
+        assert f.url is None
+        assert f.session is None
+        assert f.flags == FLAGS
+        assert f.full_fetch_count == 1
+
+        f._update()
+        assert f.not_modified_count == 1
+
+    def test_reader_keeps_flags_when_image_missing(self, tmp_path):
+        default = {"default": Flag("default", True)}
+
+        f = Flaggle(shared_image=str(tmp_path / "missing.img"), default_flags=default)
+        assert f.flags == default
+
+    def test_fetcher_publishes_to_worker_process(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "flags.img")
+        document = {"flags": [flag.to_dict() for flag in FLAGS.values()]}
+        response = type("Response", (), {
+            "status_code": 200,
+            "headers": {},
+            "raise_for_status": lambda self: None,
+            "json": lambda self: document,
+        })()
+        monkeypatch.setattr("requests.Session.get", lambda *a, **k: response)
+
+        fetcher = Flaggle("http://x", interval=60, publish_image=path)
+        assert read_version(path) == 1
+        fetcher._update()
+        assert read_version(path) == 1
+
+        worker = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from python_flaggle import Flaggle; "
+                "f = Flaggle(shared_image=sys.argv[1]); "
+                "print(f.flags['region'].is_enabled('BR'), f.full_fetch_count)",
+                path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert worker.stdout.split() == ["True", "1"]
@@ -0,0 +1,151 @@
+import json
+import os
+
+import pytest
+
+from python_flaggle import (
+    EnvSource,
+    FileSource,
+    Flag,
+    Flaggle,
+    FlagSource,
+    ImageSource,
+    MemorySource,
+    RefreshScheduler,
+)
+from python_flaggle.shared import FlagImageWriter
+from tests.helpers import document, wait_for
+
+
+ENV = {"name": "env", "value": "prod", "operation": "eq"}
+
+
+def write_json(path, data):
+    """Replace ``path`` atomically, as deployments should."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+def test_file_source_parses_only_when_the_file_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / "flags.json")
+    write_json(path, document(ENV, beta=True))
+    source = FileSource(path)
+
+    flags = source.fetch({})
+    assert flags["beta"].is_enabled() is True
+    assert flags["env"].is_enabled("prod") is True
+
+    parsed = []
+    from_stream = Flag.from_stream
+    monkeypatch.setattr(Flag, "from_stream", lambda *a, **k: parsed.append(1) or from_stream(*a, **k))
+    assert source.fetch(flags) is None
+    assert parsed == []
+
+    write_json(path, document(ENV, beta=False))
+    changed = source.fetch(flags)
+    assert changed["beta"].is_enabled() is False
+    assert changed["env"] is flags["env"]
+    assert parsed == [1]
+
+
+def test_file_source_errors(tmp_path):
+    with pytest.raises(OSError):
+        FileSource(str(tmp_path / "missing.json")).fetch({})
+    empty = tmp_path / "empty.json"
+    empty.write_text("")
+    with pytest.raises(ValueError):
+        FileSource(str(empty)).fetch({})
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("{not json")
+    with pytest.raises(ValueError):
+        FileSource(str(invalid)).fetch({})
+
+
+def test_memory_source_serves_each_document_once():
+    source = MemorySource()
+    with pytest.raises(ValueError):
+        source.fetch({})
+
+    source.set(document(ENV, beta=True))
+    flags = source.fetch({})
+    assert flags["beta"].is_enabled() is True
+    assert source.fetch(flags) is None
+
+    source.set(document(ENV, beta=False))
+    assert source.fetch(flags)["beta"].is_enabled() is False
+    assert source.version == 2
+
+
+def test_env_source():
+    environ = {}
+    source = EnvSource("FLAGS", environ)
+    with pytest.raises(ValueError):
+        source.fetch({})
+
+    environ["FLAGS"] = json.dumps(document(ENV, beta=True))
+    flags = source.fetch({})
+    assert flags["beta"].is_enabled() is True
+    assert source.fetch(flags) is None
+    assert repr(source) == "EnvSource('$FLAGS')"
+
+
+def test_image_source(tmp_path):
+    path = str(tmp_path / "flags.img")
+    FlagImageWriter(path).write(Flag.from_json(document(ENV, beta=True)))
+    source = ImageSource(path)
+
+    flags = source.fetch({})
+    assert flags["beta"].is_enabled() is True
+    assert source.fetch(flags) is None
+
+
+def test_flag_source_is_abstract():
+    with pytest.raises(TypeError):
+        FlagSource()
+
+
+def test_flaggle_polls_a_file_source(tmp_path):
+    path = str(tmp_path / "flags.json")
+    write_json(path, document(ENV, beta=True))
+    with Flaggle(source=FileSource(path), interval=0.05, retry=None) as flaggle:
+        assert flaggle.url is None
+        assert flaggle.session is None
+        assert flaggle.is_enabled("beta") is True
+        assert wait_for(lambda: flaggle.not_modified_count >= 2)
+        assert flaggle.full_fetch_count == 1
+
+        write_json(path, document(ENV, beta=False))
+        assert wait_for(lambda: flaggle.is_enabled("beta") is False)
+        assert flaggle.full_fetch_count == 2
+        assert flaggle.last_changes.changed == {"beta"}
+
+
+def test_flaggle_keeps_flags_when_the_source_fails(tmp_path):
+    path = tmp_path / "flags.json"
+    write_json(str(path), document(ENV, beta=True))
+    source = FileSource(str(path))
+    with Flaggle(source=source, interval=3600) as flaggle:
+        path.unlink()
+        flaggle._update()
+
+        assert flaggle.is_enabled("beta") is True
+        assert flaggle.consecutive_failures == 1
+
+
+def test_flaggle_with_memory_source_on_shared_scheduler():
+    scheduler = RefreshScheduler(workers=1)
+    source = MemorySource(document(ENV, beta=False))
+    with Flaggle(source=source, interval=0.05, retry=None, scheduler=scheduler) as flaggle:
+        assert flaggle.source is source
+        assert flaggle.is_enabled("beta") is False
+
+        source.set(document(ENV, beta=True))
+        assert wait_for(lambda: flaggle.is_enabled("beta"))
+    scheduler.close()
+
+
+def test_flaggle_requires_somewhere_to_load_from():
+    with pytest.raises(ValueError):
+        Flaggle()
@@ -0,0 +1,88 @@
+import json
+
+from pytest import raises
+
+from python_flaggle.stream import iter_flag_definitions
+
+
+def chunked(document, size):
+    body = document.encode("utf-8") if isinstance(document, str) else document
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+DOCUMENT = {
+    "version": 12345,
+    "meta": {"generated": "2025-06-08", "tags": ["a", "b"]},
+    "flags": [
+        {"name": "feature_a", "value": True},
+        {"name": "min_version", "value": 3.25, "operation": "ge"},
+        {"name": "región", "value": ["ção", "日本"], "operation": "in"},
+        {"name": "null_flag", "value": None},
+    ],
+    "trailer": 1,
+}
+
+
+class TestIterFlagDefinitions:
+    def test_matches_json_loads_for_any_chunk_size(self):
+        body = json.dumps(DOCUMENT, ensure_ascii=False, indent=2)
+
+        for size in (1, 2, 3, 7, 64, len(body.encode("utf-8"))):
+            assert list(iter_flag_definitions(chunked(body, size))) == DOCUMENT["flags"]
+
+    def test_number_split_across_chunks(self):
+        chunks = [b'{"count": 12', b'34, "flags": [{"name": "n", "value": 56', b"78}]}"]
+
+        assert list(iter_flag_definitions(chunks)) == [{"name": "n", "value": 5678}]
+
+    def test_empty_flags(self):
+        assert list(iter_flag_definitions([b'{"flags": [ ]}'])) == []
+
+    def test_skips_empty_chunks(self):
+        chunks = [b"", b'{"flags": [', b"", b'{"name": "a"}]}', b""]
+
+        assert list(iter_flag_definitions(chunks)) == [{"name": "a"}]
+
+    def test_yields_incrementally(self):
+        consumed = []
+
+        def chunks():
+            for chunk in (b'{"flags": [{"name": "a"}, ', b'{"name": "b"}]}'):
+                consumed.append(chunk)
+                yield chunk
+
+        definitions = iter_flag_definitions(chunks())
+        assert next(definitions) == {"name": "a"}
+        assert len(consumed) == 1
+        assert next(definitions) == {"name": "b"}
+        assert len(consumed) == 2
+
+    def test_missing_flags(self):
+        with raises(ValueError, match="No flags"):
+            list(iter_flag_definitions([b'{"other": []}']))
+        with raises(ValueError, match="No flags"):
+            list(iter_flag_definitions([b"{}"]))
+
+    def test_flags_not_a_list(self):
+        with raises(ValueError, match="No flags"):
+            list(iter_flag_definitions([b'{"flags": {"name": "a"}}']))
+
+    def test_invalid_json(self):
+        with raises(ValueError, match="Invalid JSON data"):
+            list(iter_flag_definitions([b'["flags"]']))
+        with raises(ValueError, match="Invalid JSON data"):
+            list(iter_flag_definitions([b'{"flags": [{"name": "a"} {"name": "b"}]}']))
+        with raises(ValueError, match="Invalid JSON data"):
+            list(iter_flag_definitions([b'{1: "a"}']))
+
+    def test_truncated_document(self):
+        with raises(ValueError, match="Invalid JSON data"):
+            list(iter_flag_definitions(chunked('{"flags": [{"name": "a", "val', 4)))
+        with raises(ValueError, match="Invalid JSON data"):
+            list(iter_flag_definitions([b'{"flags": [{"name": "a"}']))
+
+    def test_large_document(self):
+        flags = [{"name": f"flag_{i}", "value": list(range(50))} for i in range(2000)]
+        body = json.dumps({"flags": flags})
+
+        assert list(iter_flag_definitions(chunked(body, 4096))) == flags
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from python_flaggle import Flag, FlagChanges, Flaggle, MemorySource
+from python_flaggle.snapshot import FlagSnapshot
+from python_flaggle.subscriptions import Subscribers
+from tests.helpers import document, wait_for
+
+
+def snapshot(*names):
+    return FlagSnapshot.of({name: Flag(name, True) for name in names})
+
+
+def test_dispatch_matches_names_and_patterns():
+    subscribers = Subscribers()
+    calls = []
+    subscribers.add("checkout", lambda changes, snap: calls.append(("exact", changes)))
+    subscribers.add("routing.*", lambda changes, snap: calls.append(("pattern", changes)))
+    subscribers.add("other", lambda changes, snap: calls.append(("other", changes)))
+
+    notified = subscribers.dispatch(
+        FlagChanges(added=frozenset({"routing.eu"}), changed=frozenset({"checkout", "unrelated"})),
+        snapshot("routing.eu", "checkout", "unrelated"),
+    )
+
+    assert notified == 2
+    assert wait_for(lambda: len(calls) == 2)
+    assert sorted(calls) == [
+        ("exact", FlagChanges(changed=frozenset({"checkout"}))),
+        ("pattern", FlagChanges(added=frozenset({"routing.eu"}))),
+    ]
+    assert subscribers.dispatch(FlagChanges(), snapshot()) == 0
+    subscribers.close()
+
+
+def test_slow_subscriber_does_not_block_dispatch_and_gets_merged_changes():
+    subscribers = Subscribers(workers=1)
+    release = threading.Event()
+    calls = []
+
+    def slow(changes, snap):
+        calls.append(changes)
+        release.wait(2)
+
+    subscribers.add("*", slow)
+    subscribers.dispatch(FlagChanges(changed=frozenset({"a"})), snapshot("a", "b"))
+    assert wait_for(lambda: len(calls) == 1)
+
+    started = time.perf_counter()
+    subscribers.dispatch(FlagChanges(added=frozenset({"b"})), snapshot("a", "b"))
+    subscribers.dispatch(FlagChanges(changed=frozenset({"b"}), removed=frozenset({"a"})), snapshot("b"))
+    assert time.perf_counter() - started < 0.1
+    release.set()
+
+    assert wait_for(lambda: len(calls) == 2)
+    assert calls[1] == FlagChanges(added=frozenset({"b"}), removed=frozenset({"a"}))
+    time.sleep(0.05)
+    assert len(calls) == 2
+    subscribers.close()
+
+
+def test_flags_added_and_removed_before_delivery_are_left_out():
+    subscribers = Subscribers(workers=1)
+    release = threading.Event()
+    calls = []
+    subscribers.add("*", lambda changes, snap: calls.append(changes) or release.wait(2))
+
+    subscribers.dispatch(FlagChanges(changed=frozenset({"a"})), snapshot("a"))
+    assert wait_for(lambda: len(calls) == 1)
+    subscribers.dispatch(FlagChanges(added=frozenset({"b"})), snapshot("a", "b"))
+    subscribers.dispatch(FlagChanges(removed=frozenset({"b"})), snapshot("a"))
+    release.set()
+
+    time.sleep(0.1)
+    assert len(calls) == 1
+    subscribers.close()
+
+
+def test_failing_subscriber_is_logged_and_keeps_its_subscription(caplog):
+    subscribers = Subscribers()
+    calls = []
+
+    def failing(changes, snap):
+        calls.append(changes)
+        raise RuntimeError("boom")
+
+    subscribers.add("a", failing)
+    with caplog.at_level(logging.ERROR):
+        subscribers.dispatch(FlagChanges(changed=frozenset({"a"})), snapshot("a"))
+        assert wait_for(lambda: "failed: boom" in caplog.text)
+    subscribers.dispatch(FlagChanges(changed=frozenset({"a"})), snapshot("a"))
+    assert wait_for(lambda: len(calls) == 2)
+    subscribers.close()
+
+
+def test_remove_and_close():
+    subscribers = Subscribers()
+    subscription = subscribers.add("a", lambda changes, snap: None)
+    subscribers.add("b*", lambda changes, snap: None)
+    assert len(subscribers) == 2
+
+    subscribers.remove(subscription)
+    assert not subscription.active
+    assert len(subscribers) == 1
+    assert subscribers.dispatch(FlagChanges(changed=frozenset({"a"})), snapshot("a")) == 0
+
+    subscribers.close()
+    assert len(subscribers) == 0
+    with pytest.raises(RuntimeError):
+        subscribers.add("a", lambda changes, snap: None)
+    with pytest.raises(ValueError):
+        Subscribers(workers=0)
+
+
+def test_flaggle_subscribe():
+    source = MemorySource(document(beta=False, gamma=True))
+    received = []
+    with Flaggle(source=source, interval=3600) as flaggle:
+        flaggle.subscribe("beta", lambda changes, snap: received.append((changes, snap)))
+
+        source.set(document(beta=False, gamma=False))
+        flaggle._update()
+        source.set(document(beta=True, gamma=False))
+        flaggle._update()
+
+        assert wait_for(lambda: received)
+        changes, snap = received[0]
+        assert changes == FlagChanges(changed=frozenset({"beta"}))
+        assert snap.is_enabled("beta") is True
+        assert snap is flaggle.snapshot()
+    assert flaggle._subscribers._closed
+    with pytest.raises(RuntimeError):
+        flaggle.subscribe("beta", lambda changes, snap: None)
+
+
+def test_flaggle_unsubscribe():
+    source = MemorySource(document(beta=False))
+    received = []
+    with Flaggle(source=source, interval=3600) as flaggle:
+        subscription = flaggle.subscribe("beta", lambda changes, snap: received.append(changes))
+        flaggle.unsubscribe(subscription)
+
+        source.set(document(beta=True))
+        flaggle._update()
+        time.sleep(0.05)
+    assert received == []